@@ -0,0 +1 @@
+"""Performance benchmarks (run against a real database, not part of pytest)"""
@@ -0,0 +1,66 @@
+"""
+Auth overhead benchmark
+
+Per-request cost of resolving the current user from a Supabase JWT:
+
+- legacy: jwt.decode with the raw secret, once for get_current_user and
+  once more for get_current_user_id (routes depending on both)
+- cached: TokenVerifier.verify with the prepared key and claims cache
+
+Needs no database; the token is signed locally with SUPABASE_JWT_SECRET.
+
+    python -m benchmarks.bench_auth [--iterations 20000]
+"""
+import argparse
+import asyncio
+import time
+
+from jose import jwt
+
+from src.core.auth import create_token_verifier
+from src.core.config import settings
+from .common import measure, print_stats
+
+
+def sample_token() -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {
+            "sub": "00000000-0000-0000-0000-000000000001",
+            "email": "bench@example.com",
+            "aud": "authenticated",
+            "role": "authenticated",
+            "iat": now,
+            "exp": now + 3600,
+        },
+        settings.SUPABASE_JWT_SECRET,
+        algorithm="HS256",
+    )
+
+
+async def legacy_auth(token: str) -> None:
+    for _ in range(2):
+        jwt.decode(token, settings.SUPABASE_JWT_SECRET, algorithms=["HS256"], audience="authenticated")
+
+
+async def main(iterations: int) -> None:
+    token = sample_token()
+    verifier = create_token_verifier()
+
+    async def uncached():
+        verifier.decode(token)
+
+    async def cached():
+        verifier.verify(token)
+
+    print_stats("legacy (2x decode)", await measure(lambda: legacy_auth(token), iterations))
+    print_stats("prepared key, no cache", await measure(uncached, iterations))
+    print_stats("cached claims", await measure(cached, iterations))
+    print(f"cache: {verifier.cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,117 @@
+"""
+Dashboard summary benchmark
+
+Compares the former seven sequential dashboard queries with the single
+CTE query in DashboardService on a personal space seeded with N expenses
+for the current month. Seeding goes through the expense rollup triggers
+(migration 009), so the CTE query reads maintained monthly aggregates.
+
+    python -m benchmarks.bench_dashboard_summary --user-id <uuid> [--expenses 10000]
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import text
+
+from src.services.dashboard_service import DashboardService, month_bounds
+from .common import measure, print_stats, rollback_connection, session_for
+
+
+SEED_BUDGET = text("""
+    INSERT INTO budgets (space_id, name, type, month_period, total_income, created_by)
+    VALUES (:space_id, 'Benchmark', 'master', :month_period, 5000, :user_id)
+    ON CONFLICT (space_id, type, month_period) DO NOTHING
+""")
+
+SEED_EXPENSES = text("""
+    INSERT INTO expenses (space_id, amount, description, category, date, created_by)
+    SELECT :space_id,
+           round((random() * 200 + 1)::numeric, 2),
+           'Benchmark expense ' || g,
+           (ARRAY['Groceries', 'Dining Out', 'Transportation', 'Utilities',
+                  'Shopping', 'Entertainment', 'Housing', 'Insurance'])[1 + g % 8],
+           CAST(:month_start AS date) + (g % 28),
+           :user_id
+    FROM generate_series(1, :n) AS g
+""")
+
+# The queries get_dashboard_summary used to run one after another
+LEGACY_QUERIES = {
+    "space": """
+        SELECT s.id, s.name, s.currency FROM spaces s
+        JOIN space_members sm ON s.id = sm.space_id
+        WHERE sm.user_id = :user_id AND s.is_personal = true LIMIT 1
+    """,
+    "budget": """
+        SELECT b.id, b.name, b.total_income, b.framework FROM budgets b
+        WHERE b.space_id = :space_id AND b.month_period = :month_period
+        AND b.type = 'master' LIMIT 1
+    """,
+    "month_total": """
+        SELECT COALESCE(SUM(e.amount), 0) FROM expenses e
+        WHERE e.space_id = :space_id AND e.date >= :month_start AND e.date < :month_end
+    """,
+    "savings": """
+        SELECT bi.category, bi.budgeted_amount, COALESCE(bi.spent_amount, 0)
+        FROM budget_items bi WHERE bi.budget_id = :budget_id AND bi.category ILIKE '%saving%'
+    """,
+    "recent": """
+        SELECT e.id, e.description, e.amount, e.category, e.date FROM expenses e
+        WHERE e.space_id = :space_id ORDER BY e.date DESC, e.created_at DESC LIMIT 5
+    """,
+    "top_category": """
+        SELECT e.category, SUM(e.amount) AS total FROM expenses e
+        WHERE e.space_id = :space_id AND e.date >= :month_start AND e.date < :month_end
+        GROUP BY e.category ORDER BY total DESC LIMIT 1
+    """,
+    "breakdown": """
+        SELECT e.category, SUM(e.amount) AS total, COUNT(*) FROM expenses e
+        WHERE e.space_id = :space_id AND e.date >= :month_start AND e.date < :month_end
+        GROUP BY e.category ORDER BY total DESC
+    """,
+}
+
+
+async def legacy_summary(conn, params):
+    """Seven sequential round trips, as before the CTE query"""
+    space = (await conn.execute(text(LEGACY_QUERIES["space"]), params)).fetchone()
+    params = {**params, "space_id": space[0]}
+    budget = (await conn.execute(text(LEGACY_QUERIES["budget"]), params)).fetchone()
+    params["budget_id"] = budget[0]
+    for name in ("month_total", "savings", "recent", "top_category", "breakdown"):
+        (await conn.execute(text(LEGACY_QUERIES[name]), params)).fetchall()
+
+
+async def main(user_id: str, n_expenses: int, iterations: int) -> None:
+    now = datetime.now()
+    month_start, month_end = month_bounds(now)
+    month_period = f"{now.year}-{now.month:02d}"
+
+    async with rollback_connection() as conn:
+        space = (await conn.execute(text(LEGACY_QUERIES["space"]), {"user_id": user_id})).fetchone()
+        if not space:
+            raise SystemExit(f"User {user_id} has no personal space")
+
+        seed = {"space_id": space[0], "user_id": user_id, "month_period": month_period,
+                "month_start": month_start, "n": n_expenses}
+        await conn.execute(SEED_BUDGET, seed)
+        await conn.execute(SEED_EXPENSES, seed)
+        await conn.execute(text("ANALYZE expenses"))
+        print(f"Seeded {n_expenses} expenses in space {space[0]} for {month_period}")
+
+        params = {"user_id": user_id, "month_period": month_period,
+                  "month_start": month_start, "month_end": month_end}
+        service = DashboardService(session_for(conn))
+
+        print_stats("legacy (7 round trips)", await measure(lambda: legacy_summary(conn, params), iterations))
+        print_stats("single CTE query (rollups)", await measure(lambda: service.get_summary(user_id, now), iterations))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", required=True, help="Existing user with a personal space")
+    parser.add_argument("--expenses", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id, args.expenses, args.iterations))
@@ -0,0 +1,109 @@
+"""
+Bulk expense ingestion benchmark
+
+Sustained rows per second of bulk_insert_expenses (migrations 020/022), the
+function behind POST /api/expenses/bulk, on a personal space:
+
+1. fresh: B batches of N new expenses, each batch one call (one transaction
+   in production; here all inside one rolled-back transaction)
+2. replay: the same batches again, which are skipped on bank_transaction_id
+3. per-row: N single-row INSERTs, the baseline the endpoint replaces
+
+Half of the rows are booked against one budget item so the per-statement
+spent delta (migration 022 trigger) and the parent/budget rollup triggers
+are part of the cost.
+
+    python -m benchmarks.bench_expense_bulk --user-id <uuid> [--rows 2000] [--batches 10]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from datetime import date
+
+from sqlalchemy import text
+
+from .common import rollback_connection
+
+PERSONAL_SPACE = text("""
+    SELECT s.id FROM spaces s
+    JOIN space_members sm ON s.id = sm.space_id
+    WHERE sm.user_id = :user_id AND s.is_personal = true LIMIT 1
+""")
+
+CREATE_ITEM = text("""
+    WITH budget AS (
+        INSERT INTO budgets (space_id, name, type, month_period, created_by)
+        VALUES (:space_id, 'Expense benchmark', 'secondary', '1999-01', :user_id)
+        RETURNING id
+    )
+    INSERT INTO budget_items (budget_id, category, category_type, budgeted_amount)
+    SELECT id, 'Benchmark item', 'needs', 1000 FROM budget
+    RETURNING id
+""")
+
+BULK_INSERT = text("SELECT bulk_insert_expenses(:space_id, :user_id, CAST(:rows AS jsonb))")
+
+SINGLE_INSERT = text("""
+    INSERT INTO expenses (space_id, amount, description, category, date, bank_transaction_id, created_by)
+    VALUES (:space_id, :amount, :description, :category, :date, :bank_transaction_id, :user_id)
+""")
+
+CATEGORIES = ["Groceries", "Dining Out", "Transportation", "Utilities", "Shopping"]
+
+
+def make_rows(n: int, item_id) -> list:
+    today = date.today().isoformat()
+    return [
+        {
+            "amount": f"{random.randint(100, 20000) / 100:.2f}",
+            "description": f"Benchmark expense {i}",
+            "category": random.choice(CATEGORIES),
+            "date": today,
+            "bank_transaction_id": f"bench_{uuid.uuid4().hex}",
+            "budget_item_id": str(item_id) if i % 2 == 0 else None,
+        }
+        for i in range(n)
+    ]
+
+
+def report(label: str, rows: int, seconds: float) -> None:
+    print(f"{label:<28} {rows:>8} rows  {seconds * 1000:10.1f} ms  {rows / seconds:12,.0f} rows/s")
+
+
+async def main(user_id: str, n_rows: int, n_batches: int) -> None:
+    async with rollback_connection() as conn:
+        space_id = (await conn.execute(PERSONAL_SPACE, {"user_id": user_id})).scalar_one()
+        item_id = (await conn.execute(CREATE_ITEM, {"space_id": space_id, "user_id": user_id})).scalar_one()
+        batches = [json.dumps(make_rows(n_rows, item_id)) for _ in range(n_batches)]
+        params = {"space_id": space_id, "user_id": user_id}
+
+        for label in ("fresh", "replay (all skipped)"):
+            started = time.perf_counter()
+            for rows in batches:
+                await conn.execute(BULK_INSERT, {**params, "rows": rows})
+            report(label, n_rows * n_batches, time.perf_counter() - started)
+
+        single_rows = make_rows(n_rows, item_id)
+        started = time.perf_counter()
+        for row in single_rows:
+            await conn.execute(SINGLE_INSERT, {
+                **params,
+                "amount": row["amount"],
+                "description": row["description"],
+                "category": row["category"],
+                "date": date.today(),
+                "bank_transaction_id": row["bank_transaction_id"],
+            })
+        report("per-row INSERT", n_rows, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", required=True)
+    parser.add_argument("--rows", type=int, default=2000, help="rows per batch")
+    parser.add_argument("--batches", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id, args.rows, args.batches))
@@ -0,0 +1,63 @@
+"""
+Money aggregation benchmark
+
+Sums and per-item percentages over a budget with N items, given the
+amounts as the decimal strings PostgREST returns:
+
+- float: float() per amount, summed as floats (the former dashboard math)
+- decimal: Decimal(str()) per amount, summed as Decimals
+- cents: core.money int64 cents buffers
+
+Also reports how far the float total drifts from the exact one. Needs no
+database.
+
+    python -m benchmarks.bench_money [--items 5000] [--iterations 200]
+"""
+import argparse
+import asyncio
+import random
+from decimal import Decimal
+
+from src.core import money
+from .common import measure, print_stats
+
+
+def sample_amounts(n: int) -> list:
+    rng = random.Random(42)
+    return [f"{rng.randint(0, 500_000) / 100:.2f}" for _ in range(n)]
+
+
+async def main(items: int, iterations: int) -> None:
+    amounts = sample_amounts(items)
+    exact = sum((Decimal(a) for a in amounts), Decimal("0"))
+
+    async def with_float():
+        values = [float(a) for a in amounts]
+        whole = sum(values)
+        return [round(v / whole * 100, 2) for v in values]
+
+    async def with_decimal():
+        values = [Decimal(str(a)) for a in amounts]
+        whole = sum(values, Decimal("0"))
+        return [float((v / whole * 100).quantize(Decimal("0.01"))) for v in values]
+
+    async def with_cents():
+        values = money.cents_array(amounts)
+        return money.percentages(values, money.total(values))
+
+    print(f"{items} items, exact total {exact}")
+    print_stats("float", await measure(with_float, iterations))
+    print_stats("decimal", await measure(with_decimal, iterations))
+    print_stats("cents (core.money)", await measure(with_cents, iterations))
+
+    float_total = sum(float(a) for a in amounts)
+    print(f"float total drift: {Decimal(float_total) - exact:.2E}")
+    print(f"cents total drift: {money.to_decimal(money.total(money.cents_array(amounts))) - exact}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.iterations))
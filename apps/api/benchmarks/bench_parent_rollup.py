@@ -0,0 +1,140 @@
+"""
+Parent rollup benchmark
+
+Measures the parent-category triggers on budget_items:
+
+1. bulk: one INSERT of N children under a new parent (what
+   create_parent_category does), inside a rolled-back transaction
+2. concurrent: W workers, each on its own connection, repeatedly updating
+   random children of the same parent in short transactions (several
+   members editing one category at once). Reports throughput, latency and
+   whether the parent still equals the sum of its children.
+
+The concurrent phase needs committed rows, so it creates a throwaway
+secondary budget for month 1999-01 and deletes it afterwards.
+
+Run it before and after migration 013 to compare the row-level and
+statement-level triggers.
+
+    python -m benchmarks.bench_parent_rollup --user-id <uuid> [--children 200] [--workers 8]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import text
+
+from src.core.database import create_async_db_engine
+from .common import measure, print_stats, rollback_connection
+
+PERSONAL_SPACE = text("""
+    SELECT s.id FROM spaces s
+    JOIN space_members sm ON s.id = sm.space_id
+    WHERE sm.user_id = :user_id AND s.is_personal = true LIMIT 1
+""")
+
+CREATE_BUDGET = text("""
+    INSERT INTO budgets (space_id, name, type, month_period, created_by)
+    VALUES (:space_id, 'Rollup benchmark', 'secondary', '1999-01', :user_id)
+    RETURNING id
+""")
+
+CREATE_PARENT = text("""
+    INSERT INTO budget_items (budget_id, category, category_type, is_parent)
+    VALUES (:budget_id, 'Benchmark parent', 'needs', true)
+    RETURNING id
+""")
+
+CREATE_CHILDREN = text("""
+    INSERT INTO budget_items (budget_id, parent_id, category, category_type, budgeted_amount, display_order)
+    SELECT :budget_id, :parent_id, 'Child ' || g, 'needs', 10, g
+    FROM generate_series(1, :n) AS g
+    RETURNING id
+""")
+
+UPDATE_CHILD = text("""
+    UPDATE budget_items SET budgeted_amount = :amount WHERE id = :id
+""")
+
+CHECK_PARENT = text("""
+    SELECT p.budgeted_amount, (SELECT SUM(budgeted_amount) FROM budget_items WHERE parent_id = p.id)
+    FROM budget_items p WHERE p.id = :parent_id
+""")
+
+
+async def bench_bulk(user_id: str, space_id, n_children: int, iterations: int) -> None:
+    async with rollback_connection() as conn:
+        budget_id = (await conn.execute(CREATE_BUDGET, {"space_id": space_id, "user_id": user_id})).scalar_one()
+
+        async def insert_parent_with_children():
+            parent_id = (await conn.execute(CREATE_PARENT, {"budget_id": budget_id})).scalar_one()
+            await conn.execute(CREATE_CHILDREN, {"budget_id": budget_id, "parent_id": parent_id, "n": n_children})
+
+        print_stats(f"bulk insert {n_children} children", await measure(insert_parent_with_children, iterations))
+
+
+async def bench_concurrent(user_id: str, space_id, n_children: int, workers: int, updates: int) -> None:
+    engine = create_async_db_engine()
+    try:
+        async with engine.begin() as conn:
+            budget_id = (await conn.execute(CREATE_BUDGET, {"space_id": space_id, "user_id": user_id})).scalar_one()
+            parent_id = (await conn.execute(CREATE_PARENT, {"budget_id": budget_id})).scalar_one()
+            child_ids = (await conn.execute(
+                CREATE_CHILDREN, {"budget_id": budget_id, "parent_id": parent_id, "n": n_children}
+            )).scalars().all()
+
+        latencies = []
+
+        async def worker():
+            async with engine.connect() as conn:
+                for _ in range(updates):
+                    started = time.perf_counter()
+                    async with conn.begin():
+                        await conn.execute(UPDATE_CHILD, {
+                            "id": random.choice(child_ids),
+                            "amount": random.randint(1, 500),
+                        })
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        print(
+            f"concurrent: {workers} workers x {updates} updates in {elapsed:.2f}s "
+            f"({workers * updates / elapsed:.0f} updates/s), "
+            f"p50 {latencies[len(latencies) // 2]:.2f} ms, "
+            f"p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms"
+        )
+
+        async with engine.connect() as conn:
+            parent_amount, children_sum = (await conn.execute(CHECK_PARENT, {"parent_id": parent_id})).one()
+        print(f"parent {parent_amount} vs children {children_sum}: {'OK' if parent_amount == children_sum else 'DRIFT'}")
+
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text("DELETE FROM budgets WHERE month_period = '1999-01' AND name = 'Rollup benchmark'"))
+        await engine.dispose()
+
+
+async def main(user_id: str, n_children: int, workers: int, updates: int, iterations: int) -> None:
+    async with rollback_connection() as conn:
+        space_id = (await conn.execute(PERSONAL_SPACE, {"user_id": user_id})).scalar()
+    if not space_id:
+        raise SystemExit(f"User {user_id} has no personal space")
+
+    await bench_bulk(user_id, space_id, n_children, iterations)
+    await bench_concurrent(user_id, space_id, n_children, workers, updates)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", required=True, help="Existing user with a personal space")
+    parser.add_argument("--children", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=200, help="Updates per worker")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id, args.children, args.workers, args.updates, args.iterations))
@@ -0,0 +1,66 @@
+"""Shared helpers for benchmark scripts"""
+import statistics
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.core.database import create_async_db_engine
+
+
+@asynccontextmanager
+async def rollback_connection():
+    """
+    Connection inside a transaction that is always rolled back
+
+    Lets a benchmark seed thousands of rows without leaving them behind.
+    """
+    engine = create_async_db_engine()
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            try:
+                yield conn
+            finally:
+                await trans.rollback()
+    finally:
+        await engine.dispose()
+
+
+def session_for(conn: AsyncConnection) -> AsyncSession:
+    """AsyncSession joined to the benchmark's outer transaction"""
+    return AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+
+
+async def measure(
+    fn: Callable[[], Awaitable[object]],
+    iterations: int,
+    warmup: int = 3
+) -> Dict[str, float]:
+    """Run `fn` repeatedly and return latency stats in milliseconds"""
+    for _ in range(warmup):
+        await fn()
+
+    samples: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+    return {
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max_ms": samples[-1],
+    }
+
+
+def print_stats(label: str, stats: Dict[str, float]) -> None:
+    """One aligned line per measured variant"""
+    print(
+        f"{label:<28} mean {stats['mean_ms']:8.3f} ms  "
+        f"p50 {stats['p50_ms']:8.3f} ms  p95 {stats['p95_ms']:8.3f} ms  "
+        f"max {stats['max_ms']:8.3f} ms"
+    )
@@ -0,0 +1,191 @@
+-- Migration: 009_expense_monthly_rollups.sql
+-- Description: Per-space monthly spending rollup maintained incrementally from expenses
+-- Author: System
+-- Date: 2026-10-17
+
+-- One row per (space, month, category) with the running total and count.
+-- Dashboard breakdown, top category and month total read this table, so
+-- their cost grows with the number of categories instead of expenses.
+CREATE TABLE IF NOT EXISTS expense_monthly_rollups (
+    space_id UUID NOT NULL REFERENCES spaces(id) ON DELETE CASCADE,
+    month DATE NOT NULL,  -- First day of the month
+    category TEXT NOT NULL,
+    total_amount DECIMAL(14, 2) DEFAULT 0 NOT NULL,
+    expense_count INTEGER DEFAULT 0 NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    PRIMARY KEY (space_id, month, category)
+);
+
+COMMENT ON TABLE expense_monthly_rollups IS 'Monthly expense totals per space and category, maintained by statement-level triggers on expenses';
+COMMENT ON COLUMN expense_monthly_rollups.month IS 'First day of the month (date_trunc(''month'', expenses.date))';
+
+ALTER TABLE expense_monthly_rollups ENABLE ROW LEVEL SECURITY;
+
+-- Space members can read their rollups; writes only happen through triggers
+CREATE POLICY "Space members can view expense rollups"
+ON expense_monthly_rollups FOR SELECT
+USING (
+  EXISTS (
+    SELECT 1 FROM space_members
+    WHERE space_members.space_id = expense_monthly_rollups.space_id
+    AND space_members.user_id = auth.uid()
+  )
+);
+
+-- Apply the net change of one statement, aggregated per (space, month, category).
+-- Runs once per statement using transition tables, so a bulk insert of N
+-- expenses costs one upsert per touched key rather than N.
+CREATE OR REPLACE FUNCTION apply_expense_rollup_deltas()
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO expense_monthly_rollups AS r (space_id, month, category, total_amount, expense_count)
+        SELECT space_id, date_trunc('month', date)::date, category, SUM(amount), COUNT(*)
+        FROM new_rows
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3  -- Stable lock order between concurrent writers
+        ON CONFLICT (space_id, month, category) DO UPDATE
+        SET total_amount = r.total_amount + EXCLUDED.total_amount,
+            expense_count = r.expense_count + EXCLUDED.expense_count,
+            updated_at = NOW();
+
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO expense_monthly_rollups AS r (space_id, month, category, total_amount, expense_count)
+        SELECT space_id, date_trunc('month', date)::date, category, -SUM(amount), -COUNT(*)
+        FROM old_rows
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3
+        ON CONFLICT (space_id, month, category) DO UPDATE
+        SET total_amount = r.total_amount + EXCLUDED.total_amount,
+            expense_count = r.expense_count + EXCLUDED.expense_count,
+            updated_at = NOW();
+
+    ELSE
+        -- UPDATE: subtract the old rows, add the new ones, skip no-op keys
+        INSERT INTO expense_monthly_rollups AS r (space_id, month, category, total_amount, expense_count)
+        SELECT space_id, month, category, SUM(amount), SUM(n)
+        FROM (
+            SELECT space_id, date_trunc('month', date)::date AS month, category, amount, 1 AS n
+            FROM new_rows
+            UNION ALL
+            SELECT space_id, date_trunc('month', date)::date, category, -amount, -1
+            FROM old_rows
+        ) AS d
+        GROUP BY 1, 2, 3
+        HAVING SUM(amount) <> 0 OR SUM(n) <> 0
+        ORDER BY 1, 2, 3
+        ON CONFLICT (space_id, month, category) DO UPDATE
+        SET total_amount = r.total_amount + EXCLUDED.total_amount,
+            expense_count = r.expense_count + EXCLUDED.expense_count,
+            updated_at = NOW();
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_expense_rollup_insert ON expenses;
+CREATE TRIGGER trigger_expense_rollup_insert
+AFTER INSERT ON expenses
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_expense_rollup_deltas();
+
+DROP TRIGGER IF EXISTS trigger_expense_rollup_update ON expenses;
+CREATE TRIGGER trigger_expense_rollup_update
+AFTER UPDATE ON expenses
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_expense_rollup_deltas();
+
+DROP TRIGGER IF EXISTS trigger_expense_rollup_delete ON expenses;
+CREATE TRIGGER trigger_expense_rollup_delete
+AFTER DELETE ON expenses
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_expense_rollup_deltas();
+
+-- Rebuild rollups from expenses (all spaces, or one space).
+-- Blocks concurrent expense writes to the table while it runs so no delta
+-- lands between the delete and the re-aggregation.
+CREATE OR REPLACE FUNCTION rebuild_expense_monthly_rollups(p_space_id UUID DEFAULT NULL)
+RETURNS INTEGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    rebuilt INTEGER;
+BEGIN
+    LOCK TABLE expenses IN SHARE MODE;
+
+    DELETE FROM expense_monthly_rollups
+    WHERE p_space_id IS NULL OR space_id = p_space_id;
+
+    INSERT INTO expense_monthly_rollups (space_id, month, category, total_amount, expense_count)
+    SELECT space_id, date_trunc('month', date)::date, category, SUM(amount), COUNT(*)
+    FROM expenses
+    WHERE p_space_id IS NULL OR space_id = p_space_id
+    GROUP BY 1, 2, 3;
+
+    GET DIAGNOSTICS rebuilt = ROW_COUNT;
+    RETURN rebuilt;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rollup rows that disagree with a fresh aggregation of expenses
+CREATE OR REPLACE FUNCTION check_expense_monthly_rollups(p_space_id UUID DEFAULT NULL)
+RETURNS TABLE (
+    space_id UUID,
+    month DATE,
+    category TEXT,
+    rollup_total DECIMAL(14, 2),
+    actual_total DECIMAL(14, 2),
+    rollup_count INTEGER,
+    actual_count INTEGER
+)
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    WITH actual AS (
+        SELECT e.space_id, date_trunc('month', e.date)::date AS month, e.category,
+               SUM(e.amount) AS total, COUNT(*)::INTEGER AS n
+        FROM expenses e
+        WHERE p_space_id IS NULL OR e.space_id = p_space_id
+        GROUP BY 1, 2, 3
+    ),
+    rollup AS (
+        SELECT r.space_id, r.month, r.category, r.total_amount AS total, r.expense_count AS n
+        FROM expense_monthly_rollups r
+        WHERE (p_space_id IS NULL OR r.space_id = p_space_id)
+        AND r.expense_count <> 0
+    )
+    SELECT COALESCE(r.space_id, a.space_id),
+           COALESCE(r.month, a.month),
+           COALESCE(r.category, a.category),
+           COALESCE(r.total, 0),
+           COALESCE(a.total, 0),
+           COALESCE(r.n, 0),
+           COALESCE(a.n, 0)
+    FROM rollup r
+    FULL OUTER JOIN actual a
+      ON a.space_id = r.space_id AND a.month = r.month AND a.category = r.category
+    WHERE COALESCE(r.total, 0) <> COALESCE(a.total, 0)
+       OR COALESCE(r.n, 0) <> COALESCE(a.n, 0);
+$$ LANGUAGE sql STABLE;
+
+-- Initial backfill
+SELECT rebuild_expense_monthly_rollups();
+
+COMMENT ON FUNCTION apply_expense_rollup_deltas() IS 'Applies per-statement expense deltas to expense_monthly_rollups';
+COMMENT ON FUNCTION rebuild_expense_monthly_rollups(UUID) IS 'Recomputes expense_monthly_rollups from expenses for one space or all spaces';
+COMMENT ON FUNCTION check_expense_monthly_rollups(UUID) IS 'Lists rollup rows that differ from a fresh aggregation of expenses';
+
+-- SECURITY DEFINER maintenance functions: not callable through PostgREST by
+-- clients (the rebuild locks expenses, the check reads every space)
+REVOKE EXECUTE ON FUNCTION rebuild_expense_monthly_rollups(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION rebuild_expense_monthly_rollups(UUID) TO service_role;
+REVOKE EXECUTE ON FUNCTION check_expense_monthly_rollups(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION check_expense_monthly_rollups(UUID) TO service_role;
@@ -0,0 +1,55 @@
+-- Migration: 010_space_member_count.sql
+-- Description: Denormalized active member count on spaces, maintained by triggers on space_members
+-- Author: System
+-- Date: 2026-10-17
+
+-- Listing a user's spaces used to count members with one query per space.
+-- The count now lives on the space row and arrives with the same select.
+ALTER TABLE spaces
+ADD COLUMN IF NOT EXISTS member_count INTEGER DEFAULT 0 NOT NULL;
+
+COMMENT ON COLUMN spaces.member_count IS 'Number of active space_members rows (maintained by trigger)';
+
+-- Adjust member_count by the change in active memberships of one row.
+-- Covers join, reactivation, leave/removal (is_active flips) and moves
+-- between spaces.
+CREATE OR REPLACE FUNCTION update_space_member_count()
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_active THEN
+        UPDATE spaces
+        SET member_count = GREATEST(member_count - 1, 0)
+        WHERE id = OLD.space_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_active THEN
+        UPDATE spaces
+        SET member_count = member_count + 1
+        WHERE id = NEW.space_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_space_member_count ON space_members;
+CREATE TRIGGER trigger_space_member_count
+AFTER INSERT OR DELETE OR UPDATE OF is_active, space_id ON space_members
+FOR EACH ROW
+EXECUTE FUNCTION update_space_member_count();
+
+-- Backfill existing spaces
+UPDATE spaces s
+SET member_count = COALESCE(m.active_members, 0)
+FROM (
+    SELECT sp.id, COUNT(sm.id) AS active_members
+    FROM spaces sp
+    LEFT JOIN space_members sm ON sm.space_id = sp.id AND sm.is_active = true
+    GROUP BY sp.id
+) AS m
+WHERE s.id = m.id;
+
+COMMENT ON FUNCTION update_space_member_count() IS 'Keeps spaces.member_count equal to the number of active memberships';
@@ -0,0 +1,100 @@
+-- Migration: 011_budget_item_tree.sql
+-- Description: Build the nested budget item tree (with projection and ETag) in Postgres
+-- Author: System
+-- Date: 2026-10-17
+
+-- Keep only the requested keys of a row serialized with to_jsonb.
+-- NULL p_fields keeps every column.
+CREATE OR REPLACE FUNCTION budget_item_project(p_item JSONB, p_fields TEXT[])
+RETURNS JSONB
+LANGUAGE sql IMMUTABLE
+AS $$
+    SELECT CASE
+        WHEN p_fields IS NULL THEN p_item
+        ELSE COALESCE(
+            (SELECT jsonb_object_agg(key, value) FROM jsonb_each(p_item) WHERE key = ANY(p_fields)),
+            '{}'::jsonb
+        )
+    END;
+$$;
+
+-- Items directly under p_parent_id (top level when NULL), each with its own
+-- children nested up to p_depth levels, ordered like the UI (display_order).
+CREATE OR REPLACE FUNCTION budget_item_children(
+    p_budget_id UUID,
+    p_parent_id UUID,
+    p_fields TEXT[],
+    p_depth INTEGER
+)
+RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    SELECT COALESCE(
+        jsonb_agg(
+            budget_item_project(to_jsonb(bi), p_fields)
+            || jsonb_build_object(
+                'children',
+                CASE WHEN p_depth > 1
+                     THEN budget_item_children(p_budget_id, bi.id, p_fields, p_depth - 1)
+                     ELSE '[]'::jsonb
+                END
+            )
+            ORDER BY bi.display_order, bi.created_at
+        ),
+        '[]'::jsonb
+    )
+    FROM budget_items bi
+    WHERE bi.budget_id = p_budget_id
+    AND bi.parent_id IS NOT DISTINCT FROM p_parent_id;
+$$;
+
+-- Whole tree of a budget in one call: {"etag": ..., "items": [...]}.
+-- The ETag covers the budget row, the newest item change, the item count
+-- (deletes) and the requested shape. When it equals p_if_none_match the tree
+-- is not built and {"etag": ..., "not_modified": true} is returned.
+-- Returns NULL when the budget does not exist.
+CREATE OR REPLACE FUNCTION get_budget_item_tree(
+    p_budget_id UUID,
+    p_fields TEXT[] DEFAULT NULL,
+    p_depth INTEGER DEFAULT 2,
+    p_if_none_match TEXT DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql STABLE
+AS $$
+DECLARE
+    v_budget_updated_at TIMESTAMPTZ;
+    v_etag TEXT;
+BEGIN
+    SELECT updated_at INTO v_budget_updated_at
+    FROM budgets
+    WHERE id = p_budget_id;
+
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT md5(concat_ws('|',
+               v_budget_updated_at,
+               MAX(bi.updated_at),
+               COUNT(*),
+               array_to_string(p_fields, ','),
+               p_depth))
+    INTO v_etag
+    FROM budget_items bi
+    WHERE bi.budget_id = p_budget_id;
+
+    IF p_if_none_match IS NOT NULL AND p_if_none_match = v_etag THEN
+        RETURN jsonb_build_object('etag', v_etag, 'not_modified', true);
+    END IF;
+
+    RETURN jsonb_build_object(
+        'etag', v_etag,
+        'items', budget_item_children(p_budget_id, NULL, p_fields, p_depth)
+    );
+END;
+$$;
+
+COMMENT ON FUNCTION budget_item_project(JSONB, TEXT[]) IS 'Projects a serialized budget item onto the requested keys';
+COMMENT ON FUNCTION budget_item_children(UUID, UUID, TEXT[], INTEGER) IS 'Nested JSON of the items under a parent, down to the given depth';
+COMMENT ON FUNCTION get_budget_item_tree(UUID, TEXT[], INTEGER, TEXT) IS 'Budget item tree with ETag for GET /api/budgets/{id}/items/hierarchy';
@@ -0,0 +1,141 @@
+-- Migration: 012_budget_totals_delta_triggers.sql
+-- Description: Maintain budgets.total_budgeted / total_spent by applying item deltas
+-- Author: System
+-- Date: 2026-10-17
+
+-- Migration 005 re-summed every item of the budget after each row change,
+-- and the API re-summed them once more over PostgREST. Totals are now
+-- adjusted by the net change of each statement instead.
+--
+-- Same rules as before: only top-level items count (parent_id IS NULL),
+-- i.e. parent categories, which already hold the sum of their children
+-- (migrations 007/008), and standalone items. Child changes reach the
+-- budget through the resulting update of their parent row.
+DROP TRIGGER IF EXISTS trigger_update_budget_totals ON budget_items;
+DROP FUNCTION IF EXISTS update_budget_totals_on_item_change();
+
+-- Net change of one statement per budget. Runs once per statement using
+-- transition tables, so bulk item writes cost one UPDATE per budget.
+CREATE OR REPLACE FUNCTION apply_budget_total_deltas()
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE budgets b
+        SET total_budgeted = b.total_budgeted + d.budgeted,
+            total_spent = b.total_spent + d.spent,
+            updated_at = NOW()
+        FROM (
+            SELECT budget_id, SUM(budgeted_amount) AS budgeted, SUM(spent_amount) AS spent
+            FROM new_rows
+            WHERE parent_id IS NULL
+            GROUP BY budget_id
+        ) AS d
+        WHERE b.id = d.budget_id
+        AND (d.budgeted <> 0 OR d.spent <> 0);
+
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE budgets b
+        SET total_budgeted = b.total_budgeted - d.budgeted,
+            total_spent = b.total_spent - d.spent,
+            updated_at = NOW()
+        FROM (
+            SELECT budget_id, SUM(budgeted_amount) AS budgeted, SUM(spent_amount) AS spent
+            FROM old_rows
+            WHERE parent_id IS NULL
+            GROUP BY budget_id
+        ) AS d
+        WHERE b.id = d.budget_id
+        AND (d.budgeted <> 0 OR d.spent <> 0);
+
+    ELSE
+        -- UPDATE: add new top-level rows, subtract old ones (also covers
+        -- items moving between budgets or in/out of a parent)
+        UPDATE budgets b
+        SET total_budgeted = b.total_budgeted + d.budgeted,
+            total_spent = b.total_spent + d.spent,
+            updated_at = NOW()
+        FROM (
+            SELECT budget_id, SUM(budgeted) AS budgeted, SUM(spent) AS spent
+            FROM (
+                SELECT budget_id, budgeted_amount AS budgeted, spent_amount AS spent
+                FROM new_rows
+                WHERE parent_id IS NULL
+                UNION ALL
+                SELECT budget_id, -budgeted_amount, -spent_amount
+                FROM old_rows
+                WHERE parent_id IS NULL
+            ) AS changes
+            GROUP BY budget_id
+        ) AS d
+        WHERE b.id = d.budget_id
+        AND (d.budgeted <> 0 OR d.spent <> 0);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_budget_totals_insert ON budget_items;
+CREATE TRIGGER trigger_budget_totals_insert
+AFTER INSERT ON budget_items
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_budget_total_deltas();
+
+DROP TRIGGER IF EXISTS trigger_budget_totals_update ON budget_items;
+CREATE TRIGGER trigger_budget_totals_update
+AFTER UPDATE ON budget_items
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_budget_total_deltas();
+
+DROP TRIGGER IF EXISTS trigger_budget_totals_delete ON budget_items;
+CREATE TRIGGER trigger_budget_totals_delete
+AFTER DELETE ON budget_items
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_budget_total_deltas();
+
+-- Recompute totals from items (one budget, or all when NULL). Used to
+-- repair drift reported by scripts/budget_totals.py and for the backfill.
+CREATE OR REPLACE FUNCTION recalculate_budget_totals(p_budget_id UUID DEFAULT NULL)
+RETURNS INTEGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    UPDATE budgets b
+    SET total_budgeted = COALESCE(t.budgeted, 0),
+        total_spent = COALESCE(t.spent, 0),
+        updated_at = NOW()
+    FROM budgets src
+    LEFT JOIN (
+        SELECT budget_id, SUM(budgeted_amount) AS budgeted, SUM(spent_amount) AS spent
+        FROM budget_items
+        WHERE parent_id IS NULL
+        GROUP BY budget_id
+    ) AS t ON t.budget_id = src.id
+    WHERE b.id = src.id
+    AND (p_budget_id IS NULL OR src.id = p_budget_id)
+    AND (b.total_budgeted IS DISTINCT FROM COALESCE(t.budgeted, 0)
+         OR b.total_spent IS DISTINCT FROM COALESCE(t.spent, 0));
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Start from exact totals
+SELECT recalculate_budget_totals();
+
+COMMENT ON FUNCTION apply_budget_total_deltas() IS 'Applies per-statement deltas of top-level budget items to budget totals';
+COMMENT ON FUNCTION recalculate_budget_totals(UUID) IS 'Recomputes budget totals from top-level items; returns the number of budgets corrected';
+
+-- SECURITY DEFINER maintenance function: service_role only
+REVOKE EXECUTE ON FUNCTION recalculate_budget_totals(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION recalculate_budget_totals(UUID) TO service_role;
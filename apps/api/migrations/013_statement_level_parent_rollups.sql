@@ -0,0 +1,133 @@
+-- Migration: 013_statement_level_parent_rollups.sql
+-- Description: Roll child amounts up to parent categories once per statement using deltas
+-- Author: System
+-- Date: 2026-10-17
+
+-- recalculate_parent_budgeted_amount (007/008) and calculate_parent_totals
+-- (005) ran FOR EACH ROW: inserting N children re-summed and rewrote the
+-- parent N times (twice, one per function) while holding its row lock.
+-- They are replaced by statement-level triggers that aggregate the
+-- statement's child changes per parent and apply them as one delta.
+--
+-- Reparenting now also updates the old parent (the row triggers only
+-- re-summed the new one).
+DROP TRIGGER IF EXISTS trigger_calculate_parent_totals ON budget_items;
+DROP TRIGGER IF EXISTS trigger_child_insert_update_parent ON budget_items;
+DROP TRIGGER IF EXISTS trigger_child_update_update_parent ON budget_items;
+DROP TRIGGER IF EXISTS trigger_child_delete_update_parent ON budget_items;
+DROP TRIGGER IF EXISTS trigger_child_reparent_update_parents ON budget_items;
+DROP TRIGGER IF EXISTS trigger_child_spent_update_parent ON budget_items;
+DROP FUNCTION IF EXISTS calculate_parent_totals();
+DROP FUNCTION IF EXISTS recalculate_parent_budgeted_amount();
+
+-- Add a delta to one parent category
+CREATE OR REPLACE FUNCTION apply_parent_rollup_delta(p_parent_id UUID, p_budgeted DECIMAL, p_spent DECIMAL)
+RETURNS VOID
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    UPDATE budget_items
+    SET budgeted_amount = budgeted_amount + p_budgeted,
+        spent_amount = spent_amount + p_spent,
+        updated_at = NOW()
+    WHERE id = p_parent_id
+    AND is_parent = TRUE;
+$$ LANGUAGE sql;
+
+-- Net child change per parent for the whole statement, applied once per
+-- parent in parent id order (a stable lock order, so concurrent statements
+-- touching several parents cannot deadlock).
+CREATE OR REPLACE FUNCTION apply_parent_rollup_deltas()
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    d RECORD;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        FOR d IN
+            SELECT parent_id, SUM(budgeted_amount) AS budgeted, SUM(spent_amount) AS spent
+            FROM new_rows
+            WHERE parent_id IS NOT NULL
+            GROUP BY parent_id
+            ORDER BY parent_id
+        LOOP
+            PERFORM apply_parent_rollup_delta(d.parent_id, d.budgeted, d.spent);
+        END LOOP;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        FOR d IN
+            SELECT parent_id, SUM(budgeted_amount) AS budgeted, SUM(spent_amount) AS spent
+            FROM old_rows
+            WHERE parent_id IS NOT NULL
+            GROUP BY parent_id
+            ORDER BY parent_id
+        LOOP
+            PERFORM apply_parent_rollup_delta(d.parent_id, -d.budgeted, -d.spent);
+        END LOOP;
+
+    ELSE
+        FOR d IN
+            SELECT parent_id, SUM(budgeted) AS budgeted, SUM(spent) AS spent
+            FROM (
+                SELECT parent_id, budgeted_amount AS budgeted, spent_amount AS spent
+                FROM new_rows
+                WHERE parent_id IS NOT NULL
+                UNION ALL
+                SELECT parent_id, -budgeted_amount, -spent_amount
+                FROM old_rows
+                WHERE parent_id IS NOT NULL
+            ) AS changes
+            GROUP BY parent_id
+            HAVING SUM(budgeted) <> 0 OR SUM(spent) <> 0
+            ORDER BY parent_id
+        LOOP
+            PERFORM apply_parent_rollup_delta(d.parent_id, d.budgeted, d.spent);
+        END LOOP;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_parent_rollup_insert ON budget_items;
+CREATE TRIGGER trigger_parent_rollup_insert
+AFTER INSERT ON budget_items
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_parent_rollup_deltas();
+
+DROP TRIGGER IF EXISTS trigger_parent_rollup_update ON budget_items;
+CREATE TRIGGER trigger_parent_rollup_update
+AFTER UPDATE ON budget_items
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_parent_rollup_deltas();
+
+DROP TRIGGER IF EXISTS trigger_parent_rollup_delete ON budget_items;
+CREATE TRIGGER trigger_parent_rollup_delete
+AFTER DELETE ON budget_items
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_parent_rollup_deltas();
+
+-- Start from exact parent amounts (budget totals follow through the
+-- migration 012 triggers)
+UPDATE budget_items AS parent
+SET budgeted_amount = c.budgeted,
+    spent_amount = c.spent
+FROM (
+    SELECT p.id,
+           COALESCE(SUM(ch.budgeted_amount), 0) AS budgeted,
+           COALESCE(SUM(ch.spent_amount), 0) AS spent
+    FROM budget_items p
+    LEFT JOIN budget_items ch ON ch.parent_id = p.id
+    WHERE p.is_parent = TRUE
+    GROUP BY p.id
+) AS c
+WHERE parent.id = c.id
+AND (parent.budgeted_amount <> c.budgeted OR parent.spent_amount <> c.spent);
+
+COMMENT ON FUNCTION apply_parent_rollup_delta(UUID, DECIMAL, DECIMAL) IS 'Adds a child delta to a parent category';
+COMMENT ON FUNCTION apply_parent_rollup_deltas() IS 'Applies per-statement child deltas to parent budgeted_amount and spent_amount';
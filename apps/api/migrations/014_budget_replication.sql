@@ -0,0 +1,138 @@
+-- Migration: 014_budget_replication.sql
+-- Description: Server-side budget replication and batch month rollover
+-- Author: System
+-- Date: 2026-10-17
+
+-- Copy a budget and its item tree into another month in one transaction.
+--
+-- Items are copied with a single INSERT ... SELECT. Every source item gets
+-- a new id up front, so children are re-pointed at their copied parent in
+-- the same statement. Parents start at 0 and are filled by the parent
+-- rollup trigger (migration 013) from their copied children; budget totals
+-- follow through migration 012. Spent amounts always start at 0.
+--
+-- Raises unique_violation if the target month already has a budget of the
+-- same type (UNIQUE(space_id, type, month_period)) and no_data_found if the
+-- source budget does not exist.
+CREATE OR REPLACE FUNCTION replicate_budget(
+    p_budget_id UUID,
+    p_target_month_period TEXT,
+    p_copy_amounts BOOLEAN DEFAULT TRUE,
+    p_copy_items BOOLEAN DEFAULT TRUE,
+    p_created_by UUID DEFAULT NULL
+)
+RETURNS JSONB
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_new_id UUID;
+BEGIN
+    INSERT INTO budgets (space_id, name, description, type, month_period, framework,
+                         total_income, currency, created_by)
+    SELECT space_id, name, description, type, p_target_month_period, framework,
+           CASE WHEN p_copy_amounts THEN total_income ELSE 0 END,
+           currency, COALESCE(p_created_by, created_by)
+    FROM budgets
+    WHERE id = p_budget_id
+    RETURNING id INTO v_new_id;
+
+    IF v_new_id IS NULL THEN
+        RAISE EXCEPTION 'Budget % not found', p_budget_id USING ERRCODE = 'no_data_found';
+    END IF;
+
+    IF p_copy_items THEN
+        WITH src AS (
+            SELECT bi.*, gen_random_uuid() AS new_id
+            FROM budget_items bi
+            WHERE bi.budget_id = p_budget_id
+        )
+        INSERT INTO budget_items (id, budget_id, parent_id, category, description, category_type,
+                                  budgeted_amount, spent_amount, icon, color, display_order, is_parent)
+        SELECT s.new_id, v_new_id, p.new_id, s.category, s.description, s.category_type,
+               CASE WHEN s.is_parent OR NOT p_copy_amounts THEN 0 ELSE s.budgeted_amount END,
+               0, s.icon, s.color, s.display_order, s.is_parent
+        FROM src s
+        LEFT JOIN src p ON p.id = s.parent_id;
+    END IF;
+
+    RETURN (
+        SELECT to_jsonb(b) || jsonb_build_object(
+            'budget_items',
+            (SELECT COALESCE(jsonb_agg(to_jsonb(bi) ORDER BY bi.display_order), '[]'::jsonb)
+             FROM budget_items bi WHERE bi.budget_id = b.id)
+        )
+        FROM budgets b
+        WHERE b.id = v_new_id
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Roll master budgets from one month into the next, one chunk of spaces
+-- per call (each RPC call is its own transaction). Spaces are walked in id
+-- order starting after p_after_space_id; spaces that already have a master
+-- budget for the target month are skipped. Call again with the returned
+-- last_space_id until processed < p_limit.
+CREATE OR REPLACE FUNCTION rollover_master_budgets(
+    p_from_month_period TEXT,
+    p_to_month_period TEXT,
+    p_after_space_id UUID DEFAULT NULL,
+    p_limit INTEGER DEFAULT 500,
+    p_copy_amounts BOOLEAN DEFAULT TRUE
+)
+RETURNS JSONB
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_budget RECORD;
+    v_processed INTEGER := 0;
+    v_created INTEGER := 0;
+    v_last_space_id UUID := p_after_space_id;
+BEGIN
+    FOR v_budget IN
+        SELECT b.id, b.space_id
+        FROM budgets b
+        JOIN spaces s ON s.id = b.space_id AND s.is_active = TRUE
+        WHERE b.type = 'master'
+        AND b.month_period = p_from_month_period
+        AND (p_after_space_id IS NULL OR b.space_id > p_after_space_id)
+        ORDER BY b.space_id
+        LIMIT p_limit
+    LOOP
+        v_processed := v_processed + 1;
+        v_last_space_id := v_budget.space_id;
+
+        IF NOT EXISTS (
+            SELECT 1 FROM budgets
+            WHERE space_id = v_budget.space_id
+            AND type = 'master'
+            AND month_period = p_to_month_period
+        ) THEN
+            PERFORM replicate_budget(v_budget.id, p_to_month_period, p_copy_amounts, TRUE, NULL);
+            v_created := v_created + 1;
+        END IF;
+    END LOOP;
+
+    RETURN jsonb_build_object(
+        'processed', v_processed,
+        'created', v_created,
+        'last_space_id', v_last_space_id
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rollover walks master budgets of one month in space order
+CREATE INDEX IF NOT EXISTS idx_budgets_rollover
+ON budgets(month_period, space_id)
+WHERE type = 'master';
+
+COMMENT ON FUNCTION replicate_budget(UUID, TEXT, BOOLEAN, BOOLEAN, UUID) IS 'Copies a budget and its item hierarchy into another month; used by POST /api/budgets/{id}/replicate';
+COMMENT ON FUNCTION rollover_master_budgets(TEXT, TEXT, UUID, INTEGER, BOOLEAN) IS 'Replicates one chunk of master budgets into the next month; driven by scripts/rollover_budgets.py';
+
+-- SECURITY DEFINER, so they bypass RLS: only the API (service_role) may call
+-- them, after its own access checks
+REVOKE EXECUTE ON FUNCTION replicate_budget(UUID, TEXT, BOOLEAN, BOOLEAN, UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION replicate_budget(UUID, TEXT, BOOLEAN, BOOLEAN, UUID) TO service_role;
+REVOKE EXECUTE ON FUNCTION rollover_master_budgets(TEXT, TEXT, UUID, INTEGER, BOOLEAN) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION rollover_master_budgets(TEXT, TEXT, UUID, INTEGER, BOOLEAN) TO service_role;
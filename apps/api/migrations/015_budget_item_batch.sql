@@ -0,0 +1,153 @@
+-- Migration: 015_budget_item_batch.sql
+-- Description: Apply a batch of item creates/updates/deletes/reorders to one budget in one transaction
+-- Author: System
+-- Date: 2026-10-17
+
+-- p_operations is the validated BudgetItemBatchRequest.operations array.
+-- Operations are applied set-based, one statement per kind, in this order:
+-- deletes, creates, updates, reorders. The statement-level rollup triggers
+-- (migrations 012/013) therefore run once per kind instead of once per item.
+--
+-- Creates get their ids up front, so a create can name another create of
+-- the same batch as its parent (parent_ref -> ref). Parent categories
+-- always start at 0 and are filled from their children. spent_amount is
+-- never written: items start at 0 and expenses move it (migration 022).
+--
+-- Raises no_data_found if the budget or any updated/deleted/reordered item
+-- is missing from it, and invalid_parameter_value if an item would point at
+-- a parent in another budget. Returns get_budget_item_tree(p_budget_id).
+CREATE OR REPLACE FUNCTION apply_budget_item_batch(p_budget_id UUID, p_operations JSONB)
+RETURNS JSONB
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_expected INTEGER;
+    v_count INTEGER;
+BEGIN
+    -- Serialize batches on the same budget
+    PERFORM 1 FROM budgets WHERE id = p_budget_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Budget % not found', p_budget_id USING ERRCODE = 'no_data_found';
+    END IF;
+
+    -- Deletes (children of a deleted parent go with it via ON DELETE CASCADE)
+    SELECT COUNT(*) INTO v_expected
+    FROM jsonb_array_elements(p_operations) AS op
+    WHERE op->>'op' = 'delete';
+
+    IF v_expected > 0 THEN
+        DELETE FROM budget_items
+        WHERE budget_id = p_budget_id
+        AND id IN (
+            SELECT (op->>'id')::uuid
+            FROM jsonb_array_elements(p_operations) AS op
+            WHERE op->>'op' = 'delete'
+        );
+
+        GET DIAGNOSTICS v_count = ROW_COUNT;
+        IF v_count <> v_expected THEN
+            RAISE EXCEPTION 'Budget item not found' USING ERRCODE = 'no_data_found';
+        END IF;
+    END IF;
+
+    -- Creates
+    WITH ops AS (
+        SELECT op, gen_random_uuid() AS new_id
+        FROM jsonb_array_elements(p_operations) AS op
+        WHERE op->>'op' = 'create'
+    )
+    INSERT INTO budget_items (id, budget_id, parent_id, category, description, category_type,
+                              budgeted_amount, spent_amount, icon, color, display_order, is_parent)
+    SELECT o.new_id, p_budget_id, COALESCE(p.new_id, r.parent_id), r.category, r.description,
+           r.category_type,
+           CASE WHEN r.is_parent THEN 0 ELSE r.budgeted_amount END,
+           0, r.icon, r.color, r.display_order, r.is_parent
+    FROM ops o
+    CROSS JOIN LATERAL jsonb_populate_record(NULL::budget_items, o.op->'data') AS r
+    LEFT JOIN ops p ON p.op->>'ref' = o.op->>'parent_ref';
+
+    -- Updates: merge the changed fields into the current row
+    SELECT COUNT(*) INTO v_expected
+    FROM jsonb_array_elements(p_operations) AS op
+    WHERE op->>'op' = 'update';
+
+    IF v_expected > 0 THEN
+        UPDATE budget_items t
+        SET category = r.category,
+            description = r.description,
+            category_type = r.category_type,
+            budgeted_amount = r.budgeted_amount,
+            icon = r.icon,
+            color = r.color,
+            display_order = r.display_order,
+            parent_id = r.parent_id,
+            is_parent = r.is_parent
+        FROM (
+            SELECT (jsonb_populate_record(bi, op->'data')).*
+            FROM jsonb_array_elements(p_operations) AS op
+            JOIN budget_items bi ON bi.id = (op->>'id')::uuid AND bi.budget_id = p_budget_id
+            WHERE op->>'op' = 'update'
+        ) AS r
+        WHERE t.id = r.id;
+
+        GET DIAGNOSTICS v_count = ROW_COUNT;
+        IF v_count <> v_expected THEN
+            RAISE EXCEPTION 'Budget item not found' USING ERRCODE = 'no_data_found';
+        END IF;
+    END IF;
+
+    -- Reorders: display_order = position in each ids list
+    SELECT COUNT(*) INTO v_expected
+    FROM jsonb_array_elements(p_operations) AS op,
+         jsonb_array_elements_text(op->'ids') AS item_id
+    WHERE op->>'op' = 'reorder';
+
+    IF v_expected > 0 THEN
+        SELECT COUNT(*) INTO v_count
+        FROM budget_items
+        WHERE budget_id = p_budget_id
+        AND id IN (
+            SELECT item_id::uuid
+            FROM jsonb_array_elements(p_operations) AS op,
+                 jsonb_array_elements_text(op->'ids') AS item_id
+            WHERE op->>'op' = 'reorder'
+        );
+        IF v_count <> v_expected THEN
+            RAISE EXCEPTION 'Budget item not found' USING ERRCODE = 'no_data_found';
+        END IF;
+
+        UPDATE budget_items t
+        SET display_order = o.ord - 1
+        FROM (
+            SELECT item_id::uuid AS id, ord
+            FROM jsonb_array_elements(p_operations) AS op,
+                 jsonb_array_elements_text(op->'ids') WITH ORDINALITY AS x(item_id, ord)
+            WHERE op->>'op' = 'reorder'
+        ) AS o
+        WHERE t.id = o.id
+        AND t.budget_id = p_budget_id
+        AND t.display_order IS DISTINCT FROM o.ord - 1;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1
+        FROM budget_items c
+        JOIN budget_items p ON p.id = c.parent_id
+        WHERE c.budget_id = p_budget_id
+        AND p.budget_id <> p_budget_id
+    ) THEN
+        RAISE EXCEPTION 'Parent must belong to the same budget'
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    RETURN get_budget_item_tree(p_budget_id);
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION apply_budget_item_batch(UUID, JSONB) IS 'Applies POST /api/budgets/{id}/items/batch operations in one transaction and returns the item tree';
+
+-- SECURITY DEFINER, so it bypasses RLS: only the API (service_role) may call it,
+-- after checking the caller's access to the budget
+REVOKE EXECUTE ON FUNCTION apply_budget_item_batch(UUID, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION apply_budget_item_batch(UUID, JSONB) TO service_role;
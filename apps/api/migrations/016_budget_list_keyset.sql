@@ -0,0 +1,15 @@
+-- Migration: 016_budget_list_keyset.sql
+-- Description: Index for keyset pagination of GET /api/budgets/space/{space_id}
+-- Author: System
+-- Date: 2026-10-17
+
+-- list_budgets pages with
+--   WHERE space_id = $1 AND (month_period, id) < ($cursor_month, $cursor_id)
+--   ORDER BY month_period DESC, id DESC LIMIT n
+-- This index serves the filter and the order directly, so a page reads n
+-- rows no matter how many months the space has.
+CREATE INDEX IF NOT EXISTS idx_budgets_space_keyset
+ON budgets(space_id, month_period DESC, id DESC);
+
+-- Covered by the index above
+DROP INDEX IF EXISTS idx_budgets_space_month;
@@ -0,0 +1,108 @@
+-- Migration: 017_budget_stats.sql
+-- Description: Compute budget statistics (per item and per category type) in Postgres
+-- Author: System
+-- Date: 2026-10-17
+
+-- Amounts are emitted as JSON strings so they reach the API as exact
+-- decimals (a JSON number would be parsed into a float). Percentages are
+-- rounded to 2 places and stay numbers.
+
+-- spent / budgeted as a percentage, 0 when nothing is budgeted
+CREATE OR REPLACE FUNCTION budget_percentage(p_part DECIMAL, p_whole DECIMAL)
+RETURNS NUMERIC
+LANGUAGE sql IMMUTABLE
+AS $$
+    SELECT CASE WHEN p_whole > 0 THEN ROUND(p_part / p_whole * 100, 2) ELSE 0 END;
+$$;
+
+-- Stats of one budget row:
+--   totals, remaining and percentage_spent from the budget (kept exact by
+--   the migration 012 triggers);
+--   category_breakdown with one entry per item, parents and children alike
+--   (parent_id tells them apart);
+--   category_type_breakdown summing only top-level items, because parent
+--   categories already contain their children and counting both would
+--   double them.
+CREATE OR REPLACE FUNCTION budget_stats_json(p_budget budgets)
+RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'budget_id', p_budget.id,
+        'month_period', p_budget.month_period,
+        'type', p_budget.type,
+        'name', p_budget.name,
+        'total_income', p_budget.total_income::text,
+        'total_budgeted', p_budget.total_budgeted::text,
+        'total_spent', p_budget.total_spent::text,
+        'remaining', (p_budget.total_income - p_budget.total_spent)::text,
+        'percentage_spent', budget_percentage(p_budget.total_spent, p_budget.total_income),
+        'category_breakdown', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                       'id', bi.id,
+                       'parent_id', bi.parent_id,
+                       'is_parent', bi.is_parent,
+                       'category', bi.category,
+                       'category_type', bi.category_type,
+                       'budgeted', bi.budgeted_amount::text,
+                       'spent', bi.spent_amount::text,
+                       'remaining', (bi.budgeted_amount - bi.spent_amount)::text,
+                       'percentage_used', budget_percentage(bi.spent_amount, bi.budgeted_amount)
+                   ) ORDER BY bi.parent_id NULLS FIRST, bi.display_order, bi.created_at)
+            FROM budget_items bi
+            WHERE bi.budget_id = p_budget.id
+        ), '[]'::jsonb),
+        'category_type_breakdown', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                       'category_type', t.category_type,
+                       'budgeted', t.budgeted::text,
+                       'spent', t.spent::text,
+                       'remaining', (t.budgeted - t.spent)::text,
+                       'percentage_used', budget_percentage(t.spent, t.budgeted),
+                       'percentage_of_income', budget_percentage(t.budgeted, p_budget.total_income)
+                   ) ORDER BY t.category_type)
+            FROM (
+                SELECT bi.category_type,
+                       SUM(bi.budgeted_amount) AS budgeted,
+                       SUM(bi.spent_amount) AS spent
+                FROM budget_items bi
+                WHERE bi.budget_id = p_budget.id
+                AND bi.parent_id IS NULL
+                GROUP BY bi.category_type
+            ) AS t
+        ), '[]'::jsonb)
+    );
+$$;
+
+-- Stats of one budget; NULL when it does not exist
+CREATE OR REPLACE FUNCTION get_budget_stats(p_budget_id UUID)
+RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    SELECT budget_stats_json(b)
+    FROM budgets b
+    WHERE b.id = p_budget_id;
+$$;
+
+-- Stats of every budget of a space between two months (inclusive), oldest
+-- first. Served by idx_budgets_space_keyset (migration 016).
+CREATE OR REPLACE FUNCTION get_budget_stats_range(
+    p_space_id UUID,
+    p_from_month_period TEXT,
+    p_to_month_period TEXT
+)
+RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    SELECT COALESCE(
+        jsonb_agg(budget_stats_json(b) ORDER BY b.month_period, b.type),
+        '[]'::jsonb
+    )
+    FROM budgets b
+    WHERE b.space_id = p_space_id
+    AND b.month_period BETWEEN p_from_month_period AND p_to_month_period;
+$$;
+
+COMMENT ON FUNCTION budget_stats_json(budgets) IS 'Totals, per-item and per-category-type stats of one budget';
+COMMENT ON FUNCTION get_budget_stats(UUID) IS 'Budget stats for GET /api/budgets/{id}/stats';
+COMMENT ON FUNCTION get_budget_stats_range(UUID, TEXT, TEXT) IS 'Stats of a space''s budgets over a month range for GET /api/budgets/stats';
@@ -0,0 +1,78 @@
+-- Migration: 018_create_budget_with_items.sql
+-- Description: Create a budget and its items in one transaction
+-- Author: System
+-- Date: 2026-10-17
+
+-- p_budget holds the budgets columns (space_id, name, description, type,
+-- month_period, framework, total_income, currency). p_items is an array of
+-- item objects, either custom items (budgeted_amount) or framework template
+-- categories (percentage of total_income, rounded to cents).
+--
+-- Items keep their array position as display_order. An item may carry a
+-- "ref" and name another item's ref in "parent_ref" to be created as its
+-- child; ids are assigned up front so the whole tree is one INSERT.
+-- Parent categories start at 0 and are filled from their children by the
+-- migration 013 triggers; budget totals follow through migration 012.
+-- Every item starts with spent_amount 0, which expenses then move
+-- (migration 022).
+--
+-- There is no pre-read for an existing budget: a second budget of the same
+-- type for the month raises unique_violation from
+-- UNIQUE(space_id, type, month_period).
+CREATE OR REPLACE FUNCTION create_budget_with_items(
+    p_budget JSONB,
+    p_items JSONB DEFAULT '[]'::jsonb,
+    p_created_by UUID DEFAULT NULL
+)
+RETURNS JSONB
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_budget_id UUID;
+    v_total_income DECIMAL(12, 2);
+BEGIN
+    INSERT INTO budgets (space_id, name, description, type, month_period, framework,
+                         total_income, currency, created_by)
+    SELECT r.space_id, r.name, r.description, COALESCE(r.type, 'master'), r.month_period,
+           COALESCE(r.framework, 'custom'), COALESCE(r.total_income, 0),
+           COALESCE(r.currency, 'USD'), p_created_by
+    FROM jsonb_populate_record(NULL::budgets, p_budget) AS r
+    RETURNING id, total_income INTO v_budget_id, v_total_income;
+
+    WITH src AS (
+        SELECT x.item, x.ord, gen_random_uuid() AS new_id,
+               COALESCE((x.item->>'is_parent')::boolean, FALSE) AS is_parent
+        FROM jsonb_array_elements(COALESCE(p_items, '[]'::jsonb)) WITH ORDINALITY AS x(item, ord)
+    )
+    INSERT INTO budget_items (id, budget_id, parent_id, category, description, category_type,
+                              budgeted_amount, spent_amount, icon, color, display_order, is_parent)
+    SELECT s.new_id, v_budget_id, p.new_id, s.item->>'category', s.item->>'description',
+           COALESCE(s.item->>'category_type', 'needs'),
+           CASE
+               WHEN s.is_parent THEN 0
+               WHEN s.item ? 'percentage'
+                   THEN ROUND(v_total_income * (s.item->>'percentage')::numeric, 2)
+               ELSE COALESCE((s.item->>'budgeted_amount')::numeric, 0)
+           END,
+           0, s.item->>'icon', COALESCE(s.item->>'color', '#4ADE80'), s.ord - 1, s.is_parent
+    FROM src s
+    LEFT JOIN src p ON p.item->>'ref' = s.item->>'parent_ref';
+
+    RETURN (
+        SELECT to_jsonb(b) || jsonb_build_object(
+            'budget_items',
+            (SELECT COALESCE(jsonb_agg(to_jsonb(bi) ORDER BY bi.display_order), '[]'::jsonb)
+             FROM budget_items bi WHERE bi.budget_id = b.id)
+        )
+        FROM budgets b
+        WHERE b.id = v_budget_id
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION create_budget_with_items(JSONB, JSONB, UUID) IS 'Creates a budget with its custom or framework items atomically; used by POST /api/budgets';
+
+-- SECURITY DEFINER, so it bypasses RLS: only the API (service_role) may call it
+REVOKE EXECUTE ON FUNCTION create_budget_with_items(JSONB, JSONB, UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION create_budget_with_items(JSONB, JSONB, UUID) TO service_role;
@@ -0,0 +1,104 @@
+-- Migration: 019_parent_category_functions.sql
+-- Description: Create parent categories and add children in one transactional call
+-- Author: System
+-- Date: 2026-10-17
+
+-- A budget item with its direct children, as returned by the parent
+-- category endpoints. Read after the inserts, so the parent already
+-- carries the amounts rolled up by the migration 013 triggers.
+CREATE OR REPLACE FUNCTION budget_item_with_children(p_item_id UUID)
+RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    SELECT to_jsonb(p) || jsonb_build_object(
+        'children',
+        (SELECT COALESCE(jsonb_agg(to_jsonb(c) ORDER BY c.display_order, c.created_at), '[]'::jsonb)
+         FROM budget_items c WHERE c.parent_id = p.id)
+    )
+    FROM budget_items p
+    WHERE p.id = p_item_id;
+$$;
+
+-- Insert a parent category and its children. Children inherit the
+-- parent's category_type and, unless given, its color; a child without a
+-- display_order takes its position in p_children.
+-- Raises no_data_found if the budget does not exist.
+CREATE OR REPLACE FUNCTION create_parent_category(
+    p_budget_id UUID,
+    p_parent JSONB,
+    p_children JSONB
+)
+RETURNS JSONB
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_parent budget_items;
+BEGIN
+    INSERT INTO budget_items (budget_id, parent_id, category, description, category_type,
+                              budgeted_amount, spent_amount, icon, color, display_order, is_parent)
+    SELECT b.id, NULL, r.category, r.description, COALESCE(r.category_type, 'needs'),
+           0, 0, r.icon, COALESCE(r.color, '#4ADE80'), COALESCE(r.display_order, 0), TRUE
+    FROM budgets b
+    CROSS JOIN jsonb_populate_record(NULL::budget_items, p_parent) AS r
+    WHERE b.id = p_budget_id
+    RETURNING * INTO v_parent;
+
+    IF v_parent.id IS NULL THEN
+        RAISE EXCEPTION 'Budget % not found', p_budget_id USING ERRCODE = 'no_data_found';
+    END IF;
+
+    INSERT INTO budget_items (budget_id, parent_id, category, description, category_type,
+                              budgeted_amount, spent_amount, icon, color, display_order, is_parent)
+    SELECT p_budget_id, v_parent.id, r.category, r.description, v_parent.category_type,
+           COALESCE(r.budgeted_amount, 0), 0, r.icon,
+           COALESCE(r.color, v_parent.color),
+           CASE WHEN COALESCE(r.display_order, 0) > 0 THEN r.display_order ELSE (x.ord - 1)::integer END,
+           FALSE
+    FROM jsonb_array_elements(p_children) WITH ORDINALITY AS x(child, ord)
+    CROSS JOIN LATERAL jsonb_populate_record(NULL::budget_items, x.child) AS r;
+
+    RETURN budget_item_with_children(v_parent.id);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Insert one child under an existing parent category and return the
+-- updated parent with all of its children.
+-- Raises no_data_found if the parent does not exist and
+-- invalid_parameter_value if it is not a parent category.
+CREATE OR REPLACE FUNCTION add_child_to_parent(p_parent_id UUID, p_child JSONB)
+RETURNS JSONB
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    INSERT INTO budget_items (budget_id, parent_id, category, description, category_type,
+                              budgeted_amount, spent_amount, icon, color, display_order, is_parent)
+    SELECT p.budget_id, p.id, r.category, r.description, p.category_type,
+           COALESCE(r.budgeted_amount, 0), 0, r.icon,
+           COALESCE(r.color, p.color), COALESCE(r.display_order, 0), FALSE
+    FROM budget_items p
+    CROSS JOIN jsonb_populate_record(NULL::budget_items, p_child) AS r
+    WHERE p.id = p_parent_id
+    AND p.is_parent = TRUE;
+
+    IF NOT FOUND THEN
+        IF EXISTS (SELECT 1 FROM budget_items WHERE id = p_parent_id) THEN
+            RAISE EXCEPTION 'Item is not a parent category' USING ERRCODE = 'invalid_parameter_value';
+        END IF;
+        RAISE EXCEPTION 'Parent category not found' USING ERRCODE = 'no_data_found';
+    END IF;
+
+    RETURN budget_item_with_children(p_parent_id);
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION budget_item_with_children(UUID) IS 'A budget item with its direct children';
+COMMENT ON FUNCTION create_parent_category(UUID, JSONB, JSONB) IS 'Creates a parent category with children atomically; used by POST /api/budgets/{id}/items/parent';
+COMMENT ON FUNCTION add_child_to_parent(UUID, JSONB) IS 'Adds a child to a parent category; used by POST /api/budgets/items/{id}/children';
+
+-- SECURITY DEFINER, so they bypass RLS: only the API (service_role) may call them
+REVOKE EXECUTE ON FUNCTION create_parent_category(UUID, JSONB, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION create_parent_category(UUID, JSONB, JSONB) TO service_role;
+REVOKE EXECUTE ON FUNCTION add_child_to_parent(UUID, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION add_child_to_parent(UUID, JSONB) TO service_role;
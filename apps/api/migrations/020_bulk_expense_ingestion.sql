@@ -0,0 +1,130 @@
+-- Migration: 020_bulk_expense_ingestion.sql
+-- Description: Idempotent bulk expense inserts with one spent delta per budget item per batch
+-- Author: System
+-- Date: 2026-10-17
+
+-- Bank syncs and imports are retried, so a bank transaction may only be
+-- stored once per space. The partial index from 001 becomes unique and
+-- gains space_id, which makes it usable as an ON CONFLICT arbiter.
+-- Creating it fails if duplicates are already stored; remove them first.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_expenses_space_bank_transaction
+ON expenses(space_id, bank_transaction_id)
+WHERE bank_transaction_id IS NOT NULL;
+
+DROP INDEX IF EXISTS idx_expenses_bank_transaction_id;
+
+-- Insert a batch of expenses into one space in a single statement.
+--
+-- p_rows is a JSON array of expense objects (amount, description,
+-- category, date, budget_id, budget_item_id, payment_method,
+-- bank_transaction_id, currency, tags, notes, ai_category_confidence).
+-- Rows whose bank_transaction_id is already stored for the space, or
+-- repeated within the batch, are skipped.
+--
+-- Spent amounts of the referenced budget items grow by one aggregated
+-- delta per item for the whole batch; parents and budget totals follow
+-- through the migration 012/013 statement-level triggers, and the monthly
+-- rollups through migration 009.
+--
+-- Raises insufficient_privilege if p_created_by is not an active member
+-- of the space and invalid_parameter_value if a row references a budget
+-- or budget item outside the space, a parent category, or a budget_id
+-- other than its budget item's budget.
+CREATE OR REPLACE FUNCTION bulk_insert_expenses(
+    p_space_id UUID,
+    p_created_by UUID,
+    p_rows JSONB
+)
+RETURNS JSONB
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_received INTEGER := jsonb_array_length(p_rows);
+    v_inserted INTEGER;
+    v_item_ids UUID[];
+    v_spent DECIMAL[];
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM space_members
+        WHERE space_id = p_space_id
+        AND user_id = p_created_by
+        AND is_active = TRUE
+    ) THEN
+        RAISE EXCEPTION 'Not a member of space %', p_space_id USING ERRCODE = 'insufficient_privilege';
+    END IF;
+
+    -- Budgets and items must belong to the space (this function bypasses
+    -- RLS), items must not be parents, and a row naming both must name the
+    -- item's own budget
+    IF EXISTS (
+        SELECT 1
+        FROM jsonb_to_recordset(p_rows) AS r(budget_id UUID, budget_item_id UUID)
+        LEFT JOIN budget_items bi ON bi.id = r.budget_item_id
+        LEFT JOIN budgets ib ON ib.id = bi.budget_id
+        LEFT JOIN budgets rb ON rb.id = r.budget_id
+        WHERE (r.budget_item_id IS NOT NULL
+               AND (ib.space_id IS DISTINCT FROM p_space_id OR bi.is_parent))
+        OR (r.budget_id IS NOT NULL
+            AND (rb.space_id IS DISTINCT FROM p_space_id
+                 OR (r.budget_item_id IS NOT NULL AND bi.budget_id IS DISTINCT FROM r.budget_id)))
+    ) THEN
+        RAISE EXCEPTION 'Expenses must reference budgets and non-parent budget items of space %', p_space_id
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    WITH ins AS (
+        INSERT INTO expenses (space_id, budget_id, budget_item_id, amount, description, category,
+                              ai_category_confidence, date, payment_method, bank_transaction_id,
+                              currency, tags, notes, created_by)
+        SELECT p_space_id, COALESCE(bi.budget_id, r.budget_id), r.budget_item_id, r.amount,
+               r.description, r.category, r.ai_category_confidence,
+               COALESCE(r.date, CURRENT_DATE), r.payment_method, r.bank_transaction_id,
+               COALESCE(r.currency, 'USD'), r.tags, r.notes, p_created_by
+        FROM jsonb_to_recordset(p_rows) AS r(
+            amount DECIMAL(12, 2), description TEXT, category TEXT, date DATE,
+            budget_id UUID, budget_item_id UUID, payment_method TEXT,
+            bank_transaction_id TEXT, currency TEXT, tags TEXT[], notes TEXT,
+            ai_category_confidence DECIMAL(3, 2)
+        )
+        LEFT JOIN budget_items bi ON bi.id = r.budget_item_id
+        ON CONFLICT (space_id, bank_transaction_id) WHERE bank_transaction_id IS NOT NULL
+        DO NOTHING
+        RETURNING budget_item_id, amount
+    )
+    SELECT (SELECT COUNT(*) FROM ins),
+           array_agg(d.budget_item_id ORDER BY d.budget_item_id),
+           array_agg(d.spent ORDER BY d.budget_item_id)
+    INTO v_inserted, v_item_ids, v_spent
+    FROM (
+        SELECT budget_item_id, SUM(amount) AS spent
+        FROM ins
+        WHERE budget_item_id IS NOT NULL
+        GROUP BY budget_item_id
+    ) AS d;
+
+    IF v_item_ids IS NOT NULL THEN
+        -- Lock in id order so concurrent batches cannot deadlock
+        PERFORM 1 FROM budget_items WHERE id = ANY(v_item_ids) ORDER BY id FOR UPDATE;
+
+        UPDATE budget_items t
+        SET spent_amount = t.spent_amount + d.spent,
+            updated_at = NOW()
+        FROM unnest(v_item_ids, v_spent) AS d(id, spent)
+        WHERE t.id = d.id;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'received', v_received,
+        'inserted', v_inserted,
+        'skipped', v_received - v_inserted
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION bulk_insert_expenses(UUID, UUID, JSONB) IS 'Idempotent bulk expense insert for POST /api/expenses/bulk';
+
+-- SECURITY DEFINER and trusts p_created_by: only the API (service_role), which
+-- passes the authenticated user, may call it
+REVOKE EXECUTE ON FUNCTION bulk_insert_expenses(UUID, UUID, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION bulk_insert_expenses(UUID, UUID, JSONB) TO service_role;
@@ -0,0 +1,22 @@
+-- Migration: 021_expense_search.sql
+-- Description: Indexes for GET /api/expenses/search
+-- Author: System
+-- Date: 2026-10-17
+
+-- Description matching (:q <% description) is served by the existing
+-- idx_expenses_description_trgm GIN index from 001.
+
+-- Browsing without a search term pages with
+--   WHERE space_id = $1 AND (date, id) < ($cursor_date, $cursor_id)
+--   ORDER BY date DESC, id DESC LIMIT n
+-- which this index serves directly, so a page reads n rows however long
+-- the space's history is.
+CREATE INDEX IF NOT EXISTS idx_expenses_space_date_id
+ON expenses(space_id, date DESC, id DESC);
+
+-- Covered by the index above
+DROP INDEX IF EXISTS idx_expenses_space_date;
+
+-- tags @> ARRAY[...] filter
+CREATE INDEX IF NOT EXISTS idx_expenses_tags
+ON expenses USING gin(tags);
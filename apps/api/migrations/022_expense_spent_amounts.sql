@@ -0,0 +1,259 @@
+-- Migration: 022_expense_spent_amounts.sql
+-- Description: Maintain budget_items.spent_amount from expenses with statement-level deltas
+-- Author: System
+-- Date: 2026-10-17
+
+-- spent_amount of a (non-parent) budget item is the sum of the expenses
+-- assigned to it. Every expense write adds its net change per item, once
+-- per statement; parents follow through the migration 013 rollup triggers
+-- and budget totals through migration 012, so budget screens read
+-- precomputed values.
+--
+-- Existing spent amounts are not recomputed here: run
+--     python -m scripts.budget_spent reconcile
+-- once after deploying, which replaces them space by space with the sum
+-- of their expenses (including manually entered amounts).
+CREATE OR REPLACE FUNCTION apply_expense_spent_deltas()
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_item_ids UUID[];
+    v_spent DECIMAL[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(budget_item_id ORDER BY budget_item_id),
+               array_agg(spent ORDER BY budget_item_id)
+        INTO v_item_ids, v_spent
+        FROM (
+            SELECT budget_item_id, SUM(amount) AS spent
+            FROM new_rows
+            WHERE budget_item_id IS NOT NULL
+            GROUP BY budget_item_id
+        ) AS d;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(budget_item_id ORDER BY budget_item_id),
+               array_agg(-spent ORDER BY budget_item_id)
+        INTO v_item_ids, v_spent
+        FROM (
+            SELECT budget_item_id, SUM(amount) AS spent
+            FROM old_rows
+            WHERE budget_item_id IS NOT NULL
+            GROUP BY budget_item_id
+        ) AS d;
+
+    ELSE
+        -- UPDATE: new amounts count for the new item, old amounts leave the
+        -- old one (covers amount edits and re-assignment alike)
+        SELECT array_agg(budget_item_id ORDER BY budget_item_id),
+               array_agg(spent ORDER BY budget_item_id)
+        INTO v_item_ids, v_spent
+        FROM (
+            SELECT budget_item_id, SUM(amount) AS spent
+            FROM (
+                SELECT budget_item_id, amount
+                FROM new_rows
+                WHERE budget_item_id IS NOT NULL
+                UNION ALL
+                SELECT budget_item_id, -amount
+                FROM old_rows
+                WHERE budget_item_id IS NOT NULL
+            ) AS changes
+            GROUP BY budget_item_id
+            HAVING SUM(amount) <> 0
+        ) AS d;
+    END IF;
+
+    IF v_item_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- Lock in id order so concurrent statements cannot deadlock
+    PERFORM 1 FROM budget_items WHERE id = ANY(v_item_ids) ORDER BY id FOR UPDATE;
+
+    -- Items not reconciled yet may hold less than their expenses; never
+    -- go below zero (CHECK spent_amount >= 0), the reconcile fixes them
+    UPDATE budget_items t
+    SET spent_amount = GREATEST(t.spent_amount + d.spent, 0),
+        updated_at = NOW()
+    FROM unnest(v_item_ids, v_spent) AS d(id, spent)
+    WHERE t.id = d.id
+    AND t.is_parent = FALSE;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_expense_spent_insert ON expenses;
+CREATE TRIGGER trigger_expense_spent_insert
+AFTER INSERT ON expenses
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_expense_spent_deltas();
+
+DROP TRIGGER IF EXISTS trigger_expense_spent_update ON expenses;
+CREATE TRIGGER trigger_expense_spent_update
+AFTER UPDATE ON expenses
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_expense_spent_deltas();
+
+DROP TRIGGER IF EXISTS trigger_expense_spent_delete ON expenses;
+CREATE TRIGGER trigger_expense_spent_delete
+AFTER DELETE ON expenses
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION apply_expense_spent_deltas();
+
+-- bulk_insert_expenses (migration 020) applied the spent deltas itself;
+-- the trigger above does that now, so it only inserts
+CREATE OR REPLACE FUNCTION bulk_insert_expenses(
+    p_space_id UUID,
+    p_created_by UUID,
+    p_rows JSONB
+)
+RETURNS JSONB
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_received INTEGER := jsonb_array_length(p_rows);
+    v_inserted INTEGER;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM space_members
+        WHERE space_id = p_space_id
+        AND user_id = p_created_by
+        AND is_active = TRUE
+    ) THEN
+        RAISE EXCEPTION 'Not a member of space %', p_space_id USING ERRCODE = 'insufficient_privilege';
+    END IF;
+
+    -- Budgets and items must belong to the space (this function bypasses
+    -- RLS), items must not be parents, and a row naming both must name the
+    -- item's own budget
+    IF EXISTS (
+        SELECT 1
+        FROM jsonb_to_recordset(p_rows) AS r(budget_id UUID, budget_item_id UUID)
+        LEFT JOIN budget_items bi ON bi.id = r.budget_item_id
+        LEFT JOIN budgets ib ON ib.id = bi.budget_id
+        LEFT JOIN budgets rb ON rb.id = r.budget_id
+        WHERE (r.budget_item_id IS NOT NULL
+               AND (ib.space_id IS DISTINCT FROM p_space_id OR bi.is_parent))
+        OR (r.budget_id IS NOT NULL
+            AND (rb.space_id IS DISTINCT FROM p_space_id
+                 OR (r.budget_item_id IS NOT NULL AND bi.budget_id IS DISTINCT FROM r.budget_id)))
+    ) THEN
+        RAISE EXCEPTION 'Expenses must reference budgets and non-parent budget items of space %', p_space_id
+            USING ERRCODE = 'invalid_parameter_value';
+    END IF;
+
+    INSERT INTO expenses (space_id, budget_id, budget_item_id, amount, description, category,
+                          ai_category_confidence, date, payment_method, bank_transaction_id,
+                          currency, tags, notes, created_by)
+    SELECT p_space_id, COALESCE(bi.budget_id, r.budget_id), r.budget_item_id, r.amount,
+           r.description, r.category, r.ai_category_confidence,
+           COALESCE(r.date, CURRENT_DATE), r.payment_method, r.bank_transaction_id,
+           COALESCE(r.currency, 'USD'), r.tags, r.notes, p_created_by
+    FROM jsonb_to_recordset(p_rows) AS r(
+        amount DECIMAL(12, 2), description TEXT, category TEXT, date DATE,
+        budget_id UUID, budget_item_id UUID, payment_method TEXT,
+        bank_transaction_id TEXT, currency TEXT, tags TEXT[], notes TEXT,
+        ai_category_confidence DECIMAL(3, 2)
+    )
+    LEFT JOIN budget_items bi ON bi.id = r.budget_item_id
+    ON CONFLICT (space_id, bank_transaction_id) WHERE bank_transaction_id IS NOT NULL
+    DO NOTHING;
+
+    GET DIAGNOSTICS v_inserted = ROW_COUNT;
+
+    RETURN jsonb_build_object(
+        'received', v_received,
+        'inserted', v_inserted,
+        'skipped', v_received - v_inserted
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Set the spent amount of every non-parent item in a space's budgets to
+-- the sum of its expenses. Parents and budget totals follow through the
+-- triggers. Returns the number of items corrected.
+--
+-- The items are locked first, in id order, and summed in a later
+-- statement: expense writes that committed before the locks were granted
+-- are in the sums, and later ones wait and then apply their delta on top.
+-- Only the space's items are locked, so the batch job can run live.
+CREATE OR REPLACE FUNCTION reconcile_budget_item_spent(p_space_id UUID)
+RETURNS INTEGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    PERFORM 1
+    FROM budget_items bi
+    JOIN budgets b ON b.id = bi.budget_id
+    WHERE b.space_id = p_space_id
+    AND bi.is_parent = FALSE
+    ORDER BY bi.id
+    FOR UPDATE OF bi;
+
+    UPDATE budget_items t
+    SET spent_amount = s.spent,
+        updated_at = NOW()
+    FROM (
+        SELECT bi.id, COALESCE(SUM(e.amount), 0) AS spent
+        FROM budget_items bi
+        JOIN budgets b ON b.id = bi.budget_id
+        LEFT JOIN expenses e ON e.budget_item_id = bi.id
+        WHERE b.space_id = p_space_id
+        AND bi.is_parent = FALSE
+        GROUP BY bi.id
+    ) AS s
+    WHERE t.id = s.id
+    AND t.spent_amount <> s.spent;
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Non-parent items whose spent amount differs from the sum of their expenses
+CREATE OR REPLACE FUNCTION check_budget_item_spent(p_space_id UUID DEFAULT NULL)
+RETURNS TABLE (
+    space_id UUID,
+    budget_id UUID,
+    budget_item_id UUID,
+    stored_spent DECIMAL(12, 2),
+    actual_spent DECIMAL(12, 2)
+)
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    SELECT b.space_id, b.id, bi.id, bi.spent_amount, COALESCE(SUM(e.amount), 0)
+    FROM budget_items bi
+    JOIN budgets b ON b.id = bi.budget_id
+    LEFT JOIN expenses e ON e.budget_item_id = bi.id
+    WHERE (p_space_id IS NULL OR b.space_id = p_space_id)
+    AND bi.is_parent = FALSE
+    GROUP BY b.space_id, b.id, bi.id, bi.spent_amount
+    HAVING bi.spent_amount <> COALESCE(SUM(e.amount), 0);
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION apply_expense_spent_deltas() IS 'Applies per-statement expense deltas to budget_items.spent_amount';
+COMMENT ON FUNCTION bulk_insert_expenses(UUID, UUID, JSONB) IS 'Idempotent bulk expense insert for POST /api/expenses/bulk';
+COMMENT ON FUNCTION reconcile_budget_item_spent(UUID) IS 'Recomputes spent_amount of a space''s budget items from expenses; returns the number of items corrected';
+COMMENT ON FUNCTION check_budget_item_spent(UUID) IS 'Lists budget items whose spent_amount differs from the sum of their expenses';
+
+-- Redefined above: keep bulk_insert_expenses service_role only (migration 020)
+REVOKE EXECUTE ON FUNCTION bulk_insert_expenses(UUID, UUID, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION bulk_insert_expenses(UUID, UUID, JSONB) TO service_role;
+
+-- SECURITY DEFINER maintenance functions: service_role only
+REVOKE EXECUTE ON FUNCTION reconcile_budget_item_spent(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION reconcile_budget_item_spent(UUID) TO service_role;
+REVOKE EXECUTE ON FUNCTION check_budget_item_spent(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION check_budget_item_spent(UUID) TO service_role;
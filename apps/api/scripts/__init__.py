@@ -0,0 +1 @@
+"""Maintenance commands (run with python -m scripts.<name> from apps/api)"""
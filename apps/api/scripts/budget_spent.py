@@ -0,0 +1,89 @@
+"""
+Budget item spent amount maintenance
+
+Recomputes budget_items.spent_amount from expenses (the triggers of
+migration 022 keep it current afterwards) and checks the two agree.
+
+    python -m scripts.budget_spent reconcile [--space-id <uuid>]
+    python -m scripts.budget_spent check [--space-id <uuid>]
+
+`reconcile` without --space-id walks every space, one transaction per
+space, so only one space's items are locked at a time and the job can run
+against a live database. `check` exits with status 1 when it finds drift,
+so it can run from cron.
+"""
+import argparse
+import asyncio
+import sys
+from typing import Optional
+
+from sqlalchemy import text
+
+from src.core.database import create_async_db_engine
+
+
+async def reconcile(space_id: Optional[str]) -> int:
+    """Reconcile one space, or every space when space_id is None"""
+    engine = create_async_db_engine()
+    try:
+        if space_id:
+            space_ids = [space_id]
+        else:
+            async with engine.connect() as conn:
+                result = await conn.execute(text("SELECT id FROM spaces ORDER BY id"))
+                space_ids = [str(row[0]) for row in result]
+
+        corrected = 0
+        for i, sid in enumerate(space_ids, start=1):
+            async with engine.begin() as conn:
+                result = await conn.execute(
+                    text("SELECT reconcile_budget_item_spent(CAST(:space_id AS uuid))"),
+                    {"space_id": sid}
+                )
+                items = result.scalar_one()
+            corrected += items
+            if items:
+                print(f"  space {sid}: corrected {items} items")
+            if i % 500 == 0:
+                print(f"  ... {i}/{len(space_ids)} spaces")
+    finally:
+        await engine.dispose()
+
+    print(f"Reconciled {len(space_ids)} spaces, corrected {corrected} budget items")
+    return 0
+
+
+async def check(space_id: Optional[str]) -> int:
+    """Print budget items whose spent amount differs from their expenses"""
+    engine = create_async_db_engine()
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text("SELECT * FROM check_budget_item_spent(CAST(:space_id AS uuid))"),
+                {"space_id": space_id}
+            )
+            mismatches = result.mappings().all()
+    finally:
+        await engine.dispose()
+
+    if not mismatches:
+        print("Spent amounts are consistent with expenses")
+        return 0
+
+    print(f"Found {len(mismatches)} inconsistent budget items:")
+    for row in mismatches:
+        print(
+            f"  space={row['space_id']} budget={row['budget_id']} item={row['budget_item_id']} "
+            f"spent {row['stored_spent']} != {row['actual_spent']}"
+        )
+    return 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["reconcile", "check"])
+    parser.add_argument("--space-id", default=None, help="Limit to one space")
+    args = parser.parse_args()
+
+    command = reconcile if args.command == "reconcile" else check
+    sys.exit(asyncio.run(command(args.space_id)))
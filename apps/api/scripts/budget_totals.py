@@ -0,0 +1,61 @@
+"""
+Budget totals verification
+
+Compares budgets.total_budgeted / total_spent (maintained by the triggers
+of migration 012) with an exact re-sum of their top-level items.
+
+    python -m scripts.budget_totals <budget_id> [<budget_id> ...] [--repair]
+    python -m scripts.budget_totals --space-id <uuid> [--repair]
+
+Exits with status 1 when any budget has drifted. --repair recomputes the
+drifted budgets in the database.
+"""
+import argparse
+import asyncio
+import sys
+from typing import List, Optional
+from uuid import UUID
+
+from src.core.supabase import create_async_supabase_client
+from src.services.budget_service import BudgetService
+
+
+async def main(budget_ids: List[str], space_id: Optional[str], repair: bool) -> int:
+    client = create_async_supabase_client()
+    try:
+        if space_id:
+            response = await client.table("budgets").select("id").eq("space_id", space_id).execute()
+            budget_ids = budget_ids + [row["id"] for row in response.data or []]
+
+        service = BudgetService(client)
+        drifted = []
+        for budget_id in budget_ids:
+            result = await service.verify_budget_totals(UUID(budget_id))
+            if not result["consistent"]:
+                drifted.append(budget_id)
+                print(f"  {budget_id}: stored {result['stored']} expected {result['expected']}")
+
+        print(f"Checked {len(budget_ids)} budgets, {len(drifted)} drifted")
+
+        if repair:
+            for budget_id in drifted:
+                await client.rpc("recalculate_budget_totals", {"p_budget_id": budget_id}).execute()
+            if drifted:
+                print(f"Repaired {len(drifted)} budgets")
+            return 0
+    finally:
+        await client.aclose()
+
+    return 1 if drifted else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("budget_ids", nargs="*")
+    parser.add_argument("--space-id", default=None, help="Check every budget of a space")
+    parser.add_argument("--repair", action="store_true", help="Recompute drifted budgets")
+    args = parser.parse_args()
+
+    if not args.budget_ids and not args.space_id:
+        parser.error("pass budget ids or --space-id")
+    sys.exit(asyncio.run(main(args.budget_ids, args.space_id, args.repair)))
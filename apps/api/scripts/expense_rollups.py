@@ -0,0 +1,72 @@
+"""
+Expense rollup maintenance
+
+Backfills expense_monthly_rollups from expenses and checks the two agree.
+
+    python -m scripts.expense_rollups backfill [--space-id <uuid>]
+    python -m scripts.expense_rollups check [--space-id <uuid>]
+
+`check` exits with status 1 when it finds drift, so it can run from cron.
+"""
+import argparse
+import asyncio
+import sys
+from typing import Optional
+
+from sqlalchemy import text
+
+from src.core.database import create_async_db_engine
+
+
+async def backfill(space_id: Optional[str]) -> int:
+    """Rebuild rollups for one space, or all spaces when space_id is None"""
+    engine = create_async_db_engine()
+    try:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                text("SELECT rebuild_expense_monthly_rollups(CAST(:space_id AS uuid))"),
+                {"space_id": space_id}
+            )
+            rebuilt = result.scalar_one()
+    finally:
+        await engine.dispose()
+
+    print(f"Rebuilt {rebuilt} rollup rows" + (f" for space {space_id}" if space_id else ""))
+    return 0
+
+
+async def check(space_id: Optional[str]) -> int:
+    """Print rollup rows that differ from a fresh aggregation of expenses"""
+    engine = create_async_db_engine()
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text("SELECT * FROM check_expense_monthly_rollups(CAST(:space_id AS uuid))"),
+                {"space_id": space_id}
+            )
+            mismatches = result.mappings().all()
+    finally:
+        await engine.dispose()
+
+    if not mismatches:
+        print("Rollups are consistent with expenses")
+        return 0
+
+    print(f"Found {len(mismatches)} inconsistent rollup rows:")
+    for row in mismatches:
+        print(
+            f"  space={row['space_id']} month={row['month']} category={row['category']!r} "
+            f"total {row['rollup_total']} != {row['actual_total']} "
+            f"count {row['rollup_count']} != {row['actual_count']}"
+        )
+    return 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["backfill", "check"])
+    parser.add_argument("--space-id", default=None, help="Limit to one space")
+    args = parser.parse_args()
+
+    command = backfill if args.command == "backfill" else check
+    sys.exit(asyncio.run(command(args.space_id)))
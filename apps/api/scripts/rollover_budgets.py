@@ -0,0 +1,60 @@
+"""
+Month rollover
+
+Copies every active space's master budget from one month into the next
+(items, hierarchy and budgeted amounts; spent starts at 0). Spaces are
+processed in chunks, one transaction per chunk, and spaces that already
+have a master budget for the target month are skipped, so the command can
+be re-run safely after an interruption.
+
+    python -m scripts.rollover_budgets --from 2026-10 --to 2026-11 [--chunk 500] [--no-amounts]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import Optional
+
+from src.core.supabase import create_async_supabase_client
+
+
+async def rollover(from_month: str, to_month: str, chunk: int, copy_amounts: bool) -> int:
+    client = create_async_supabase_client()
+    started = time.perf_counter()
+    after_space_id: Optional[str] = None
+    processed = created = 0
+
+    try:
+        while True:
+            response = await client.rpc("rollover_master_budgets", {
+                "p_from_month_period": from_month,
+                "p_to_month_period": to_month,
+                "p_after_space_id": after_space_id,
+                "p_limit": chunk,
+                "p_copy_amounts": copy_amounts,
+            }).execute()
+
+            result = response.data
+            processed += result["processed"]
+            created += result["created"]
+            after_space_id = result["last_space_id"]
+            print(f"  chunk: {result['processed']} spaces, {result['created']} budgets created")
+
+            if result["processed"] < chunk:
+                break
+    finally:
+        await client.aclose()
+
+    elapsed = time.perf_counter() - started
+    print(f"Rolled {from_month} -> {to_month}: {processed} spaces, {created} budgets created in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--from", dest="from_month", required=True, help="Source month (YYYY-MM)")
+    parser.add_argument("--to", dest="to_month", required=True, help="Target month (YYYY-MM)")
+    parser.add_argument("--chunk", type=int, default=500, help="Spaces per transaction")
+    parser.add_argument("--no-amounts", action="store_true", help="Start income and budgeted amounts at 0")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(rollover(args.from_month, args.to_month, args.chunk, not args.no_amounts)))
@@ -5,9 +5,11 @@ REST API endpoints for budget and budget item management.
 """
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, Query
 
-from ...core.auth import get_current_user, get_supabase_client
+from ...core.auth import get_current_user
+from ...core.supabase import get_supabase_client
+from ...core.resources import get_dashboard_cache
 from ...schemas.budget import (
     BudgetCreate,
     BudgetUpdate,
@@ -20,11 +22,15 @@ from ...schemas.budget import (
     BudgetItemChildCreate,
     ParentCategoryCreate,
     BudgetStats,
+    BudgetStatsRangeResponse,
     BudgetType,
     BudgetFramework,
+    BudgetReplicateRequest,
+    BudgetItemBatchRequest,
 )
 from ...services.budget_service import BudgetService, FRAMEWORK_TEMPLATES
-from supabase import Client
+from ...services.dashboard_service import DashboardCache
+from postgrest import AsyncPostgrestClient
 
 
 router = APIRouter(prefix="/api/budgets", tags=["Budgets"])
@@ -34,9 +40,19 @@ router = APIRouter(prefix="/api/budgets", tags=["Budgets"])
 # DEPENDENCY INJECTION
 # =====================================================
 
-def get_budget_service(supabase: Client = Depends(get_supabase_client)) -> BudgetService:
+def get_budget_service(
+    supabase: AsyncPostgrestClient = Depends(get_supabase_client),
+    dashboard_cache: DashboardCache = Depends(get_dashboard_cache)
+) -> BudgetService:
     """Dependency to get budget service instance"""
-    return BudgetService(supabase)
+    return BudgetService(supabase, dashboard_cache)
+
+
+def _split_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated ?fields= value"""
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(",") if f.strip()]
 
 
 # =====================================================
@@ -68,29 +84,79 @@ async def list_budgets(
     space_id: UUID,
     month_period: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
     budget_type: Optional[BudgetType] = None,
+    limit: int = Query(12, ge=1, le=100, description="Budgets per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    include_items: bool = Query(True, description="Embed each budget's items"),
+    fields: Optional[str] = Query(None, description="Comma-separated budget columns, e.g. id,name,total_budgeted"),
+    item_fields: Optional[str] = Query(None, description="Comma-separated item columns, e.g. id,category,budgeted_amount"),
     current_user: dict = Depends(get_current_user),
     service: BudgetService = Depends(get_budget_service)
 ):
     """
-    List all budgets for a space
+    List budgets for a space, newest month first
 
     **Query Parameters:**
     - month_period: Filter by month (YYYY-MM format)
     - budget_type: Filter by type (master or secondary)
+    - limit: Page size (default 12)
+    - cursor: Pass next_cursor from the previous response to get the next page
+    - include_items: Set to false to skip budget items
+    - fields / item_fields: Only return these columns (id is always included)
+
+    `next_cursor` is null on the last page.
 
     **Permissions:** Space members can view budgets
     """
     user_id = UUID(current_user["sub"])
-    budgets = await service.list_budgets(
+    page = await service.list_budgets(
         space_id=space_id,
         month_period=month_period,
         budget_type=budget_type,
-        user_id=user_id
+        user_id=user_id,
+        limit=limit,
+        cursor=cursor,
+        include_items=include_items,
+        fields=_split_fields(fields),
+        item_fields=_split_fields(item_fields)
     )
 
     return {
-        "budgets": budgets,
-        "total": len(budgets)
+        "budgets": page["budgets"],
+        "total": len(page["budgets"]),
+        "next_cursor": page["next_cursor"]
+    }
+
+
+@router.get("/stats", response_model=BudgetStatsRangeResponse)
+async def get_budget_stats_range(
+    space_id: UUID,
+    from_month_period: str = Query(..., alias="from", pattern=r"^\d{4}-\d{2}$"),
+    to_month_period: str = Query(..., alias="to", pattern=r"^\d{4}-\d{2}$"),
+    current_user: dict = Depends(get_current_user),
+    service: BudgetService = Depends(get_budget_service)
+):
+    """
+    Get statistics for all budgets of a space over a range of months
+
+    **Query Parameters:**
+    - space_id: The space
+    - from / to: First and last month (YYYY-MM), inclusive
+
+    Each entry has the same shape as GET /{budget_id}/stats.
+    """
+    user_id = UUID(current_user["sub"])
+    budgets = await service.get_budget_stats_range(
+        space_id,
+        from_month_period,
+        to_month_period,
+        user_id
+    )
+
+    return {
+        "space_id": space_id,
+        "from_month_period": from_month_period,
+        "to_month_period": to_month_period,
+        "budgets": budgets
     }
 
 
@@ -129,7 +195,8 @@ async def create_budget(
     - budget_items: Optional custom items (used if framework=custom)
 
     **Business Rules:**
-    - Only ONE master budget per space per month
+    - Only ONE budget per type per space per month (409 otherwise)
+    - The budget and its items are created atomically
     - Framework categories are auto-generated based on income
     - Custom items override framework if provided
 
@@ -173,6 +240,32 @@ async def delete_budget(
     return None
 
 
+@router.post("/{budget_id}/replicate", response_model=BudgetResponse, status_code=status.HTTP_201_CREATED)
+async def replicate_budget(
+    budget_id: UUID,
+    replicate_data: BudgetReplicateRequest,
+    current_user: dict = Depends(get_current_user),
+    service: BudgetService = Depends(get_budget_service)
+):
+    """
+    Copy a budget into another month
+
+    **Request Body:**
+    - target_month_period: YYYY-MM of the new budget
+    - copy_amounts: Copy income and budgeted amounts (otherwise start at 0)
+    - copy_items: Copy the item hierarchy (parents and children)
+
+    **Business Rules:**
+    - Spent amounts always start at 0
+    - Parent totals are recalculated from the copied children
+    - 409 if the space already has a budget of this type for the target month
+
+    **Permissions:** Space members can replicate budgets
+    """
+    user_id = UUID(current_user["sub"])
+    return await service.replicate_budget(budget_id, replicate_data, user_id)
+
+
 @router.get("/{budget_id}/stats", response_model=BudgetStats)
 async def get_budget_stats(
     budget_id: UUID,
@@ -188,7 +281,8 @@ async def get_budget_stats(
     - total_spent
     - remaining
     - percentage_spent
-    - category_breakdown (per-category stats)
+    - category_breakdown (per-item stats, parents and children)
+    - category_type_breakdown (needs/wants/savings, top-level items only)
     """
     user_id = UUID(current_user["sub"])
     stats = await service.get_budget_stats(budget_id, user_id)
@@ -304,7 +398,7 @@ async def create_parent_category(
     return await service.create_parent_category(budget_id, parent_data, user_id)
 
 
-@router.post("/items/{parent_id}/children", response_model=BudgetItemResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/items/{parent_id}/children", response_model=BudgetItemWithChildren, status_code=status.HTTP_201_CREATED)
 async def add_child_to_parent(
     parent_id: UUID,
     child_data: BudgetItemChildCreate,
@@ -326,7 +420,8 @@ async def add_child_to_parent(
     }
     ```
 
-    **Returns:** Created child item
+    **Returns:** The parent category with its updated total and all of its
+    children, including the new one
     """
     user_id = UUID(current_user["sub"])
     return await service.add_child_to_parent(parent_id, child_data, user_id)
@@ -335,6 +430,10 @@ async def add_child_to_parent(
 @router.get("/{budget_id}/items/hierarchy", response_model=dict)
 async def get_budget_items_hierarchy(
     budget_id: UUID,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated item columns, e.g. id,category,budgeted_amount"),
+    depth: int = Query(2, ge=1, le=10, description="Levels of nesting to return"),
+    if_none_match: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user),
     service: BudgetService = Depends(get_budget_service),
 ):
@@ -343,6 +442,13 @@ async def get_budget_items_hierarchy(
 
     Returns all budget items organized into a hierarchy with parents and their children.
 
+    **Query Parameters:**
+    - fields: Only return these item columns (id is always included)
+    - depth: Nesting levels (default 2: parents and their children)
+
+    **Caching:** The response carries an ETag. Send it back in If-None-Match
+    to get 304 Not Modified while the budget and its items are unchanged.
+
     **Response Structure:**
     ```json
     {
@@ -369,7 +475,61 @@ async def get_budget_items_hierarchy(
     ```
     """
     user_id = UUID(current_user["sub"])
-    return await service.get_budget_items_hierarchy(budget_id, user_id)
+    field_list = _split_fields(fields)
+    client_etag = if_none_match.strip('W/"') if if_none_match else None
+
+    tree = await service.get_budget_items_hierarchy(
+        budget_id,
+        user_id,
+        fields=field_list,
+        depth=depth,
+        if_none_match=client_etag
+    )
+
+    etag = f'"{tree["etag"]}"'
+    if tree.get("not_modified"):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return {"items": tree["items"]}
+
+
+@router.post("/{budget_id}/items/batch", response_model=dict)
+async def apply_budget_item_batch(
+    budget_id: UUID,
+    batch: BudgetItemBatchRequest,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+    service: BudgetService = Depends(get_budget_service),
+):
+    """
+    Apply several item operations in one transaction
+
+    Operations (create, update, delete, reorder) either all succeed or none
+    are applied. A create can name another create of the same batch as its
+    parent with `parent_ref` -> `ref`.
+
+    **Request Body:**
+    ```json
+    {
+      "operations": [
+        {"op": "create", "ref": "utilities", "data": {"category": "Utilities", "category_type": "needs", "is_parent": true}},
+        {"op": "create", "parent_ref": "utilities", "data": {"category": "Hydro", "category_type": "needs", "budgeted_amount": 80}},
+        {"op": "update", "id": "...", "data": {"budgeted_amount": 950}},
+        {"op": "delete", "id": "..."},
+        {"op": "reorder", "ids": ["...", "..."]}
+      ]
+    }
+    ```
+
+    Returns the updated item tree (same shape as GET /items/hierarchy) with
+    its ETag.
+    """
+    user_id = UUID(current_user["sub"])
+    tree = await service.apply_item_batch(budget_id, batch, user_id)
+
+    response.headers["ETag"] = f'"{tree["etag"]}"'
+    return {"items": tree["items"]}
 
 
 # =====================================================
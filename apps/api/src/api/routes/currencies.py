@@ -5,7 +5,7 @@ API endpoints for currency management.
 """
 
 from fastapi import APIRouter, Depends, Query
-from supabase import Client
+from postgrest import AsyncPostgrestClient
 from typing import Annotated
 
 from ...core.supabase import get_supabase_client
@@ -21,7 +21,7 @@ router = APIRouter(prefix="/api/currencies", tags=["currencies"])
 
 
 def get_currency_service(
-    supabase: Annotated[Client, Depends(get_supabase_client)]
+    supabase: Annotated[AsyncPostgrestClient, Depends(get_supabase_client)]
 ) -> CurrencyService:
     """Dependency to get currency service"""
     return CurrencyService(supabase)
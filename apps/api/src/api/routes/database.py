@@ -1,16 +1,19 @@
 """Database Health Check Routes"""
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from postgrest import AsyncPostgrestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from ...core.database import get_db
-from ...core.supabase import supabase
+from ...core.config import settings
+from ...core.database import get_db, get_pool_stats
+from ...core.resources import Resources, get_resources
+from ...core.supabase import get_supabase_client
 from datetime import datetime
 
 router = APIRouter(prefix="/database", tags=["database"])
 
 
 @router.get("/health")
-async def database_health_check(db: Session = Depends(get_db)):
+async def database_health_check(db: AsyncSession = Depends(get_db)):
     """
     Test database connectivity using SQLAlchemy
 
@@ -18,7 +21,7 @@ async def database_health_check(db: Session = Depends(get_db)):
     """
     try:
         # Test basic SQL query
-        result = db.execute(text("SELECT version(), current_database(), current_user, now()"))
+        result = await db.execute(text("SELECT version(), current_database(), current_user, now()"))
         row = result.fetchone()
 
         return {
@@ -30,14 +33,29 @@ async def database_health_check(db: Session = Depends(get_db)):
                 "server_time": row[3].isoformat()
             },
             "connection": "active",
+            "pool": get_pool_stats(db.bind),
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
 
 
+@router.get("/pool")
+async def database_pool_stats(resources: Resources = Depends(get_resources)):
+    """
+    Connection pool statistics for the async SQLAlchemy engine
+
+    Exposes pool size, checked in/out connections and overflow for metrics
+    """
+    return {
+        "status": "ok",
+        "pool": get_pool_stats(resources.async_engine),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
 @router.get("/tables")
-async def list_tables(db: Session = Depends(get_db)):
+async def list_tables(db: AsyncSession = Depends(get_db)):
     """
     List all tables in the public schema
 
@@ -51,7 +69,7 @@ async def list_tables(db: Session = Depends(get_db)):
             ORDER BY tablename
         """)
 
-        result = db.execute(query)
+        result = await db.execute(query)
         tables = [row[0] for row in result.fetchall()]
 
         expected_tables = [
@@ -85,7 +103,9 @@ async def list_tables(db: Session = Depends(get_db)):
 
 
 @router.get("/supabase/health")
-async def supabase_health_check():
+async def supabase_health_check(
+    supabase: AsyncPostgrestClient = Depends(get_supabase_client)
+):
     """
     Test Supabase client connectivity
 
@@ -93,13 +113,13 @@ async def supabase_health_check():
     """
     try:
         # Test a simple Supabase query
-        response = supabase.table("users").select("count", count="exact").limit(1).execute()
+        response = await supabase.table("users").select("count", count="exact").limit(1).execute()
 
         return {
             "status": "ok",
             "supabase": {
                 "connected": True,
-                "url": supabase.supabase_url,
+                "url": settings.SUPABASE_URL,
                 "user_table_accessible": True
             },
             "timestamp": datetime.utcnow().isoformat()
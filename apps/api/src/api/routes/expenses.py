@@ -0,0 +1,263 @@
+"""
+Expense Routes
+==============
+API endpoints for expense ingestion, search and export.
+"""
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from typing import List, Literal, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.auth import get_current_user
+from ...core.config import settings
+from ...core.database import get_db
+from ...core.supabase import get_supabase_client
+from ...core.resources import Resources, get_dashboard_cache, get_resources, get_space_role_cache
+from ...schemas.expense import ExpenseBulkCreate, ExpenseBulkResult, ExpenseSearchResponse
+from ...services.expense_export import MEDIA_TYPES, ExpenseExportService
+from ...services.expense_search import ExpenseSearchService
+from ...services.expense_service import ExpenseService
+from ...services.statement_import import DATE_FORMATS, DEFAULT_CATEGORY, ImportOptions
+from ...services.dashboard_service import DashboardCache
+from ...services.space_service import SpaceRoleCache
+from postgrest import AsyncPostgrestClient
+
+
+router = APIRouter(prefix="/api/expenses", tags=["Expenses"])
+
+
+# =====================================================
+# DEPENDENCY INJECTION
+# =====================================================
+
+def get_expense_service(
+    supabase: AsyncPostgrestClient = Depends(get_supabase_client),
+    dashboard_cache: DashboardCache = Depends(get_dashboard_cache),
+    role_cache: SpaceRoleCache = Depends(get_space_role_cache)
+) -> ExpenseService:
+    """Dependency to get expense service instance"""
+    return ExpenseService(supabase, dashboard_cache, role_cache)
+
+
+def get_expense_search_service(db: AsyncSession = Depends(get_db)) -> ExpenseSearchService:
+    """Dependency to get expense search service instance"""
+    return ExpenseSearchService(db)
+
+
+def get_expense_export_service(resources: Resources = Depends(get_resources)) -> ExpenseExportService:
+    """Dependency to get expense export service instance"""
+    # Exports check out their own connection for as long as the body
+    # streams; a request-scoped session would be closed before that
+    return ExpenseExportService(resources.async_engine, settings.EXPENSE_EXPORT_BATCH_SIZE)
+
+
+# =====================================================
+# EXPENSE SEARCH & EXPORT ENDPOINTS
+# =====================================================
+
+@router.get("/search", response_model=ExpenseSearchResponse)
+async def search_expenses(
+    space_id: UUID = Query(...),
+    q: Optional[str] = Query(None, max_length=200, description="Fuzzy match against descriptions"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    category: Optional[List[str]] = Query(None, description="Repeat for any of several categories"),
+    min_amount: Optional[Decimal] = Query(None, ge=0),
+    max_amount: Optional[Decimal] = Query(None, ge=0),
+    tag: Optional[List[str]] = Query(None, description="Repeat to require several tags"),
+    sort: Optional[Literal["relevance", "date"]] = Query(None, description="Defaults to relevance with q, date without"),
+    limit: int = Query(50, ge=1, le=200, description="Expenses per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: dict = Depends(get_current_user),
+    service: ExpenseSearchService = Depends(get_expense_search_service)
+):
+    """
+    Search a space's expenses
+
+    `q` matches descriptions by trigram word similarity, so typos and
+    partial words still match ("starbuks" finds "STARBUCKS COFFEE #1234").
+    With `q`, results are ranked by `score`, newest first among equal
+    scores; without it they are listed newest first. All filters combine.
+
+    Pages are keyset-based: pass `next_cursor` back as `cursor` until it is
+    null. Each page costs the same however far into the history it is.
+
+    **Example:** `GET /api/expenses/search?space_id=...&q=coffee&from=2026-01-01&tag=work`
+
+    **Permissions:** Space members
+    """
+    user_id = UUID(current_user["sub"])
+    return await service.search(
+        space_id, user_id, q=q, date_from=date_from, date_to=date_to,
+        categories=category, min_amount=min_amount, max_amount=max_amount,
+        tags=tag, sort=sort, limit=limit, cursor=cursor
+    )
+
+
+@router.get("/export")
+async def export_expenses(
+    request: Request,
+    space_id: UUID = Query(...),
+    date_from: date = Query(date.min, alias="from"),
+    date_to: date = Query(date.max, alias="to"),
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    current_user: dict = Depends(get_current_user),
+    service: ExpenseExportService = Depends(get_expense_export_service)
+):
+    """
+    Download a space's expenses as CSV or NDJSON, oldest first
+
+    Rows are streamed from a server-side cursor in batches of
+    EXPENSE_EXPORT_BATCH_SIZE, so exports of any length use constant
+    memory. Clients sending `Accept-Encoding: gzip` get the stream
+    compressed on the fly (`Content-Encoding: gzip`).
+
+    CSV columns: id, date, description, category, amount, currency,
+    payment_method, tags (`;`-separated), notes, budget_id, budget_item_id,
+    bank_transaction_id. Text starting with `=`, `+`, `-` or `@` is
+    prefixed with `'` so spreadsheets do not evaluate it.
+
+    **Example:** `GET /api/expenses/export?space_id=...&from=2024-01-01&to=2026-12-31&format=csv`
+
+    **Permissions:** Space members
+    """
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'"
+        )
+
+    user_id = UUID(current_user["sub"])
+    await service.check_access(space_id, user_id)
+
+    compress = "gzip" in request.headers.get("accept-encoding", "").lower()
+    headers = {
+        "Content-Disposition": f'attachment; filename="expenses-{space_id}.{export_format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        service.export(space_id, date_from, date_to, export_format, compress=compress),
+        media_type=MEDIA_TYPES[export_format],
+        headers=headers
+    )
+
+
+# =====================================================
+# EXPENSE INGESTION ENDPOINTS
+# =====================================================
+
+@router.post("/bulk", response_model=ExpenseBulkResult, status_code=status.HTTP_200_OK)
+async def bulk_create_expenses(
+    request: ExpenseBulkCreate,
+    current_user: dict = Depends(get_current_user),
+    service: ExpenseService = Depends(get_expense_service)
+):
+    """
+    Insert up to EXPENSE_BULK_MAX_ROWS expenses in one transaction
+
+    Meant for bank syncs and imports. Safe to retry: expenses whose
+    `bank_transaction_id` is already stored for the space are skipped and
+    counted in `skipped`.
+
+    **Request Body:**
+    ```json
+    {
+      "space_id": "...",
+      "expenses": [
+        {"amount": "12.50", "description": "Coffee", "category": "Dining Out",
+         "date": "2026-10-01", "bank_transaction_id": "txn_123"}
+      ]
+    }
+    ```
+
+    **Permissions:** Space members
+    """
+    user_id = UUID(current_user["sub"])
+    return await service.bulk_create(request.space_id, request.expenses, user_id)
+
+
+@router.post("/import")
+async def import_statement(
+    space_id: UUID = Form(...),
+    file: UploadFile = File(..., description="CSV or OFX/QFX bank statement"),
+    statement_format: Literal["auto", "csv", "ofx"] = Form("auto", alias="format"),
+    negative_is_expense: bool = Form(True, description="Negative amounts are money spent"),
+    category: str = Form(DEFAULT_CATEGORY, min_length=1),
+    budget_item_id: Optional[UUID] = Form(None),
+    date_format: Optional[str] = Form(None, description="CSV date format, e.g. DD/MM/YYYY; detected when omitted"),
+    current_user: dict = Depends(get_current_user),
+    service: ExpenseService = Depends(get_expense_service)
+):
+    """
+    Import a bank statement (CSV or OFX/QFX) as expenses
+
+    The file is streamed through a parser in chunks and inserted in batches
+    of EXPENSE_IMPORT_BATCH_SIZE, so large multi-year exports never sit in
+    memory. Only outflows become expenses. Transactions are deduplicated on
+    the statement's transaction id (OFX FITID / CSV id column, or a
+    fingerprint of date, amount and description), so re-importing a file
+    only adds what is new.
+
+    A CSV file uses one date format throughout. It is detected from the
+    first rows that tell the formats apart (13/01/2026 can only be
+    DD/MM/YYYY) or given as `date_format`: one of YYYY-MM-DD, YYYY/MM/DD,
+    MM/DD/YYYY, DD/MM/YYYY, MM/DD/YY, DD/MM/YY, DD.MM.YYYY, DD-Mon-YYYY,
+    YYYYMMDD. Rows in any other format fail the import.
+
+    **Response:** `application/x-ndjson`, one progress object per batch:
+    ```json
+    {"status": "running", "total_bytes": 52428800, "bytes_read": 1048576, "rows_parsed": 9000,
+     "rows_ignored": 1200, "inserted": 7000, "skipped": 800}
+    ```
+    ending with `"status": "completed"` or `"status": "failed"` plus `detail`.
+
+    **Limits:** Files above STATEMENT_IMPORT_MAX_SIZE (100MB by default) are rejected with 413.
+
+    **Permissions:** Space members
+    """
+    if file.size is not None and file.size > settings.STATEMENT_IMPORT_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds {settings.STATEMENT_IMPORT_MAX_SIZE} bytes"
+        )
+
+    if date_format is not None and date_format not in DATE_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown date_format; use one of {', '.join(DATE_FORMATS)}"
+        )
+
+    user_id = UUID(current_user["sub"])
+    await service.check_access(space_id, user_id)
+
+    options = ImportOptions(
+        negative_is_expense=negative_is_expense,
+        default_category=category,
+        budget_item_id=str(budget_item_id) if budget_item_id else None,
+        batch_size=settings.EXPENSE_IMPORT_BATCH_SIZE,
+        max_bytes=settings.STATEMENT_IMPORT_MAX_SIZE,
+        date_format=date_format,
+    )
+
+    # FastAPI closes uploads when the endpoint returns, before the response
+    # is streamed; keep the spooled file for the import and close it there
+    stream, file.file = file.file, io.BytesIO()
+
+    async def progress_lines():
+        try:
+            async for event in service.import_statement(
+                space_id, stream, statement_format, options, user_id, total_bytes=file.size
+            ):
+                yield json.dumps(event) + "\n"
+        finally:
+            stream.close()
+
+    return StreamingResponse(progress_lines(), media_type="application/x-ndjson")
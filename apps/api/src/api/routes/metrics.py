@@ -0,0 +1,27 @@
+"""Runtime Metrics Routes"""
+from fastapi import APIRouter, Depends
+from datetime import datetime
+from ...core.database import get_pool_stats
+from ...core.resources import Resources, get_resources
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics(resources: Resources = Depends(get_resources)):
+    """
+    Worker-level runtime metrics
+
+    Returns:
+    - caches: hit/miss/eviction counters per registered cache
+    - database_pool: async SQLAlchemy pool usage
+    - startup: seconds spent creating and warming shared clients
+    """
+    return {
+        "caches": {
+            name: cache.stats() for name, cache in resources.caches.items()
+        },
+        "database_pool": get_pool_stats(resources.async_engine),
+        "startup": resources.timings,
+        "timestamp": datetime.utcnow().isoformat()
+    }
@@ -8,6 +8,8 @@ from fastapi import APIRouter, HTTPException, Depends, status
 from typing import Annotated
 import logging
 
+from postgrest import AsyncPostgrestClient
+
 from ...core.supabase import get_supabase_client
 from ...core.auth import get_current_user_id
 from ...services.onboarding_service import OnboardingService
@@ -35,6 +37,13 @@ router = APIRouter(
 )
 
 
+def get_onboarding_service(
+    supabase: Annotated[AsyncPostgrestClient, Depends(get_supabase_client)]
+) -> OnboardingService:
+    """Dependency to get onboarding service"""
+    return OnboardingService(supabase)
+
+
 # ============================================
 # GET /api/user/onboarding-status
 # ============================================
@@ -46,7 +55,8 @@ router = APIRouter(
     description="Check if user needs to complete onboarding"
 )
 async def get_onboarding_status(
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[OnboardingService, Depends(get_onboarding_service)]
 ):
     """
     Get user's onboarding status
@@ -58,8 +68,6 @@ async def get_onboarding_status(
         - user_id: str
     """
     try:
-        supabase = get_supabase_client()
-        service = OnboardingService(supabase)
 
         status_data = await service.get_onboarding_status(user_id)
 
@@ -96,7 +104,8 @@ async def get_onboarding_status(
 )
 async def create_personal_space(
     request: CreateSpaceRequest,
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[OnboardingService, Depends(get_onboarding_service)]
 ):
     """
     Create personal space
@@ -116,8 +125,6 @@ async def create_personal_space(
     """
     try:
         logger.info(f"Creating space for user {user_id}: name={request.name}, currency={request.currency}")
-        supabase = get_supabase_client()
-        service = OnboardingService(supabase)
 
         space = await service.create_personal_space(
             user_id=user_id,
@@ -174,7 +181,8 @@ async def create_personal_space(
 )
 async def create_onboarding_budget(
     request: CreateBudgetRequest,
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[OnboardingService, Depends(get_onboarding_service)]
 ):
     """
     Create budget via onboarding
@@ -191,8 +199,6 @@ async def create_onboarding_budget(
     try:
         logger.warning(f"[ROUTE] create_onboarding_budget called: user_id={user_id}, space_id={request.space_id}, framework={request.framework}")
         print(f"[ROUTE PRINT] create_onboarding_budget called")
-        supabase = get_supabase_client()
-        service = OnboardingService(supabase)
 
         logger.warning("[ROUTE] Calling service.create_budget...")
         print(f"[ROUTE PRINT] Calling service.create_budget...")
@@ -249,7 +255,8 @@ async def create_onboarding_budget(
     description="Mark user's onboarding as complete"
 )
 async def complete_onboarding(
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[OnboardingService, Depends(get_onboarding_service)]
 ):
     """
     Complete onboarding flow
@@ -261,8 +268,6 @@ async def complete_onboarding(
         - redirect_to: "/dashboard"
     """
     try:
-        supabase = get_supabase_client()
-        service = OnboardingService(supabase)
 
         result = await service.complete_onboarding(user_id)
 
@@ -8,9 +8,12 @@ from fastapi import APIRouter, HTTPException, Depends, status, Query
 from typing import Annotated, Optional
 import logging
 
+from postgrest import AsyncPostgrestClient
+
 from ...core.supabase import get_supabase_client
 from ...core.auth import get_current_user_id
-from ...services.space_service import SpaceService
+from ...core.resources import get_space_role_cache
+from ...services.space_service import SpaceService, SpaceRoleCache
 from ...schemas.space import (
     CreateSpaceRequest,
     CreateSpaceResponse,
@@ -44,6 +47,14 @@ router = APIRouter(
 )
 
 
+def get_space_service(
+    supabase: Annotated[AsyncPostgrestClient, Depends(get_supabase_client)],
+    role_cache: Annotated[SpaceRoleCache, Depends(get_space_role_cache)]
+) -> SpaceService:
+    """Dependency to get space service"""
+    return SpaceService(supabase, role_cache)
+
+
 # ============================================
 # GET /api/spaces
 # ============================================
@@ -56,6 +67,7 @@ router = APIRouter(
 )
 async def list_spaces(
     user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[SpaceService, Depends(get_space_service)],
     space_type: Optional[str] = Query(None, description="Filter by type (personal, shared, project)"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     role: Optional[str] = Query(None, description="Filter by user role")
@@ -72,8 +84,6 @@ async def list_spaces(
         List of spaces with user's role and member count
     """
     try:
-        supabase = get_supabase_client()
-        service = SpaceService(supabase)
 
         spaces = await service.list_user_spaces(
             user_id=user_id,
@@ -117,7 +127,8 @@ async def list_spaces(
 )
 async def get_space(
     space_id: str,
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[SpaceService, Depends(get_space_service)]
 ):
     """
     Get space details
@@ -129,8 +140,6 @@ async def get_space(
         Space with members and user's role
     """
     try:
-        supabase = get_supabase_client()
-        service = SpaceService(supabase)
 
         space = await service.get_space(space_id=space_id, user_id=user_id)
 
@@ -181,7 +190,8 @@ async def get_space(
 )
 async def create_space(
     request: CreateSpaceRequest,
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[SpaceService, Depends(get_space_service)]
 ):
     """
     Create new space
@@ -197,8 +207,6 @@ async def create_space(
     """
     try:
         logger.info(f"Creating space for user {user_id}: name={request.name}, type={request.space_type}")
-        supabase = get_supabase_client()
-        service = SpaceService(supabase)
 
         result = await service.create_space(
             user_id=user_id,
@@ -257,7 +265,8 @@ async def create_space(
 async def update_space(
     space_id: str,
     request: UpdateSpaceRequest,
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[SpaceService, Depends(get_space_service)]
 ):
     """
     Update space
@@ -270,8 +279,6 @@ async def update_space(
         Updated space
     """
     try:
-        supabase = get_supabase_client()
-        service = SpaceService(supabase)
 
         # Convert request to dict, exclude None values
         updates = request.dict(exclude_none=True)
@@ -329,7 +336,8 @@ async def update_space(
 )
 async def delete_space(
     space_id: str,
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[SpaceService, Depends(get_space_service)]
 ):
     """
     Delete space (soft delete)
@@ -341,8 +349,6 @@ async def delete_space(
         Deletion confirmation
     """
     try:
-        supabase = get_supabase_client()
-        service = SpaceService(supabase)
 
         await service.delete_space(space_id=space_id, user_id=user_id)
 
@@ -393,7 +399,8 @@ async def delete_space(
 )
 async def join_space(
     request: JoinSpaceRequest,
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[SpaceService, Depends(get_space_service)]
 ):
     """
     Join space with invite code
@@ -405,8 +412,6 @@ async def join_space(
         Space and membership
     """
     try:
-        supabase = get_supabase_client()
-        service = SpaceService(supabase)
 
         result = await service.join_space(
             user_id=user_id,
@@ -460,7 +465,8 @@ async def join_space(
 )
 async def leave_space(
     space_id: str,
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[SpaceService, Depends(get_space_service)]
 ):
     """
     Leave space
@@ -472,8 +478,6 @@ async def leave_space(
         Leave confirmation
     """
     try:
-        supabase = get_supabase_client()
-        service = SpaceService(supabase)
 
         await service.leave_space(space_id=space_id, user_id=user_id)
 
@@ -523,7 +527,8 @@ async def leave_space(
 )
 async def regenerate_invite_code(
     space_id: str,
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[SpaceService, Depends(get_space_service)]
 ):
     """
     Regenerate invite code
@@ -535,8 +540,6 @@ async def regenerate_invite_code(
         Updated space with new code
     """
     try:
-        supabase = get_supabase_client()
-        service = SpaceService(supabase)
 
         space = await service.regenerate_invite_code(
             space_id=space_id,
@@ -589,7 +592,8 @@ async def regenerate_invite_code(
 )
 async def get_space_members(
     space_id: str,
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[SpaceService, Depends(get_space_service)]
 ):
     """
     Get all members of a space
@@ -601,8 +605,6 @@ async def get_space_members(
         List of space members with user info
     """
     try:
-        supabase = get_supabase_client()
-        service = SpaceService(supabase)
 
         members = await service.get_space_members(
             space_id=space_id,
@@ -643,6 +645,77 @@ async def get_space_members(
         )
 
 
+# ============================================
+# PATCH /api/spaces/{space_id}/members/{member_user_id}
+# ============================================
+
+@router.patch(
+    "/spaces/{space_id}/members/{member_user_id}",
+    response_model=UpdateMemberRoleResponse,
+    summary="Update Member Role",
+    description="Change a member's role (requires admin or owner role; only the owner manages admins)"
+)
+async def update_member_role(
+    space_id: str,
+    member_user_id: str,
+    request: UpdateMemberRoleRequest,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[SpaceService, Depends(get_space_service)]
+):
+    """
+    Update member role
+
+    Args:
+        space_id: Space UUID
+        member_user_id: User ID whose role changes
+        request: New role
+
+    Returns:
+        Updated membership
+    """
+    try:
+
+        member = await service.update_member_role(
+            space_id=space_id,
+            member_user_id=member_user_id,
+            role=request.role,
+            requesting_user_id=user_id
+        )
+
+        return UpdateMemberRoleResponse(
+            success=True,
+            data={"member": member}
+        )
+
+    except ValueError as e:
+        # Permission error or validation error
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "PERMISSION_DENIED",
+                    "message": str(e),
+                    "details": {}
+                }
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Error updating member role in space {space_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "UPDATE_ROLE_FAILED",
+                    "message": "Failed to update member role",
+                    "details": {"error": str(e)}
+                }
+            }
+        )
+
+
 # ============================================
 # DELETE /api/spaces/{space_id}/members/{member_user_id}
 # ============================================
@@ -656,7 +729,8 @@ async def get_space_members(
 async def remove_member(
     space_id: str,
     member_user_id: str,
-    user_id: Annotated[str, Depends(get_current_user_id)]
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    service: Annotated[SpaceService, Depends(get_space_service)]
 ):
     """
     Remove member from space
@@ -669,8 +743,6 @@ async def remove_member(
         Success response
     """
     try:
-        supabase = get_supabase_client()
-        service = SpaceService(supabase)
 
         await service.remove_member(
             space_id=space_id,
@@ -4,11 +4,15 @@ Authentication Dependencies
 JWT validation and user extraction for FastAPI endpoints
 """
 
-from fastapi import Depends, HTTPException, status
+import hashlib
+import time
+from typing import Annotated, Any, Dict, Optional
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Annotated
-from jose import jwt, JWTError
+from jose import jwk, jwt, JWTError
 
+from .cache import TTLCache
 from .config import settings
 from .supabase import get_supabase_client
 
@@ -16,62 +20,88 @@ from .supabase import get_supabase_client
 security = HTTPBearer()
 
 
-async def get_current_user_id(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
-) -> str:
+class TokenVerifier:
     """
-    Extract and validate user ID from JWT token
-
-    Args:
-        credentials: Bearer token from Authorization header
-
-    Returns:
-        User UUID string
+    Verifies Supabase JWTs and caches the verified claims
 
-    Raises:
-        HTTPException: If token is invalid or missing
+    The HMAC key is constructed once. Claims are cached by SHA-256 digest of
+    the token (the raw token is never stored) and expire no later than the
+    token's own `exp`. Rejected tokens are not cached.
     """
-    token = credentials.credentials
 
-    try:
-        # Decode JWT token using Supabase JWT secret
-        # Note: Supabase uses the same secret for signing JWTs
-        payload = jwt.decode(
+    def __init__(self, secret: str, max_size: int, ttl: float, algorithm: str = "HS256"):
+        self.algorithm = algorithm
+        self.key = jwk.construct(secret, algorithm)
+        self.cache = TTLCache(max_size, ttl, name="auth_tokens")
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Verify signature, audience and expiry (no cache)"""
+        return jwt.decode(
             token,
-            settings.SUPABASE_JWT_SECRET,
-            algorithms=["HS256"],
+            self.key,
+            algorithms=[self.algorithm],
             audience="authenticated"
         )
 
-        # Extract user ID from 'sub' claim
-        user_id: str = payload.get("sub")
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Return the verified claims of a token, from cache when possible
 
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        Raises:
+            JWTError: If the token is invalid or expired
+        """
+        digest = hashlib.sha256(token.encode()).digest()
+        claims = self.cache.get(digest)
+        if claims is not None:
+            return claims
 
-        return user_id
+        claims = self.decode(token)
 
-    except JWTError as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Could not validate credentials: {str(e)}",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        ttl = self.cache.ttl
+        if "exp" in claims:
+            ttl = min(ttl, float(claims["exp"]) - time.time())
+        if ttl > 0:
+            self.cache.set(digest, claims, ttl=ttl)
+        return claims
+
+
+def create_token_verifier() -> TokenVerifier:
+    """Build the verifier for the Supabase JWT secret (called at startup)"""
+    return TokenVerifier(
+        settings.SUPABASE_JWT_SECRET,
+        max_size=settings.AUTH_CACHE_MAX_SIZE,
+        ttl=settings.AUTH_CACHE_TTL,
+    )
+
+
+def get_token_verifier(request: Request) -> TokenVerifier:
+    """Dependency returning the shared token verifier"""
+    return request.app.state.resources.token_verifier
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
 
 async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    verifier: Annotated[TokenVerifier, Depends(get_token_verifier)]
 ) -> dict:
     """
     Extract and validate user from JWT token
     Returns full user dict with id and email
 
+    FastAPI caches dependency results per request, so routes (or their
+    dependencies) asking for both this and get_current_user_id verify the
+    token only once.
+
     Args:
         credentials: Bearer token from Authorization header
+        verifier: Shared token verifier
 
     Returns:
         User dict with id, email, etc.
@@ -79,50 +109,56 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid or missing
     """
-    token = credentials.credentials
-
     try:
         # Decode JWT token using Supabase JWT secret
-        payload = jwt.decode(
-            token,
-            settings.SUPABASE_JWT_SECRET,
-            algorithms=["HS256"],
-            audience="authenticated"
-        )
+        payload = verifier.verify(credentials.credentials)
+    except JWTError as e:
+        raise _unauthorized(f"Could not validate credentials: {str(e)}")
 
-        # Extract user info from token
-        user_id: str = payload.get("sub")
-        email: str = payload.get("email")
+    # Extract user info from token
+    user_id: str = payload.get("sub")
+    email: str = payload.get("email")
 
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    if user_id is None:
+        raise _unauthorized("Invalid authentication credentials")
 
-        return {
-            "id": user_id,
-            "email": email,
-            **payload  # Include all other claims
-        }
+    return {
+        "id": user_id,
+        "email": email,
+        **payload  # Include all other claims
+    }
 
-    except JWTError as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Could not validate credentials: {str(e)}",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+
+async def get_current_user_id(
+    current_user: Annotated[dict, Depends(get_current_user)]
+) -> str:
+    """
+    Extract and validate user ID from JWT token
+
+    Args:
+        current_user: Verified user resolved by get_current_user
+
+    Returns:
+        User UUID string
+
+    Raises:
+        HTTPException: If token is invalid or missing
+    """
+    return current_user["id"]
 
 
 async def get_current_user_optional(
-    credentials: HTTPAuthorizationCredentials | None = Depends(security)
+    credentials: Annotated[
+        Optional[HTTPAuthorizationCredentials], Depends(HTTPBearer(auto_error=False))
+    ],
+    verifier: Annotated[TokenVerifier, Depends(get_token_verifier)]
 ) -> str | None:
     """
     Optional authentication - returns None if no token provided
 
     Args:
         credentials: Optional bearer token
+        verifier: Shared token verifier
 
     Returns:
         User UUID string or None
@@ -131,6 +167,7 @@ async def get_current_user_optional(
         return None
 
     try:
-        return await get_current_user_id(credentials)
+        user = await get_current_user(credentials, verifier)
     except HTTPException:
         return None
+    return user["id"]
@@ -22,16 +22,55 @@ class Settings(BaseSettings):
     SUPABASE_JWT_SECRET: str
     DATABASE_URL: str
 
+    # PostgREST HTTP client pool
+    POSTGREST_MAX_CONNECTIONS: int = 50
+    POSTGREST_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    POSTGREST_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    POSTGREST_TIMEOUT: float = 10.0  # seconds, per call
+    POSTGREST_CONNECT_TIMEOUT: float = 5.0
+    POSTGREST_POOL_TIMEOUT: float = 5.0  # wait for a free pooled connection
+
+    # SQLAlchemy async pool (asyncpg)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0  # seconds to wait for a pooled connection
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_CONNECT_TIMEOUT: float = 5.0
+    DB_COMMAND_TIMEOUT: float = 15.0  # per statement
+    DB_STATEMENT_CACHE_SIZE: int = 0  # 0 when running behind pgbouncer
+
+    # Dashboard summary cache (per worker)
+    DASHBOARD_CACHE_MAX_SIZE: int = 1024  # cached (space, month) summaries
+    DASHBOARD_CACHE_TTL: float = 60.0  # seconds; bounds staleness across workers
+
+    # Space role authorization cache: "memory" (per worker) or "redis" (shared, uses REDIS_URL)
+    SPACE_ROLE_CACHE_BACKEND: str = "memory"
+    SPACE_ROLE_CACHE_MAX_SIZE: int = 10000  # (space, user) pairs, memory backend only
+    SPACE_ROLE_CACHE_TTL: float = 60.0  # seconds
+
+    # Open PostgREST / database connections during startup
+    WARM_CONNECTIONS_ON_STARTUP: bool = True
+
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Verified Supabase JWT cache (per worker)
+    AUTH_CACHE_MAX_SIZE: int = 10000  # distinct tokens
+    AUTH_CACHE_TTL: float = 300.0  # seconds; never beyond the token's exp
+
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
     AI_RATE_LIMIT_PER_DAY: int = 1000
 
+    # Expense ingestion
+    EXPENSE_BULK_MAX_ROWS: int = 5000  # rows per POST /api/expenses/bulk (one transaction)
+    EXPENSE_IMPORT_BATCH_SIZE: int = 1000  # rows per transaction of a statement import
+    EXPENSE_EXPORT_BATCH_SIZE: int = 2000  # rows per server-side cursor fetch of an export
+    STATEMENT_IMPORT_MAX_SIZE: int = 104857600  # 100MB; multi-year bank exports (streamed, not buffered)
+
     # Storage & Uploads
     MAX_FILE_SIZE: int = 10485760  # 10MB
     ALLOWED_EXTENSIONS: str = "jpg,jpeg,png,pdf"
@@ -1,7 +1,16 @@
 """Database Configuration using SQLAlchemy 2.0"""
+from typing import AsyncIterator, Dict
+
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from .config import settings
 
 # Database connection string from environment
@@ -9,32 +18,86 @@ from .config import settings
 # SQLAlchemy 2.0 with psycopg2 uses postgresql:// (default) or postgresql+psycopg2://
 DATABASE_URL = settings.DATABASE_URL  # psycopg2 is default driver
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    echo=settings.ENVIRONMENT == "development",  # Log SQL in development
-    pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=3600,  # Recycle connections after 1 hour
-)
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _to_asyncpg_url(url: str) -> str:
+    """Rewrite a postgres:// / postgresql[+driver]:// URL for asyncpg"""
+    scheme, sep, rest = url.partition("://")
+    if scheme in ("postgres", "postgresql") or scheme.startswith("postgresql+"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+
+# Same database, asyncpg driver, used by request handlers
+ASYNC_DATABASE_URL = _to_asyncpg_url(DATABASE_URL)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+def create_db_engine() -> Engine:
+    """
+    Create a synchronous SQLAlchemy engine
+
+    For scripts and migrations only; request handlers use the async
+    engine owned by the application lifespan.
+    """
+    return create_engine(
+        DATABASE_URL,
+        echo=settings.ENVIRONMENT == "development",  # Log SQL in development
+        pool_pre_ping=True,  # Verify connections before using
+        pool_recycle=3600,  # Recycle connections after 1 hour
+    )
+
+
+def create_async_db_engine() -> AsyncEngine:
+    """
+    Create the async SQLAlchemy engine (asyncpg)
+
+    Called once by the application lifespan; pool size, overflow and
+    timeouts come from settings.
+    """
+    return create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=settings.ENVIRONMENT == "development",  # Log SQL in development
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args={
+            "timeout": settings.DB_CONNECT_TIMEOUT,
+            "command_timeout": settings.DB_COMMAND_TIMEOUT,
+            # Supabase's transaction pooler cannot share prepared statements
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+def create_async_session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    """AsyncSession factory bound to the shared async engine"""
+    return async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+
+def get_pool_stats(engine: AsyncEngine) -> Dict[str, int]:
+    """Snapshot of the connection pool for metrics and health checks"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+
+
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
     """
-    Dependency for FastAPI routes to get database session
+    Dependency for FastAPI routes to get an async database session
 
     Usage in route:
     @router.get("/endpoint")
-    def endpoint(db: Session = Depends(get_db)):
-        ...
+    async def endpoint(db: AsyncSession = Depends(get_db)):
+        result = await db.execute(text("SELECT 1"))
     """
-    db = SessionLocal()
-    try:
+    async with request.app.state.resources.async_session_factory() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,118 @@
+"""
+Money Kernel
+
+Amounts as integer cents. Columns of amounts are held in int64
+``array('q')`` buffers, so sums run in C without creating Decimal or
+float objects per element, and results are exact: no float drift, no
+``str(Decimal(str(x)))`` round trips.
+
+Values come in as the strings (or numbers) PostgREST and asyncpg return
+for DECIMAL(12, 2) columns and go out either as Decimal or, for
+responses that have always carried JSON numbers, as the float closest to
+the exact cents value. Rounding is half away from zero, like Postgres
+ROUND on numeric.
+"""
+
+from array import array
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Iterable
+
+CENT = Decimal("0.01")
+_DIGITS = frozenset("0123456789")
+
+
+def to_cents(value: Any) -> int:
+    """
+    Convert an amount to integer cents
+
+    Plain decimal strings with up to two fraction digits ("12", "12.3",
+    "-12.34") are parsed without Decimal; anything else is rounded to the
+    cent through Decimal.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value * 100
+
+    if isinstance(value, str):
+        # Fast path for the "1234.56" form PostgREST returns for DECIMAL(12, 2)
+        if value[-3:-2] == ".":
+            try:
+                return int(value[:-3] + value[-2:])
+            except ValueError:
+                pass
+
+        text = value.strip()
+        negative = text.startswith("-")
+        if negative or text.startswith("+"):
+            text = text[1:]
+        whole, _, frac = text.partition(".")
+        if (
+            (whole or frac)
+            and len(frac) <= 2
+            and _DIGITS.issuperset(whole)
+            and _DIGITS.issuperset(frac)
+        ):
+            cents = int(whole or "0") * 100 + int(frac.ljust(2, "0"))
+            return -cents if negative else cents
+
+    amount = value if isinstance(value, Decimal) else Decimal(str(value))
+    return int(amount.quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def cents_array(values: Iterable[Any]) -> array:
+    """int64 buffer of the given amounts in cents"""
+    return array("q", map(to_cents, values))
+
+
+def total(cents: Iterable[int]) -> int:
+    """Exact sum of a cents buffer"""
+    return sum(cents)
+
+
+def remaining(budgeted: array, spent: array) -> array:
+    """Element-wise budgeted - spent"""
+    return array("q", map(int.__sub__, budgeted, spent))
+
+
+def _div_round(numerator: int, denominator: int) -> int:
+    """numerator / denominator rounded half away from zero (denominator > 0)"""
+    quotient = (2 * abs(numerator) + denominator) // (2 * denominator)
+    return -quotient if numerator < 0 else quotient
+
+
+def percentage(part: int, whole: int, places: int = 2) -> float:
+    """part / whole * 100 rounded to `places` decimals, 0 when whole <= 0"""
+    if whole <= 0:
+        return 0.0
+    scale = 10 ** places
+    return _div_round(part * 100 * scale, whole) / scale
+
+
+def percentages(parts: array, whole: int, places: int = 2) -> list:
+    """percentage() of every element of a cents buffer against one whole"""
+    if whole <= 0:
+        return [0.0] * len(parts)
+    scale = 10 ** places
+    factor = 200 * scale
+    twice = 2 * whole
+    # _div_round inlined: this runs once per item
+    return [
+        ((part * factor + whole) // twice if part >= 0 else -((-part * factor + whole) // twice)) / scale
+        for part in parts
+    ]
+
+
+def divide(cents: int, divisor: int) -> int:
+    """cents / divisor rounded to the cent (e.g. a daily average)"""
+    return _div_round(cents, divisor) if divisor > 0 else 0
+
+
+def to_decimal(cents: int) -> Decimal:
+    """Exact Decimal with two places"""
+    return Decimal(cents).scaleb(-2)
+
+
+def to_float(cents: int) -> float:
+    """Float closest to the exact amount, for JSON-number responses"""
+    return cents / 100
@@ -0,0 +1,115 @@
+"""
+Application Resources
+
+Registry of long-lived clients (PostgREST, SQLAlchemy engine, token
+verifier, caches) created once by the application lifespan and shared by
+every request.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from .auth import TokenVerifier, create_token_verifier
+from .config import settings
+from .database import create_async_db_engine, create_async_session_factory
+from .supabase import PooledPostgrestClient, create_async_supabase_client
+from ..services.dashboard_service import DashboardCache
+from ..services.space_service import SpaceRoleCache, create_space_role_cache
+
+logger = logging.getLogger(__name__)
+
+
+class Resources:
+    """Process-wide resources owned by the application lifespan"""
+
+    def __init__(self):
+        self.postgrest: Optional[PooledPostgrestClient] = None
+        self.async_engine: Optional[AsyncEngine] = None
+        self.async_session_factory: Optional[async_sessionmaker] = None
+        self.token_verifier: Optional[TokenVerifier] = None
+        self.caches: Dict[str, Any] = {}
+        # Seconds spent creating / warming each resource, for diagnostics
+        self.timings: Dict[str, float] = {}
+
+    async def startup(self) -> None:
+        """Create every resource and optionally warm its connections"""
+        started = time.perf_counter()
+        self.postgrest = create_async_supabase_client()
+        self.async_engine = create_async_db_engine()
+        self.async_session_factory = create_async_session_factory(self.async_engine)
+        self.caches["dashboard"] = DashboardCache(
+            max_size=settings.DASHBOARD_CACHE_MAX_SIZE,
+            ttl=settings.DASHBOARD_CACHE_TTL,
+        )
+        self.token_verifier = create_token_verifier()
+        self.caches["auth"] = self.token_verifier.cache
+        self.caches["space_roles"] = create_space_role_cache()
+        self.timings["create"] = time.perf_counter() - started
+
+        if settings.WARM_CONNECTIONS_ON_STARTUP:
+            await self._warm_postgrest()
+            await self._warm_engine()
+
+        logger.info(f"Resources ready: {self.timings}")
+
+    async def shutdown(self) -> None:
+        """Close clients and release pooled connections"""
+        for cache in self.caches.values():
+            clear = getattr(cache, "clear", None)
+            if clear:
+                clear()
+            aclose = getattr(cache, "aclose", None)
+            if aclose:
+                await aclose()
+        self.caches.clear()
+        self.token_verifier = None
+
+        if self.postgrest is not None:
+            await self.postgrest.aclose()
+            self.postgrest = None
+
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+            self.async_engine = None
+            self.async_session_factory = None
+
+        logger.info("Resources closed")
+
+    async def _warm_postgrest(self) -> None:
+        """Open the first pooled PostgREST connection (TLS + HTTP/2 setup)"""
+        started = time.perf_counter()
+        try:
+            await self.postgrest.session.head("/")
+        except Exception as e:
+            logger.warning(f"PostgREST warm-up failed: {str(e)}")
+        self.timings["warm_postgrest"] = time.perf_counter() - started
+
+    async def _warm_engine(self) -> None:
+        """Check out one database connection so the pool starts non-empty"""
+        started = time.perf_counter()
+        try:
+            async with self.async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning(f"Database warm-up failed: {str(e)}")
+        self.timings["warm_engine"] = time.perf_counter() - started
+
+
+def get_resources(request: Request) -> Resources:
+    """Dependency returning the application resource registry"""
+    return request.app.state.resources
+
+
+def get_dashboard_cache(request: Request) -> DashboardCache:
+    """Dependency returning the shared dashboard summary cache"""
+    return request.app.state.resources.caches["dashboard"]
+
+
+def get_space_role_cache(request: Request) -> SpaceRoleCache:
+    """Dependency returning the shared space role cache"""
+    return request.app.state.resources.caches["space_roles"]
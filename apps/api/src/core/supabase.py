@@ -1,15 +1,60 @@
 """Supabase Client Configuration"""
-from supabase import create_client, Client
+from typing import Dict, Optional, Union
+
+import httpx
+from fastapi import Request
+from postgrest import AsyncPostgrestClient
 from .config import settings
 
 
-def get_supabase_client() -> Client:
-    """Create and return Supabase client with service role key"""
-    return create_client(
-        supabase_url=settings.SUPABASE_URL,
-        supabase_key=settings.SUPABASE_SERVICE_KEY
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """
+    Async PostgREST client backed by a bounded, keep-alive HTTP/2 pool
+
+    One instance is shared by the whole process so every request reuses
+    the same warm connections instead of opening a new TLS session.
+    """
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Union[int, float, httpx.Timeout],
+        verify: bool = True,
+        proxy: Optional[str] = None,
+    ) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            proxy=proxy,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.POSTGREST_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.POSTGREST_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.POSTGREST_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+
+def create_async_supabase_client() -> PooledPostgrestClient:
+    """Create async PostgREST client authenticated with the service role key"""
+    return PooledPostgrestClient(
+        f"{settings.SUPABASE_URL}/rest/v1",
+        headers={
+            "apikey": settings.SUPABASE_SERVICE_KEY,
+            "Authorization": f"Bearer {settings.SUPABASE_SERVICE_KEY}",
+        },
+        timeout=httpx.Timeout(
+            settings.POSTGREST_TIMEOUT,
+            connect=settings.POSTGREST_CONNECT_TIMEOUT,
+            pool=settings.POSTGREST_POOL_TIMEOUT,
+        ),
     )
 
 
-# Global Supabase client instance
-supabase: Client = get_supabase_client()
+def get_supabase_client(request: Request) -> PooledPostgrestClient:
+    """Dependency returning the app-wide async PostgREST client"""
+    return request.app.state.resources.postgrest
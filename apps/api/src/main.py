@@ -1,8 +1,23 @@
 """FastAPI Application Entry Point"""
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
-from .api.routes import health, database, onboarding, dashboard, spaces, currencies, budgets
+from .core.resources import Resources
+from .api.routes import health, database, metrics, onboarding, dashboard, spaces, currencies, budgets, expenses
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared clients once at startup and close them on shutdown"""
+    resources = Resources()
+    await resources.startup()
+    app.state.resources = resources
+    try:
+        yield
+    finally:
+        await resources.shutdown()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -11,7 +26,8 @@ app = FastAPI(
     description="AI-powered financial assistant API",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -26,11 +42,13 @@ app.add_middleware(
 # Include routers
 app.include_router(health.router)
 app.include_router(database.router)
+app.include_router(metrics.router)
 app.include_router(onboarding.router)
 app.include_router(dashboard.router)
 app.include_router(spaces.router)
 app.include_router(currencies.router)
 app.include_router(budgets.router)
+app.include_router(expenses.router)
 
 
 @app.get("/")
@@ -5,9 +5,9 @@ Pydantic schemas for budget management endpoints.
 """
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, List, Literal
+from typing import Any, Dict, Optional, List, Literal
 from uuid import UUID
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 # =====================================================
@@ -17,19 +17,37 @@ from pydantic import BaseModel, Field, field_validator
 BudgetType = Literal["master", "secondary"]
 BudgetFramework = Literal["50_30_20", "60_20_20", "zero_based", "custom"]
 CategoryType = Literal["needs", "wants", "savings", "income"]
+BudgetItemOperationType = Literal["create", "update", "delete", "reorder"]
 
 
 # =====================================================
 # BUDGET ITEM SCHEMAS
 # =====================================================
 
+class DerivedSpentAmount(BaseModel):
+    """
+    Drops spent_amount from item writes
+
+    spent_amount is the sum of the item's expenses, maintained by the
+    expense triggers of migration 022; a client-written value would be
+    out of step with the expenses. Clients that still send it (older ones
+    sent spent_amount: 0 by default) keep working, the value is ignored.
+    """
+
+    @model_validator(mode="before")
+    @classmethod
+    def drop_spent_amount(cls, data: Any) -> Any:
+        if isinstance(data, dict) and "spent_amount" in data:
+            data = {k: v for k, v in data.items() if k != "spent_amount"}
+        return data
+
+
 class BudgetItemBase(BaseModel):
     """Base schema for budget items"""
     category: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = None
     category_type: CategoryType = "needs"
     budgeted_amount: Decimal = Field(default=Decimal("0"), ge=0)
-    spent_amount: Decimal = Field(default=Decimal("0"), ge=0)
     icon: Optional[str] = None
     color: str = "#4ADE80"
     display_order: int = 0
@@ -37,18 +55,17 @@ class BudgetItemBase(BaseModel):
     is_parent: bool = False
 
 
-class BudgetItemCreate(BudgetItemBase):
+class BudgetItemCreate(BudgetItemBase, DerivedSpentAmount):
     """Schema for creating a budget item"""
     pass
 
 
-class BudgetItemUpdate(BaseModel):
+class BudgetItemUpdate(DerivedSpentAmount):
     """Schema for updating a budget item"""
     category: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = None
     category_type: Optional[CategoryType] = None
     budgeted_amount: Optional[Decimal] = Field(None, ge=0)
-    spent_amount: Optional[Decimal] = Field(None, ge=0)
     icon: Optional[str] = None
     color: Optional[str] = None
     display_order: Optional[int] = None
@@ -60,6 +77,7 @@ class BudgetItemResponse(BudgetItemBase):
     """Schema for budget item response"""
     id: UUID
     budget_id: UUID
+    spent_amount: Decimal = Field(default=Decimal("0"), ge=0)
     created_at: datetime
     updated_at: datetime
 
@@ -76,12 +94,11 @@ class BudgetItemWithChildren(BudgetItemResponse):
 
 
 # Schemas for creating parent categories with children
-class BudgetItemChildCreate(BaseModel):
+class BudgetItemChildCreate(DerivedSpentAmount):
     """Schema for creating a child item under a parent"""
     category: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = None
     budgeted_amount: Decimal = Field(..., ge=0)
-    spent_amount: Decimal = Field(default=Decimal("0"), ge=0)
     icon: Optional[str] = None
     color: Optional[str] = None
     display_order: int = 0
@@ -98,6 +115,71 @@ class ParentCategoryCreate(BaseModel):
     children: List[BudgetItemChildCreate] = Field(default_factory=list, min_length=1)
 
 
+# Schemas for batch item mutations
+class BudgetItemOperation(BaseModel):
+    """
+    One operation of a batch item mutation
+
+    - create: data (BudgetItemCreate); optional ref so later creates in the
+      same batch can point parent_ref at it
+    - update: id + data (BudgetItemUpdate, only the fields to change)
+    - delete: id
+    - reorder: ids, in the new display order (display_order = position)
+    """
+    op: BudgetItemOperationType
+    id: Optional[UUID] = None
+    data: Optional[Dict[str, Any]] = None
+    ref: Optional[str] = Field(None, max_length=64)
+    parent_ref: Optional[str] = Field(None, max_length=64)
+    ids: Optional[List[UUID]] = None
+
+    @model_validator(mode="after")
+    def validate_operation(self) -> "BudgetItemOperation":
+        """Check required fields per op and validate data against the item schemas"""
+        if self.op in ("update", "delete") and self.id is None:
+            raise ValueError(f"{self.op} requires id")
+
+        if self.op == "create":
+            item = BudgetItemCreate.model_validate(self.data or {})
+            if self.parent_ref and item.parent_id:
+                raise ValueError("create accepts parent_id or parent_ref, not both")
+            self.data = item.model_dump(mode="json")
+        elif self.op == "update":
+            item = BudgetItemUpdate.model_validate(self.data or {})
+            self.data = item.model_dump(mode="json", exclude_none=True)
+            if not self.data:
+                raise ValueError("update requires at least one field")
+        elif self.op == "reorder":
+            if not self.ids:
+                raise ValueError("reorder requires ids")
+            if len(self.ids) != len(set(self.ids)):
+                raise ValueError("reorder ids must be unique")
+
+        return self
+
+
+class BudgetItemBatchRequest(BaseModel):
+    """Schema for applying several item operations to one budget at once"""
+    operations: List[BudgetItemOperation] = Field(..., min_length=1, max_length=500)
+
+    @model_validator(mode="after")
+    def validate_references(self) -> "BudgetItemBatchRequest":
+        """Each item is updated/deleted at most once; parent_ref must name a create"""
+        touched = [op.id for op in self.operations if op.op in ("update", "delete")]
+        if len(touched) != len(set(touched)):
+            raise ValueError("Each item can be updated or deleted only once per batch")
+
+        refs = [op.ref for op in self.operations if op.op == "create" and op.ref]
+        if len(refs) != len(set(refs)):
+            raise ValueError("Duplicate ref in batch")
+
+        for op in self.operations:
+            if op.parent_ref and op.parent_ref not in refs:
+                raise ValueError(f"Unknown parent_ref: {op.parent_ref}")
+
+        return self
+
+
 # =====================================================
 # BUDGET SCHEMAS
 # =====================================================
@@ -160,9 +242,14 @@ class BudgetResponse(BudgetBase):
 
 
 class BudgetListResponse(BaseModel):
-    """Schema for list of budgets"""
-    budgets: List[BudgetResponse]
+    """
+    Schema for one page of budgets
+
+    Budgets are plain dicts because ?fields= may return only some columns.
+    """
+    budgets: List[Dict[str, Any]]
     total: int
+    next_cursor: Optional[str] = None
 
 
 # =====================================================
@@ -180,14 +267,50 @@ class FrameworkTemplate(BaseModel):
 # BUDGET STATISTICS
 # =====================================================
 
+class CategoryStats(BaseModel):
+    """Stats of one budget item"""
+    id: UUID
+    parent_id: Optional[UUID] = None
+    is_parent: bool = False
+    category: str
+    category_type: Optional[CategoryType] = None
+    budgeted: Decimal
+    spent: Decimal
+    remaining: Decimal
+    percentage_used: float
+
+
+class CategoryTypeStats(BaseModel):
+    """Stats of one category type (needs/wants/savings), top-level items only"""
+    category_type: Optional[CategoryType] = None
+    budgeted: Decimal
+    spent: Decimal
+    remaining: Decimal
+    percentage_used: float
+    percentage_of_income: float
+
+
 class BudgetStats(BaseModel):
     """Budget statistics response"""
+    budget_id: UUID
+    month_period: str
+    type: BudgetType
+    name: str
     total_income: Decimal
     total_budgeted: Decimal
     total_spent: Decimal
     remaining: Decimal
     percentage_spent: float
-    category_breakdown: List[dict]
+    category_breakdown: List[CategoryStats]
+    category_type_breakdown: List[CategoryTypeStats]
+
+
+class BudgetStatsRangeResponse(BaseModel):
+    """Stats of a space's budgets over a range of months"""
+    space_id: UUID
+    from_month_period: str
+    to_month_period: str
+    budgets: List[BudgetStats]
 
 
 # =====================================================
@@ -0,0 +1,71 @@
+"""
+Expense Schemas
+===============
+Pydantic schemas for expense ingestion and search endpoints.
+"""
+import datetime as dt
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+# =====================================================
+# EXPENSE SCHEMAS
+# =====================================================
+
+class ExpenseCreate(BaseModel):
+    """Schema for one expense of a bulk insert"""
+    amount: Decimal = Field(..., gt=0, max_digits=12, decimal_places=2)
+    description: str = Field(..., min_length=1)
+    category: str = Field(..., min_length=1)
+    date: Optional[dt.date] = None  # Defaults to today
+    budget_id: Optional[UUID] = None
+    budget_item_id: Optional[UUID] = None
+    payment_method: Optional[str] = None
+    bank_transaction_id: Optional[str] = Field(None, min_length=1, max_length=200)
+    currency: str = "USD"
+    tags: Optional[List[str]] = None
+    notes: Optional[str] = None
+    ai_category_confidence: Optional[Decimal] = Field(None, ge=0, le=1)
+
+
+class ExpenseBulkCreate(BaseModel):
+    """Schema for POST /api/expenses/bulk"""
+    space_id: UUID
+    expenses: List[ExpenseCreate] = Field(..., min_length=1)
+
+
+class ExpenseBulkResult(BaseModel):
+    """Outcome of a bulk insert"""
+    received: int
+    inserted: int
+    skipped: int  # Already stored (same bank_transaction_id)
+
+
+# =====================================================
+# SEARCH SCHEMAS
+# =====================================================
+
+class ExpenseResponse(BaseModel):
+    """Schema for an expense in search results"""
+    id: UUID
+    space_id: UUID
+    budget_id: Optional[UUID] = None
+    budget_item_id: Optional[UUID] = None
+    amount: Decimal
+    description: str
+    category: str
+    date: dt.date
+    payment_method: Optional[str] = None
+    currency: Optional[str] = None
+    tags: Optional[List[str]] = None
+    notes: Optional[str] = None
+    created_at: dt.datetime
+    score: Optional[float] = None  # Word similarity to the search term
+
+
+class ExpenseSearchResponse(BaseModel):
+    """One page of GET /api/expenses/search"""
+    expenses: List[ExpenseResponse]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
@@ -3,12 +3,16 @@ Budget Service
 ==============
 Business logic for budget management, framework templates, and budget items.
 """
+import base64
+import binascii
+import json
+import logging
 from datetime import datetime
-from decimal import Decimal
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from supabase import Client
+from postgrest import AsyncPostgrestClient
+from postgrest.exceptions import APIError
 from fastapi import HTTPException, status
 
 from ..schemas.budget import (
@@ -25,7 +29,45 @@ from ..schemas.budget import (
     ParentCategoryCreate,
     BudgetItemChildCreate,
     BudgetItemWithChildren,
+    BudgetReplicateRequest,
+    BudgetItemBatchRequest,
 )
+from ..core import money
+from .dashboard_service import DashboardCache
+
+
+logger = logging.getLogger(__name__)
+
+
+# Columns a client may request from the item tree (?fields=)
+BUDGET_ITEM_FIELDS = frozenset(BudgetItemResponse.model_fields)
+
+# Columns a client may request from the budget list (?fields=)
+BUDGET_FIELDS = frozenset(BudgetResponse.model_fields) - {"budget_items"}
+
+
+def encode_budget_cursor(month_period: str, budget_id: str) -> str:
+    """Opaque keyset cursor for the budget after which the next page starts"""
+    raw = json.dumps([month_period, str(budget_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_budget_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor produced by encode_budget_cursor
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        month_period, budget_id = json.loads(raw)
+        return str(month_period), str(UUID(budget_id))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
 
 
 # =====================================================
@@ -113,8 +155,13 @@ FRAMEWORK_TEMPLATES: Dict[str, Dict[str, Any]] = {
 class BudgetService:
     """Service for managing budgets and budget items"""
 
-    def __init__(self, supabase: Client):
+    def __init__(
+        self,
+        supabase: AsyncPostgrestClient,
+        dashboard_cache: Optional[DashboardCache] = None
+    ):
         self.supabase = supabase
+        self.dashboard_cache = dashboard_cache
 
     # =====================================================
     # BUDGET CRUD OPERATIONS
@@ -125,14 +172,45 @@ class BudgetService:
         space_id: UUID,
         month_period: Optional[str] = None,
         budget_type: Optional[BudgetType] = None,
-        user_id: Optional[UUID] = None
-    ) -> List[Dict[str, Any]]:
-        """List budgets for a space with optional filters"""
+        user_id: Optional[UUID] = None,
+        limit: int = 12,
+        cursor: Optional[str] = None,
+        include_items: bool = True,
+        fields: Optional[List[str]] = None,
+        item_fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        List budgets for a space, newest month first, one page at a time
+
+        Pages are keyset-paginated on (month_period, id) so each page costs
+        the same regardless of how many months the space has.
+
+        Args:
+            space_id: The space ID
+            month_period: Only budgets of this month (YYYY-MM)
+            budget_type: Only budgets of this type
+            user_id: User making the request
+            limit: Page size
+            cursor: next_cursor of the previous page
+            include_items: Embed each budget's items
+            fields: Budget columns to return (id and month_period always are)
+            item_fields: Item columns to return (id always is)
+
+        Returns:
+            Dictionary with 'budgets' and 'next_cursor' (None on the last page)
+
+        Raises:
+            HTTPException: 400 for unknown fields or a malformed cursor
+        """
+        columns = self._select_columns(fields, BUDGET_FIELDS, {"id", "month_period"}, "budget")
+        if include_items:
+            item_columns = self._select_columns(item_fields, BUDGET_ITEM_FIELDS, {"id"}, "budget item")
+            columns = f"{columns}, budget_items({item_columns})"
+
+        after = decode_budget_cursor(cursor) if cursor else None
+
         try:
-            # Start query
-            query = self.supabase.table("budgets").select(
-                "*, budget_items(*)"
-            ).eq("space_id", str(space_id))
+            query = self.supabase.table("budgets").select(columns).eq("space_id", str(space_id))
 
             # Apply filters
             if month_period:
@@ -141,11 +219,25 @@ class BudgetService:
             if budget_type:
                 query = query.eq("type", budget_type)
 
-            # Order by month_period desc
-            query = query.order("month_period", desc=True)
+            if after:
+                after_month, after_id = after
+                query = query.or_(
+                    f"month_period.lt.{after_month},"
+                    f"and(month_period.eq.{after_month},id.lt.{after_id})"
+                )
 
-            response = query.execute()
-            return response.data
+            # Newest month first; one extra row tells whether a next page exists
+            query = query.order("month_period", desc=True).order("id", desc=True).limit(limit + 1)
+
+            response = await query.execute()
+            budgets = response.data[:limit]
+
+            next_cursor = None
+            if len(response.data) > limit:
+                last = budgets[-1]
+                next_cursor = encode_budget_cursor(last["month_period"], last["id"])
+
+            return {"budgets": budgets, "next_cursor": next_cursor}
 
         except Exception as e:
             raise HTTPException(
@@ -153,10 +245,29 @@ class BudgetService:
                 detail=f"Failed to list budgets: {str(e)}"
             )
 
+    @staticmethod
+    def _select_columns(
+        fields: Optional[List[str]],
+        allowed: frozenset,
+        required: set,
+        label: str
+    ) -> str:
+        """PostgREST column list for a sparse fieldset ('*' when not given)"""
+        if fields is None:
+            return "*"
+
+        unknown = set(fields) - allowed
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown {label} fields: {', '.join(sorted(unknown))}"
+            )
+        return ",".join(sorted(set(fields) | required))
+
     async def get_budget(self, budget_id: UUID, user_id: UUID) -> Dict[str, Any]:
         """Get budget by ID with items"""
         try:
-            response = self.supabase.table("budgets").select(
+            response = await self.supabase.table("budgets").select(
                 "*, budget_items(*)"
             ).eq("id", str(budget_id)).single().execute()
 
@@ -181,108 +292,51 @@ class BudgetService:
         budget_data: BudgetCreate,
         user_id: UUID
     ) -> Dict[str, Any]:
-        """Create a new budget with framework-based items"""
-        try:
-            # Check if master budget already exists for this month
-            if budget_data.type == "master":
-                existing = self.supabase.table("budgets").select("id").eq(
-                    "space_id", str(budget_data.space_id)
-                ).eq("month_period", budget_data.month_period).eq(
-                    "type", "master"
-                ).execute()
-
-                if existing.data:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Master budget already exists for {budget_data.month_period}"
-                    )
-
-            # Prepare budget data
-            budget_dict = budget_data.model_dump(exclude={"budget_items"})
-            budget_dict["created_by"] = str(user_id)
-            budget_dict["space_id"] = str(budget_dict["space_id"])
-
-            # Convert Decimal to string for database
-            if "total_income" in budget_dict:
-                budget_dict["total_income"] = str(budget_dict["total_income"])
-
-            # Create budget
-            budget_response = self.supabase.table("budgets").insert(
-                budget_dict
-            ).execute()
+        """
+        Create a new budget with framework-based items
 
-            if not budget_response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to create budget"
-                )
+        The budget and its items are created by create_budget_with_items
+        (migration 018) in one transaction, which also expands framework
+        percentages into amounts. Totals are maintained by triggers.
 
-            budget = budget_response.data[0]
-            budget_id = budget["id"]
-
-            # Generate budget items based on framework
-            items_to_create = []
-
-            if budget_data.framework != "custom" and budget_data.framework in FRAMEWORK_TEMPLATES:
-                template = FRAMEWORK_TEMPLATES[budget_data.framework]
-                total_income = float(budget_data.total_income)
-
-                for idx, category_template in enumerate(template["categories"]):
-                    # Calculate budgeted amount from percentage
-                    budgeted_amount = total_income * category_template["percentage"]
-                    is_parent = category_template.get("is_parent", False)
-
-                    # Parent categories start with 0 - will be calculated from children
-                    # Regular items use the calculated amount
-                    final_budgeted_amount = "0" if is_parent else str(Decimal(str(budgeted_amount)).quantize(Decimal("0.01")))
-
-                    item = {
-                        "budget_id": budget_id,
-                        "category": category_template["category"],
-                        "category_type": category_template["category_type"],
-                        "budgeted_amount": final_budgeted_amount,
-                        "spent_amount": "0",
-                        "icon": category_template.get("icon"),
-                        "color": category_template.get("color", "#4ADE80"),
-                        "display_order": idx,
-                        "is_parent": is_parent,
-                        "parent_id": category_template.get("parent_id")  # Support child items
-                    }
-                    items_to_create.append(item)
-
-            elif budget_data.budget_items:
-                # Use custom items provided
-                for idx, item in enumerate(budget_data.budget_items):
-                    item_dict = item.model_dump()
-                    item_dict["budget_id"] = budget_id
-                    item_dict["display_order"] = idx
-                    items_to_create.append(item_dict)
-
-            # Insert budget items if any
-            if items_to_create:
-                items_response = self.supabase.table("budget_items").insert(
-                    items_to_create
-                ).execute()
-                budget["budget_items"] = items_response.data
-            else:
-                budget["budget_items"] = []
-
-            # Calculate total_budgeted
-            total_budgeted = sum(
-                float(item.get("budgeted_amount", 0)) for item in budget["budget_items"]
-            )
+        Args:
+            budget_data: Budget to create; framework templates win over custom items
+            user_id: User creating the budget
 
-            # Update budget with total_budgeted
-            self.supabase.table("budgets").update({
-                "total_budgeted": str(Decimal(str(total_budgeted)).quantize(Decimal("0.01")))
-            }).eq("id", budget_id).execute()
+        Returns:
+            The created budget with its budget_items
 
-            budget["total_budgeted"] = total_budgeted
+        Raises:
+            HTTPException: 409 if the space already has a budget of this type for the month
+        """
+        if budget_data.framework != "custom" and budget_data.framework in FRAMEWORK_TEMPLATES:
+            items = FRAMEWORK_TEMPLATES[budget_data.framework]["categories"]
+        else:
+            # Items of a new budget cannot point at existing parents
+            items = [
+                item.model_dump(mode="json", exclude={"parent_id", "display_order"})
+                for item in budget_data.budget_items or []
+            ]
 
-            return budget
+        try:
+            response = await self.supabase.rpc("create_budget_with_items", {
+                "p_budget": budget_data.model_dump(mode="json", exclude={"budget_items"}),
+                "p_items": items,
+                "p_created_by": str(user_id),
+            }).execute()
 
-        except HTTPException:
-            raise
+            return response.data
+
+        except APIError as e:
+            if e.code == "23505":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"A {budget_data.type} budget already exists for {budget_data.month_period}"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create budget: {e.message}"
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -309,7 +363,7 @@ class BudgetService:
                     detail="No fields to update"
                 )
 
-            response = self.supabase.table("budgets").update(
+            response = await self.supabase.table("budgets").update(
                 update_dict
             ).eq("id", str(budget_id)).execute()
 
@@ -319,6 +373,8 @@ class BudgetService:
                     detail="Budget not found"
                 )
 
+            self._invalidate_dashboard(budget_id)
+
             # Fetch updated budget with items
             return await self.get_budget(budget_id, user_id)
 
@@ -333,7 +389,7 @@ class BudgetService:
     async def delete_budget(self, budget_id: UUID, user_id: UUID) -> bool:
         """Delete budget (soft delete or hard delete)"""
         try:
-            response = self.supabase.table("budgets").delete().eq(
+            response = await self.supabase.table("budgets").delete().eq(
                 "id", str(budget_id)
             ).execute()
 
@@ -343,6 +399,8 @@ class BudgetService:
                     detail="Budget not found"
                 )
 
+            self._invalidate_dashboard(budget_id)
+
             return True
 
         except HTTPException:
@@ -353,6 +411,58 @@ class BudgetService:
                 detail=f"Failed to delete budget: {str(e)}"
             )
 
+    async def replicate_budget(
+        self,
+        budget_id: UUID,
+        replicate_data: BudgetReplicateRequest,
+        user_id: UUID
+    ) -> Dict[str, Any]:
+        """
+        Copy a budget (and optionally its item hierarchy) into another month.
+
+        Runs replicate_budget (migration 014) as a single server-side
+        transaction; items are copied with one INSERT ... SELECT.
+
+        Args:
+            budget_id: Source budget ID
+            replicate_data: Target month and copy options
+            user_id: User creating the copy
+
+        Returns:
+            The new budget with its budget_items
+        """
+        try:
+            response = await self.supabase.rpc("replicate_budget", {
+                "p_budget_id": str(budget_id),
+                "p_target_month_period": replicate_data.target_month_period,
+                "p_copy_amounts": replicate_data.copy_amounts,
+                "p_copy_items": replicate_data.copy_items,
+                "p_created_by": str(user_id),
+            }).execute()
+
+            return response.data
+
+        except APIError as e:
+            if e.code == "23505":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"A budget of this type already exists for {replicate_data.target_month_period}"
+                )
+            if e.code == "P0002":
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Budget not found"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to replicate budget: {e.message}"
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to replicate budget: {str(e)}"
+            )
+
     # =====================================================
     # BUDGET ITEM OPERATIONS
     # =====================================================
@@ -368,7 +478,7 @@ class BudgetService:
             item_dict = item_data.model_dump()
             item_dict["budget_id"] = str(budget_id)
 
-            response = self.supabase.table("budget_items").insert(
+            response = await self.supabase.table("budget_items").insert(
                 item_dict
             ).execute()
 
@@ -378,8 +488,8 @@ class BudgetService:
                     detail="Failed to create budget item"
                 )
 
-            # Recalculate budget totals
-            await self._recalculate_budget_totals(budget_id)
+            # Budget totals are maintained by trigger (migration 012)
+            self._invalidate_dashboard(budget_id)
 
             return response.data[0]
 
@@ -410,7 +520,7 @@ class BudgetService:
                     detail="No fields to update"
                 )
 
-            response = self.supabase.table("budget_items").update(
+            response = await self.supabase.table("budget_items").update(
                 update_dict
             ).eq("id", str(item_id)).execute()
 
@@ -422,8 +532,8 @@ class BudgetService:
 
             item = response.data[0]
 
-            # Recalculate budget totals
-            await self._recalculate_budget_totals(UUID(item["budget_id"]))
+            # Budget totals are maintained by trigger (migration 012)
+            self._invalidate_dashboard(item["budget_id"])
 
             return item
 
@@ -438,26 +548,19 @@ class BudgetService:
     async def delete_budget_item(self, item_id: UUID, user_id: UUID) -> bool:
         """Delete budget item"""
         try:
-            # Get item to know which budget to recalculate
-            item_response = self.supabase.table("budget_items").select(
-                "budget_id"
-            ).eq("id", str(item_id)).single().execute()
+            # Delete item; the returned row tells which budget changed
+            delete_response = await self.supabase.table("budget_items").delete().eq(
+                "id", str(item_id)
+            ).execute()
 
-            if not item_response.data:
+            if not delete_response.data:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Budget item not found"
                 )
 
-            budget_id = UUID(item_response.data["budget_id"])
-
-            # Delete item
-            delete_response = self.supabase.table("budget_items").delete().eq(
-                "id", str(item_id)
-            ).execute()
-
-            # Recalculate budget totals
-            await self._recalculate_budget_totals(budget_id)
+            # Budget totals are maintained by trigger (migration 012)
+            self._invalidate_dashboard(delete_response.data[0]["budget_id"])
 
             return True
 
@@ -473,110 +576,104 @@ class BudgetService:
     # PARENT-CHILD CATEGORY OPERATIONS
     # =====================================================
 
-    async def create_parent_category(
+    async def apply_item_batch(
         self,
         budget_id: UUID,
-        parent_data: ParentCategoryCreate,
+        batch: BudgetItemBatchRequest,
         user_id: UUID
     ) -> Dict[str, Any]:
         """
-        Create a parent category with multiple children in a transaction.
+        Apply create/update/delete/reorder operations to a budget's items.
+
+        Everything runs in apply_budget_item_batch (migration 015): one
+        transaction, one statement per operation kind, so the rollup
+        triggers fire a handful of times instead of once per item.
 
         Args:
-            budget_id: The budget to add the parent category to
-            parent_data: Parent category data including children
+            budget_id: The budget ID
+            batch: Validated operations
             user_id: User making the request
 
         Returns:
-            Parent category with children array
+            Dictionary with the resulting 'items' tree and its 'etag'
         """
         try:
-            # Validate budget exists and user has access
-            budget_response = self.supabase.table("budgets").select(
-                "id, space_id"
-            ).eq("id", str(budget_id)).single().execute()
+            response = await self.supabase.rpc("apply_budget_item_batch", {
+                "p_budget_id": str(budget_id),
+                "p_operations": [
+                    op.model_dump(mode="json", exclude_none=True) for op in batch.operations
+                ],
+            }).execute()
+
+            self._invalidate_dashboard(budget_id)
+            return response.data
 
-            if not budget_response.data:
+        except APIError as e:
+            if e.code == "P0002":
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Budget not found"
+                    detail=e.message or "Budget item not found"
                 )
-
-            # Prepare parent item data
-            parent_dict = {
-                "budget_id": str(budget_id),
-                "category": parent_data.category,
-                "description": parent_data.description,
-                "category_type": parent_data.category_type,
-                "icon": parent_data.icon,
-                "color": parent_data.color,
-                "display_order": parent_data.display_order,
-                "is_parent": True,
-                "parent_id": None,
-                "budgeted_amount": "0",  # Will be auto-calculated by trigger
-                "spent_amount": "0"
-            }
-
-            # Create parent item
-            parent_response = self.supabase.table("budget_items").insert(
-                parent_dict
-            ).execute()
-
-            if not parent_response.data:
+            if e.code in ("22023", "23503", "23514"):
+                # Bad parent reference or a CHECK constraint (e.g. nested parents)
                 raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to create parent category"
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=e.message
                 )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to apply item batch: {e.message}"
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to apply item batch: {str(e)}"
+            )
 
-            parent = parent_response.data[0]
-            parent_id = parent["id"]
-
-            # Prepare children items
-            children_to_create = []
-            for idx, child in enumerate(parent_data.children):
-                child_dict = {
-                    "budget_id": str(budget_id),
-                    "category": child.category,
-                    "description": child.description,
-                    "category_type": parent_data.category_type,  # Inherit from parent
-                    "icon": child.icon,
-                    "color": child.color or parent_data.color,
-                    "display_order": child.display_order if child.display_order > 0 else idx,
-                    "is_parent": False,
-                    "parent_id": parent_id,
-                    "budgeted_amount": str(child.budgeted_amount),
-                    "spent_amount": str(child.spent_amount)
-                }
-                children_to_create.append(child_dict)
-
-            # Create all children
-            children_response = self.supabase.table("budget_items").insert(
-                children_to_create
-            ).execute()
+    async def create_parent_category(
+        self,
+        budget_id: UUID,
+        parent_data: ParentCategoryCreate,
+        user_id: UUID
+    ) -> Dict[str, Any]:
+        """
+        Create a parent category with multiple children in a transaction.
 
-            if not children_response.data:
-                # Rollback: delete parent if children creation fails
-                self.supabase.table("budget_items").delete().eq("id", parent_id).execute()
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to create child categories"
-                )
+        One call to create_parent_category (migration 019): the parent and
+        its children are inserted together and the parent is returned with
+        the amounts the rollup triggers computed from them.
 
-            # Fetch updated parent with auto-calculated budgeted_amount
-            updated_parent_response = self.supabase.table("budget_items").select(
-                "*"
-            ).eq("id", parent_id).single().execute()
+        Args:
+            budget_id: The budget to add the parent category to
+            parent_data: Parent category data including children
+            user_id: User making the request
 
-            parent = updated_parent_response.data
-            parent["children"] = children_response.data
+        Returns:
+            Parent category with children array
 
-            # Recalculate budget totals
-            await self._recalculate_budget_totals(budget_id)
+        Raises:
+            HTTPException: 404 if the budget does not exist
+        """
+        try:
+            response = await self.supabase.rpc("create_parent_category", {
+                "p_budget_id": str(budget_id),
+                "p_parent": parent_data.model_dump(mode="json", exclude={"children"}),
+                "p_children": [child.model_dump(mode="json") for child in parent_data.children],
+            }).execute()
 
-            return parent
+            self._invalidate_dashboard(budget_id)
+            return response.data
 
-        except HTTPException:
-            raise
+        except APIError as e:
+            if e.code == "P0002":
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Budget not found"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create parent category: {e.message}"
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -592,69 +689,45 @@ class BudgetService:
         """
         Add a single child to an existing parent category.
 
+        One call to add_child_to_parent (migration 019), which checks the
+        parent, inserts the child and returns the updated parent.
+
         Args:
             parent_id: The parent category ID
             child_data: Child item data
             user_id: User making the request
 
         Returns:
-            Created child item
+            Parent category (with updated totals) and its children array
+
+        Raises:
+            HTTPException: 404 if the parent does not exist, 400 if it is not a parent category
         """
         try:
-            # Validate parent exists and is_parent=True
-            parent_response = self.supabase.table("budget_items").select(
-                "id, budget_id, category_type, is_parent, color"
-            ).eq("id", str(parent_id)).single().execute()
+            response = await self.supabase.rpc("add_child_to_parent", {
+                "p_parent_id": str(parent_id),
+                "p_child": child_data.model_dump(mode="json"),
+            }).execute()
 
-            if not parent_response.data:
+            parent = response.data
+            self._invalidate_dashboard(parent["budget_id"])
+            return parent
+
+        except APIError as e:
+            if e.code == "P0002":
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Parent category not found"
                 )
-
-            parent = parent_response.data
-
-            if not parent.get("is_parent"):
+            if e.code == "22023":
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Item is not a parent category"
                 )
-
-            # Prepare child item data
-            child_dict = {
-                "budget_id": parent["budget_id"],
-                "category": child_data.category,
-                "description": child_data.description,
-                "category_type": parent["category_type"],  # Inherit from parent
-                "icon": child_data.icon,
-                "color": child_data.color or parent["color"],
-                "display_order": child_data.display_order,
-                "is_parent": False,
-                "parent_id": str(parent_id),
-                "budgeted_amount": str(child_data.budgeted_amount),
-                "spent_amount": str(child_data.spent_amount)
-            }
-
-            # Create child item
-            child_response = self.supabase.table("budget_items").insert(
-                child_dict
-            ).execute()
-
-            if not child_response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to create child category"
-                )
-
-            child = child_response.data[0]
-
-            # Parent total auto-updates via trigger, recalculate budget totals
-            await self._recalculate_budget_totals(UUID(parent["budget_id"]))
-
-            return child
-
-        except HTTPException:
-            raise
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to add child to parent: {e.message}"
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -664,74 +737,52 @@ class BudgetService:
     async def get_budget_items_hierarchy(
         self,
         budget_id: UUID,
-        user_id: UUID
-    ) -> Dict[str, List[Dict[str, Any]]]:
+        user_id: UUID,
+        fields: Optional[List[str]] = None,
+        depth: int = 2,
+        if_none_match: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Get budget items organized hierarchically with parent-child relationships.
 
+        The nested tree is built by get_budget_item_tree (migration 011) in a
+        single call, ordered by display_order at every level.
+
         Args:
             budget_id: The budget ID
             user_id: User making the request
+            fields: Item columns to return (all when None; id is always included)
+            depth: Levels of nesting to return (1 = top-level items only)
+            if_none_match: ETag the client already has
 
         Returns:
-            Dictionary with 'items' array containing parents with nested children
+            Dictionary with 'etag' and either the 'items' array containing
+            parents with nested children, or 'not_modified': True
         """
+        if fields is not None:
+            unknown = set(fields) - BUDGET_ITEM_FIELDS
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown budget item fields: {', '.join(sorted(unknown))}"
+                )
+            fields = sorted(set(fields) | {"id"})
+
         try:
-            # Validate budget exists
-            budget_response = self.supabase.table("budgets").select(
-                "id, space_id"
-            ).eq("id", str(budget_id)).single().execute()
+            response = await self.supabase.rpc("get_budget_item_tree", {
+                "p_budget_id": str(budget_id),
+                "p_fields": fields,
+                "p_depth": depth,
+                "p_if_none_match": if_none_match,
+            }).execute()
 
-            if not budget_response.data:
+            if not response.data:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Budget not found"
                 )
 
-            # Fetch all budget items
-            items_response = self.supabase.table("budget_items").select(
-                "*"
-            ).eq("budget_id", str(budget_id)).order("display_order").execute()
-
-            all_items = items_response.data or []
-
-            # Build hierarchy
-            parents_dict = {}
-            children_dict = {}
-            standalone_items = []
-
-            # First pass: separate parents, children, and standalone items
-            for item in all_items:
-                item_id = item["id"]
-                parent_id = item.get("parent_id")
-                is_parent = item.get("is_parent", False)
-
-                # Initialize children array
-                item["children"] = []
-
-                if is_parent:
-                    parents_dict[item_id] = item
-                elif parent_id:
-                    if parent_id not in children_dict:
-                        children_dict[parent_id] = []
-                    children_dict[parent_id].append(item)
-                else:
-                    standalone_items.append(item)
-
-            # Second pass: attach children to parents
-            for parent_id, children in children_dict.items():
-                if parent_id in parents_dict:
-                    parents_dict[parent_id]["children"] = children
-
-            # Combine all top-level items (parents + standalone)
-            result_items = list(parents_dict.values()) + standalone_items
-
-            # Sort by display_order
-            result_items.sort(key=lambda x: x.get("display_order", 0))
-
-            return {
-                "items": result_items
-            }
+            return response.data
 
         except HTTPException:
             raise
@@ -745,82 +796,98 @@ class BudgetService:
     # HELPER METHODS
     # =====================================================
 
-    async def _recalculate_budget_totals(self, budget_id: UUID) -> None:
+    def _invalidate_dashboard(self, budget_id: UUID | str) -> None:
+        """Drop cached dashboard summaries built from this budget"""
+        if self.dashboard_cache is not None:
+            self.dashboard_cache.invalidate_budget(str(budget_id))
+
+    async def verify_budget_totals(self, budget_id: UUID) -> Dict[str, Any]:
         """
-        Recalculate budget total_budgeted and total_spent.
+        Compare stored budget totals with a fresh sum of its items.
+
+        Totals are maintained by the delta triggers of migration 012; this is
+        a verification tool (see scripts/budget_totals.py), not part of any
+        write path. Sums run over integer cents (core.money), so the
+        comparison is exact. Only top-level items are counted (parents
+        already hold the sum of their children, standalone items have no
+        parent).
+
+        Args:
+            budget_id: The budget ID
 
-        Note: Parent items are auto-calculated by DB triggers, so we sum:
-        - All standalone items (not parents, no parent_id)
-        - All parent items (they contain the sum of children)
-        - We exclude children to avoid double-counting
+        Returns:
+            Dictionary with 'stored', 'expected' and 'consistent'
+
+        Raises:
+            HTTPException: If the budget does not exist
         """
-        try:
-            # Get all items for this budget
-            items_response = self.supabase.table("budget_items").select(
-                "budgeted_amount, spent_amount, is_parent, parent_id"
-            ).eq("budget_id", str(budget_id)).execute()
-
-            items = items_response.data or []
-
-            # Sum only parents and standalone items (exclude children to avoid double-counting)
-            total_budgeted = sum(
-                float(item.get("budgeted_amount", 0))
-                for item in items
-                if item.get("is_parent") or not item.get("parent_id")
-            )
-            total_spent = sum(
-                float(item.get("spent_amount", 0))
-                for item in items
-                if item.get("is_parent") or not item.get("parent_id")
-            )
+        budget_response = await self.supabase.table("budgets").select(
+            "total_budgeted, total_spent"
+        ).eq("id", str(budget_id)).execute()
 
-            # Update budget
-            self.supabase.table("budgets").update({
-                "total_budgeted": str(Decimal(str(total_budgeted)).quantize(Decimal("0.01"))),
-                "total_spent": str(Decimal(str(total_spent)).quantize(Decimal("0.01")))
-            }).eq("id", str(budget_id)).execute()
+        if not budget_response.data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Budget not found"
+            )
 
-        except Exception as e:
-            # Log error but don't raise - this is a helper method
-            print(f"Error recalculating budget totals: {e}")
+        items_response = await self.supabase.table("budget_items").select(
+            "budgeted_amount, spent_amount"
+        ).eq("budget_id", str(budget_id)).is_("parent_id", "null").execute()
+
+        items = items_response.data or []
+        expected = {
+            "total_budgeted": money.to_decimal(
+                money.total(money.cents_array(item["budgeted_amount"] for item in items))
+            ),
+            "total_spent": money.to_decimal(
+                money.total(money.cents_array(item["spent_amount"] for item in items))
+            ),
+        }
+        stored = {
+            key: money.to_decimal(money.to_cents(budget_response.data[0][key])) for key in expected
+        }
+
+        consistent = stored == expected
+        if not consistent:
+            logger.warning(f"Budget {budget_id} totals drifted: stored {stored}, expected {expected}")
+
+        return {
+            "budget_id": str(budget_id),
+            "stored": stored,
+            "expected": expected,
+            "consistent": consistent,
+        }
 
     async def get_budget_stats(self, budget_id: UUID, user_id: UUID) -> Dict[str, Any]:
-        """Get budget statistics"""
-        try:
-            budget = await self.get_budget(budget_id, user_id)
+        """
+        Get budget statistics
 
-            total_income = float(budget.get("total_income", 0))
-            total_budgeted = float(budget.get("total_budgeted", 0))
-            total_spent = float(budget.get("total_spent", 0))
-            remaining = total_income - total_spent
+        Computed by get_budget_stats (migration 017) in one query with exact
+        decimals: totals, per-item and per-category-type breakdowns.
 
-            percentage_spent = (
-                (total_spent / total_income * 100) if total_income > 0 else 0
-            )
+        Args:
+            budget_id: The budget ID
+            user_id: User making the request
 
-            # Category breakdown
-            category_breakdown = []
-            for item in budget.get("budget_items", []):
-                budgeted = float(item.get("budgeted_amount", 0))
-                spent = float(item.get("spent_amount", 0))
-
-                category_breakdown.append({
-                    "category": item["category"],
-                    "category_type": item["category_type"],
-                    "budgeted": budgeted,
-                    "spent": spent,
-                    "remaining": budgeted - spent,
-                    "percentage_used": (spent / budgeted * 100) if budgeted > 0 else 0
-                })
-
-            return {
-                "total_income": total_income,
-                "total_budgeted": total_budgeted,
-                "total_spent": total_spent,
-                "remaining": remaining,
-                "percentage_spent": round(percentage_spent, 2),
-                "category_breakdown": category_breakdown
-            }
+        Returns:
+            BudgetStats dictionary
+
+        Raises:
+            HTTPException: 404 if the budget does not exist
+        """
+        try:
+            response = await self.supabase.rpc("get_budget_stats", {
+                "p_budget_id": str(budget_id),
+            }).execute()
+
+            if not response.data:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Budget not found"
+                )
+
+            return response.data
 
         except HTTPException:
             raise
@@ -830,6 +897,49 @@ class BudgetService:
                 detail=f"Failed to get budget stats: {str(e)}"
             )
 
+    async def get_budget_stats_range(
+        self,
+        space_id: UUID,
+        from_month_period: str,
+        to_month_period: str,
+        user_id: UUID
+    ) -> List[Dict[str, Any]]:
+        """
+        Get statistics of every budget of a space over a range of months
+
+        Args:
+            space_id: The space ID
+            from_month_period: First month (YYYY-MM), inclusive
+            to_month_period: Last month (YYYY-MM), inclusive
+            user_id: User making the request
+
+        Returns:
+            BudgetStats dictionaries, oldest month first
+
+        Raises:
+            HTTPException: 400 if the range is reversed
+        """
+        if from_month_period > to_month_period:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'from' must not be after 'to'"
+            )
+
+        try:
+            response = await self.supabase.rpc("get_budget_stats_range", {
+                "p_space_id": str(space_id),
+                "p_from_month_period": from_month_period,
+                "p_to_month_period": to_month_period,
+            }).execute()
+
+            return response.data or []
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to get budget stats: {str(e)}"
+            )
+
     def get_framework_templates(self) -> Dict[str, Dict[str, Any]]:
         """Get all available framework templates"""
         return FRAMEWORK_TEMPLATES
@@ -5,7 +5,7 @@ Business logic for currency management operations.
 """
 
 from typing import Optional
-from supabase import Client
+from postgrest import AsyncPostgrestClient
 from ..schemas.currency import CurrencyResponse, CurrencyCreate, CurrencyUpdate
 from ..core.exceptions import ValidationError, NotFoundError
 
@@ -13,7 +13,7 @@ from ..core.exceptions import ValidationError, NotFoundError
 class CurrencyService:
     """Service for managing currencies"""
 
-    def __init__(self, supabase_client: Client):
+    def __init__(self, supabase_client: AsyncPostgrestClient):
         self.supabase = supabase_client
 
     async def get_all_currencies(
@@ -37,7 +37,7 @@ class CurrencyService:
 
             query = query.order("display_order", desc=False).order("code", desc=False)
 
-            response = query.execute()
+            response = await query.execute()
 
             return [CurrencyResponse(**currency) for currency in response.data]
 
@@ -58,7 +58,7 @@ class CurrencyService:
             NotFoundError: If currency not found
         """
         try:
-            response = self.supabase.table("currencies").select("*").eq("code", code.upper()).execute()
+            response = await self.supabase.table("currencies").select("*").eq("code", code.upper()).execute()
 
             if not response.data:
                 raise NotFoundError(f"Currency '{code}' not found")
@@ -85,7 +85,7 @@ class CurrencyService:
         """
         try:
             # Check if currency already exists
-            existing = self.supabase.table("currencies").select("code").eq("code", currency_data.code.upper()).execute()
+            existing = await self.supabase.table("currencies").select("code").eq("code", currency_data.code.upper()).execute()
 
             if existing.data:
                 raise ValidationError(f"Currency '{currency_data.code}' already exists")
@@ -94,7 +94,7 @@ class CurrencyService:
             currency_dict = currency_data.model_dump()
             currency_dict["code"] = currency_dict["code"].upper()
 
-            response = self.supabase.table("currencies").insert(currency_dict).execute()
+            response = await self.supabase.table("currencies").insert(currency_dict).execute()
 
             if not response.data:
                 raise ValidationError("Failed to create currency")
@@ -135,7 +135,7 @@ class CurrencyService:
             if not update_dict:
                 raise ValidationError("No fields to update")
 
-            response = self.supabase.table("currencies").update(update_dict).eq("code", code.upper()).execute()
+            response = await self.supabase.table("currencies").update(update_dict).eq("code", code.upper()).execute()
 
             if not response.data:
                 raise ValidationError("Failed to update currency")
@@ -163,7 +163,7 @@ class CurrencyService:
             await self.get_currency_by_code(code)
 
             # Soft delete by setting is_active to False
-            response = self.supabase.table("currencies").update({"is_active": False}).eq("code", code.upper()).execute()
+            response = await self.supabase.table("currencies").update({"is_active": False}).eq("code", code.upper()).execute()
 
             if not response.data:
                 raise ValidationError("Failed to delete currency")
@@ -0,0 +1,345 @@
+"""
+Dashboard Service
+
+Builds the dashboard summary (monthly balance, savings goals, recent
+expenses, quick stats, spending breakdown) from a single SQL round trip,
+cached per (space_id, month_period) until a budget or expense write.
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core import money
+from ..core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+# Every dashboard section in one server-side pass. The category breakdown
+# reads the expense_monthly_rollups table (migration 009), so its cost
+# depends on the number of categories, not expenses. The month total and the
+# top category are derived from the breakdown instead of being queried again.
+DASHBOARD_SUMMARY_QUERY = text("""
+    WITH space AS (
+        SELECT s.id, s.name, s.currency
+        FROM spaces s
+        JOIN space_members sm ON s.id = sm.space_id
+        WHERE sm.user_id = :user_id AND s.is_personal = true
+        LIMIT 1
+    ),
+    budget AS (
+        SELECT b.id, b.name, b.total_income
+        FROM budgets b
+        JOIN space ON b.space_id = space.id
+        WHERE b.month_period = :month_period
+        AND b.type = 'master'
+        LIMIT 1
+    ),
+    breakdown AS (
+        SELECT r.category,
+               r.total_amount AS total,
+               r.expense_count AS count
+        FROM expense_monthly_rollups r
+        JOIN space ON r.space_id = space.id
+        WHERE r.month = :month_start
+        AND r.expense_count > 0
+    ),
+    savings AS (
+        SELECT bi.category AS name,
+               bi.budgeted_amount AS target,
+               COALESCE(bi.spent_amount, 0) AS current
+        FROM budget_items bi
+        JOIN budget ON bi.budget_id = budget.id
+        WHERE bi.category ILIKE '%saving%'
+    ),
+    recent AS (
+        SELECT e.id, e.description, e.amount, e.category, e.date, e.created_at
+        FROM expenses e
+        JOIN space ON e.space_id = space.id
+        ORDER BY e.date DESC, e.created_at DESC
+        LIMIT 5
+    )
+    SELECT
+        (SELECT row_to_json(space) FROM space) AS space,
+        (SELECT row_to_json(budget) FROM budget) AS budget,
+        (SELECT COALESCE(SUM(total), 0) FROM breakdown) AS month_total,
+        (SELECT COALESCE(json_agg(b ORDER BY b.total DESC), '[]'::json) FROM breakdown b) AS breakdown,
+        (SELECT COALESCE(json_agg(s), '[]'::json) FROM savings s) AS savings,
+        (SELECT COALESCE(json_agg(r ORDER BY r.date DESC, r.created_at DESC), '[]'::json) FROM recent r) AS recent
+""")
+
+
+def _json(value: Any) -> Any:
+    """asyncpg may hand json columns back as text depending on codecs"""
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def month_bounds(now: datetime) -> tuple[date, date]:
+    """First day of the month containing `now` and of the following month"""
+    month_start = date(now.year, now.month, 1)
+    if now.month == 12:
+        month_end = date(now.year + 1, 1, 1)
+    else:
+        month_end = date(now.year, now.month + 1, 1)
+    return month_start, month_end
+
+
+def empty_summary(space: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Summary returned before onboarding or when no budget exists"""
+    return {
+        "has_data": False,
+        "space": space,
+        "monthly_balance": None,
+        "saving_goals": [],
+        "recent_expenses": [],
+        "upcoming_bills": [],
+        "weekly_challenges": [],
+        "quick_stats": None,
+        "spending_breakdown": []
+    }
+
+
+def weekly_challenges(currency: str) -> list[Dict[str, Any]]:
+    """Weekly Challenges (hardcoded for MVP - would be dynamic later)"""
+    return [
+        {
+            "id": "challenge-1",
+            "title": "Skip the Coffee",
+            "description": "Brew coffee at home this week",
+            "reward": 25,
+            "progress": 3,
+            "target": 5,
+            "currency": currency
+        },
+        {
+            "id": "challenge-2",
+            "title": "No Takeout Thursday",
+            "description": "Cook all meals at home on Thursdays",
+            "reward": 30,
+            "progress": 1,
+            "target": 4,
+            "currency": currency
+        }
+    ]
+
+
+def build_summary(row: Any, now: datetime, month_period: str) -> Dict[str, Any]:
+    """
+    Shape the single-row result of DASHBOARD_SUMMARY_QUERY into the
+    dashboard payload
+
+    Args:
+        row: Mapping with space, budget, month_total, breakdown, savings, recent
+        now: Current time (used for daily averages and days remaining)
+        month_period: YYYY-MM of the current month
+
+    Returns:
+        Dashboard data dict
+    """
+    space_row = _json(row["space"])
+    if not space_row:
+        # User hasn't completed onboarding or has no space
+        return empty_summary()
+
+    currency = space_row.get("currency") or "USD"
+    space = {
+        "id": space_row["id"],
+        "name": space_row["name"],
+        "currency": currency
+    }
+
+    budget_row = _json(row["budget"])
+    if not budget_row:
+        # No budget for current month - show empty state
+        return empty_summary(space)
+
+    # Amounts are summed and divided as integer cents (core.money) and only
+    # turned into JSON numbers at the end
+    income_cents = money.to_cents(budget_row.get("total_income"))
+    expense_cents = money.to_cents(row["month_total"])
+
+    # Monthly Balance
+    monthly_balance = {
+        "income": money.to_float(income_cents),
+        "expenses": money.to_float(expense_cents),
+        "balance": money.to_float(income_cents - expense_cents),
+        "percent_spent": money.percentage(expense_cents, income_cents, places=1),
+        "currency": currency
+    }
+
+    # Saving Goals (from budget items with category 'Savings')
+    saving_goals = []
+    for goal in _json(row["savings"]) or []:
+        target = money.to_cents(goal.get("target"))
+        current = money.to_cents(goal.get("current"))
+        saving_goals.append({
+            "name": goal["name"],
+            "target": money.to_float(target),
+            "current": money.to_float(current),
+            "progress": money.percentage(current, target, places=1),
+            "currency": currency
+        })
+
+    # Recent Expenses (last 5)
+    recent_expenses = [
+        {
+            "id": str(expense["id"]),
+            "description": expense["description"],
+            "amount": money.to_float(money.to_cents(expense["amount"])),
+            "category": expense["category"] or "Other",
+            "date": expense["date"],
+            "currency": currency
+        }
+        for expense in _json(row["recent"]) or []
+    ]
+
+    # Spending Breakdown by category (ordered by total DESC)
+    breakdown = _json(row["breakdown"]) or []
+    totals = money.cents_array(entry["total"] for entry in breakdown)
+    shares = money.percentages(totals, expense_cents, places=1)
+    spending_breakdown = [
+        {
+            "category": entry["category"],
+            "amount": money.to_float(cents),
+            "count": int(entry["count"]),
+            "percentage": share,
+            "currency": currency
+        }
+        for entry, cents, share in zip(breakdown, totals, shares)
+    ]
+
+    # Quick Stats
+    month_start, month_end = month_bounds(now)
+    days_in_month = (month_end - month_start).days
+    days_elapsed = (now.date() - month_start).days + 1
+    avg_daily_cents = money.divide(expense_cents, days_elapsed)
+
+    # Biggest expense category is the first breakdown row
+    top = spending_breakdown[0] if spending_breakdown else None
+    quick_stats = {
+        "avg_daily_spending": money.to_float(avg_daily_cents),
+        "projected_monthly": money.to_float(avg_daily_cents * days_in_month),
+        "top_category": top["category"] if top else "N/A",
+        "top_category_amount": top["amount"] if top else 0.0,
+        "days_remaining": days_in_month - days_elapsed,
+        "currency": currency
+    }
+
+    return {
+        "has_data": True,
+        "space": space,
+        "budget": {
+            "id": budget_row["id"],
+            "name": budget_row["name"],
+            "month_period": month_period
+        },
+        "monthly_balance": monthly_balance,
+        "saving_goals": saving_goals,
+        "recent_expenses": recent_expenses,
+        # Upcoming Bills (placeholder for now - would need recurring expenses)
+        "upcoming_bills": [],
+        "weekly_challenges": weekly_challenges(currency),
+        "quick_stats": quick_stats,
+        "spending_breakdown": spending_breakdown
+    }
+
+
+class DashboardCache:
+    """
+    Dashboard query results keyed by (space_id, month_period)
+
+    Stores the raw DASHBOARD_SUMMARY_QUERY row, not the built payload, so
+    time-dependent quick stats are recomputed on every hit. A second map
+    resolves user_id to the personal space without touching the database.
+    Writes invalidate by space or budget; the TTL covers writes made by
+    other workers.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.summaries = TTLCache(max_size, ttl, name="dashboard_summary")
+        self.spaces = TTLCache(max_size, ttl, name="dashboard_space")
+
+    def get(self, user_id: str, month_period: str) -> Optional[Dict[str, Any]]:
+        """Cached summary row for the user's personal space, if any"""
+        space_id = self.spaces.get(user_id)
+        if space_id is None:
+            return None
+        return self.summaries.get((space_id, month_period))
+
+    def set(self, user_id: str, month_period: str, row: Dict[str, Any]) -> None:
+        """Cache a summary row (must contain a space)"""
+        space_id = str(row["space"]["id"])
+        self.spaces.set(user_id, space_id)
+        self.summaries.set((space_id, month_period), row)
+
+    def invalidate_space(self, space_id: str) -> int:
+        """Drop every cached month of a space (expense writes)"""
+        space_id = str(space_id)
+        return self.summaries.invalidate_where(lambda key, _: key[0] == space_id)
+
+    def invalidate_budget(self, budget_id: str) -> int:
+        """Drop the summary built from a budget (budget and item writes)"""
+        budget_id = str(budget_id)
+        return self.summaries.invalidate_where(
+            lambda _, row: str(row["budget"]["id"]) == budget_id
+        )
+
+    def clear(self) -> None:
+        """Drop all cached summaries and space lookups"""
+        self.summaries.clear()
+        self.spaces.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of both maps"""
+        return {
+            "summaries": self.summaries.stats(),
+            "spaces": self.spaces.stats(),
+        }
+
+
+class DashboardService:
+    """Service for the dashboard summary"""
+
+    def __init__(self, db: AsyncSession, cache: Optional[DashboardCache] = None):
+        self.db = db
+        self.cache = cache
+
+    async def get_summary(self, user_id: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Get comprehensive dashboard summary for a user in at most one round trip
+
+        Args:
+            user_id: User UUID
+            now: Reference time (defaults to current time)
+
+        Returns:
+            Dashboard data dict
+        """
+        now = now or datetime.now()
+        month_start, _ = month_bounds(now)
+        month_period = f"{now.year}-{now.month:02d}"
+
+        if self.cache is not None:
+            cached = self.cache.get(user_id, month_period)
+            if cached is not None:
+                return build_summary(cached, now, month_period)
+
+        result = await self.db.execute(DASHBOARD_SUMMARY_QUERY, {
+            "user_id": user_id,
+            "month_period": month_period,
+            "month_start": month_start
+        })
+        row = {key: _json(value) for key, value in result.mappings().one().items()}
+
+        # Only complete summaries are cached so onboarding shows up at once
+        if self.cache is not None and row["space"] and row["budget"]:
+            self.cache.set(user_id, month_period, row)
+
+        return build_summary(row, now, month_period)
@@ -0,0 +1,262 @@
+"""
+Expense Search
+
+Fuzzy description search and filtered browsing of a space's expenses in
+one SQL round trip, paged with keyset cursors instead of OFFSET.
+
+Descriptions match by trigram word similarity (``:q <% description``),
+which the idx_expenses_description_trgm GIN index serves. Word
+similarity compares the search term with the best matching part of the
+description, so "coffee" finds "STARBUCKS COFFEE #1234 SEATTLE WA",
+which plain similarity() over the whole string would rank below its
+0.3 threshold.
+"""
+
+import base64
+import binascii
+import json
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+SEARCH_COLUMNS = """
+    e.id, e.space_id, e.budget_id, e.budget_item_id, e.amount, e.description,
+    e.category, e.date, e.payment_method, e.currency, e.tags, e.notes, e.created_at
+"""
+
+SCORE = "word_similarity(:q, e.description)"
+
+IS_MEMBER = text("""
+    SELECT EXISTS (
+        SELECT 1 FROM space_members
+        WHERE space_id = :space_id AND user_id = :user_id AND is_active = true
+    )
+""")
+
+SORTS = ("relevance", "date")
+
+
+def encode_search_cursor(row: Dict[str, Any], sort: str) -> str:
+    """Opaque keyset cursor for the expense after which the next page starts"""
+    key = [row["date"].isoformat(), str(row["id"])]
+    if sort == "relevance":
+        key.insert(0, row["score"])
+    raw = json.dumps(key).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str, sort: str) -> Tuple:
+    """
+    Decode a cursor produced by encode_search_cursor for the same sort
+
+    Returns:
+        (date, id) for sort=date, (score, date, id) for sort=relevance
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or from another sort
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+        if sort == "relevance":
+            score, expense_date, expense_id = key
+            return float(score), date.fromisoformat(expense_date), UUID(expense_id)
+        expense_date, expense_id = key
+        return date.fromisoformat(expense_date), UUID(expense_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def build_search_query(
+    space_id: UUID,
+    user_id: UUID,
+    q: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    categories: Optional[List[str]] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
+    tags: Optional[List[str]] = None,
+    sort: str = "date",
+    limit: int = 50,
+    after: Optional[Tuple] = None
+) -> Tuple[TextClause, Dict[str, Any]]:
+    """
+    Build the search statement and its parameters
+
+    Only the filters that are set become predicates, so the planner sees
+    a plain statement for each combination instead of `:x IS NULL OR ...`
+    branches it cannot use indexes for. Fetches limit + 1 rows so the
+    caller can tell whether another page exists.
+
+    Args:
+        space_id: Space to search
+        user_id: Requesting user; rows only come back for active members
+        q: Search term matched against descriptions
+        date_from / date_to: Inclusive date range
+        categories: Any of these categories
+        min_amount / max_amount: Inclusive amount range
+        tags: All of these tags
+        sort: 'relevance' (needs q) or 'date', newest first
+        limit: Page size
+        after: Decoded cursor of the previous page
+
+    Returns:
+        (statement, parameters)
+    """
+    params: Dict[str, Any] = {"space_id": space_id, "user_id": user_id, "limit": limit + 1}
+    where = [
+        "e.space_id = :space_id",
+        """EXISTS (
+            SELECT 1 FROM space_members sm
+            WHERE sm.space_id = :space_id AND sm.user_id = :user_id AND sm.is_active = true
+        )""",
+    ]
+    columns = SEARCH_COLUMNS
+
+    if q:
+        params["q"] = q
+        where.append(":q <% e.description")
+        columns += f", {SCORE} AS score"
+    if date_from:
+        params["date_from"] = date_from
+        where.append("e.date >= :date_from")
+    if date_to:
+        params["date_to"] = date_to
+        where.append("e.date <= :date_to")
+    if categories:
+        params["categories"] = list(categories)
+        where.append("e.category = ANY(:categories)")
+    if min_amount is not None:
+        params["min_amount"] = min_amount
+        where.append("e.amount >= :min_amount")
+    if max_amount is not None:
+        params["max_amount"] = max_amount
+        where.append("e.amount <= :max_amount")
+    if tags:
+        params["tags"] = list(tags)
+        where.append("e.tags @> :tags")
+
+    if sort == "relevance":
+        order = "score DESC, e.date DESC, e.id DESC"
+        if after:
+            params["after_score"], params["after_date"], params["after_id"] = after
+            where.append(
+                f"({SCORE}, e.date, e.id) < (CAST(:after_score AS real), :after_date, :after_id)"
+            )
+    else:
+        order = "e.date DESC, e.id DESC"
+        if after:
+            params["after_date"], params["after_id"] = after
+            where.append("(e.date, e.id) < (:after_date, :after_id)")
+
+    statement = text(
+        f"SELECT {columns}\n    FROM expenses e\n    WHERE "
+        + "\n    AND ".join(where)
+        + f"\n    ORDER BY {order}\n    LIMIT :limit"
+    )
+    return statement, params
+
+
+class ExpenseSearchService:
+    """Service for expense search"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(
+        self,
+        space_id: UUID,
+        user_id: UUID,
+        q: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        categories: Optional[List[str]] = None,
+        min_amount: Optional[Decimal] = None,
+        max_amount: Optional[Decimal] = None,
+        tags: Optional[List[str]] = None,
+        sort: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Search a space's expenses, one page at a time
+
+        Args:
+            space_id: Space to search
+            user_id: User making the request (must be a space member)
+            q: Fuzzy description search term
+            date_from / date_to: Inclusive date range
+            categories: Any of these categories
+            min_amount / max_amount: Inclusive amount range
+            tags: All of these tags
+            sort: 'relevance' (default with q) or 'date' (default without)
+            limit: Page size
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Dictionary with 'expenses' and 'next_cursor' (None on the last page)
+
+        Raises:
+            HTTPException: 400 for invalid ranges or cursors, 403 for non-members
+        """
+        q = q.strip() if q else None
+        sort = sort or ("relevance" if q else "date")
+
+        if sort == "relevance" and not q:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="sort=relevance requires a search term"
+            )
+        if date_from and date_to and date_from > date_to:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'from' must not be after 'to'"
+            )
+        if min_amount is not None and max_amount is not None and min_amount > max_amount:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="min_amount must not exceed max_amount"
+            )
+
+        after = decode_search_cursor(cursor, sort) if cursor else None
+        statement, params = build_search_query(
+            space_id, user_id, q=q, date_from=date_from, date_to=date_to,
+            categories=categories, min_amount=min_amount, max_amount=max_amount,
+            tags=tags, sort=sort, limit=limit, after=after
+        )
+
+        result = await self.db.execute(statement, params)
+        rows = [dict(row) for row in result.mappings()]
+
+        # Non-members get no rows from the query itself; only an empty page
+        # pays for the second round trip that tells them apart
+        if not rows and not await self._is_member(space_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not a member of this space"
+            )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_search_cursor(rows[-1], sort)
+
+        return {"expenses": rows, "next_cursor": next_cursor}
+
+    async def _is_member(self, space_id: UUID, user_id: UUID) -> bool:
+        result = await self.db.execute(IS_MEMBER, {"space_id": space_id, "user_id": user_id})
+        return bool(result.scalar())
@@ -0,0 +1,202 @@
+"""
+Expense Service
+===============
+Expense ingestion: bulk inserts from bank syncs and file imports.
+"""
+import logging
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from postgrest import AsyncPostgrestClient
+from postgrest.exceptions import APIError
+from starlette.concurrency import iterate_in_threadpool
+
+from ..core.config import settings
+from ..schemas.expense import ExpenseCreate
+from .dashboard_service import DashboardCache
+from .space_service import SpaceRoleCache
+from .statement_import import ImportOptions, ImportProgress, StatementError, statement_batches
+
+
+logger = logging.getLogger(__name__)
+
+
+class ExpenseService:
+    """Service for expense writes"""
+
+    def __init__(
+        self,
+        supabase_client: AsyncPostgrestClient,
+        dashboard_cache: Optional[DashboardCache] = None,
+        role_cache: Optional[SpaceRoleCache] = None
+    ):
+        self.supabase = supabase_client
+        self.dashboard_cache = dashboard_cache
+        self.role_cache = role_cache
+
+    async def check_access(self, space_id: UUID, user_id: UUID) -> None:
+        """
+        Make sure the user is an active member of the space
+
+        For endpoints that stream their response and must refuse before the
+        first byte. Served from the space role cache when possible.
+
+        Raises:
+            HTTPException: 403 for non-members
+        """
+        space_id, user_id = str(space_id), str(user_id)
+        if self.role_cache is not None and await self.role_cache.get(space_id, user_id) is not None:
+            return
+
+        response = await self.supabase.table("space_members") \
+            .select("role") \
+            .eq("space_id", space_id) \
+            .eq("user_id", user_id) \
+            .eq("is_active", True) \
+            .execute()
+
+        if not response.data:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not a member of this space"
+            )
+        if self.role_cache is not None:
+            await self.role_cache.set(space_id, user_id, response.data[0]["role"])
+
+    async def bulk_create(
+        self,
+        space_id: UUID,
+        expenses: List[ExpenseCreate],
+        user_id: UUID
+    ) -> Dict[str, Any]:
+        """
+        Insert a batch of expenses in one transaction
+
+        Runs bulk_insert_expenses (migrations 020/022): one multi-row
+        INSERT, rows with an already stored bank_transaction_id are skipped,
+        and the migration 022 trigger gives budget item spent amounts one
+        delta per item for the batch.
+
+        Args:
+            space_id: Space the expenses belong to
+            expenses: Expenses to insert
+            user_id: User making the request (must be a space member)
+
+        Returns:
+            Dictionary with 'received', 'inserted' and 'skipped' counts
+
+        Raises:
+            HTTPException: 413 above EXPENSE_BULK_MAX_ROWS, 403 for non-members,
+                400 for budgets or budget items outside the space
+        """
+        if len(expenses) > settings.EXPENSE_BULK_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {settings.EXPENSE_BULK_MAX_ROWS} expenses per request"
+            )
+
+        rows = [expense.model_dump(mode="json", exclude_none=True) for expense in expenses]
+        result = await self._insert_rows(space_id, rows, user_id)
+
+        if result["inserted"]:
+            self._invalidate_dashboard(space_id)
+
+        logger.info(
+            f"Bulk expenses for space {space_id}: "
+            f"{result['inserted']} inserted, {result['skipped']} skipped"
+        )
+        return result
+
+    async def import_statement(
+        self,
+        space_id: UUID,
+        stream: BinaryIO,
+        statement_format: str,
+        options: ImportOptions,
+        user_id: UUID,
+        total_bytes: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Import a CSV/OFX statement, yielding progress after every batch
+
+        The statement is parsed by the statement_import generator pipeline
+        in a worker thread, one chunk at a time, and every batch of
+        options.batch_size expenses is its own bulk_insert_expenses
+        transaction. A failed import keeps the batches already stored;
+        importing the same file again skips them.
+
+        Args:
+            space_id: Space the expenses belong to
+            stream: Binary file object of the statement
+            statement_format: 'csv', 'ofx' or 'auto'
+            options: Parsing options (amount sign, category, batch size, size limit)
+            user_id: User making the request (must be a space member)
+            total_bytes: File size when known, for progress
+
+        Yields:
+            Progress dictionaries with 'status' running, then completed or failed
+        """
+        progress = ImportProgress(total_bytes=total_bytes)
+        batches = iterate_in_threadpool(statement_batches(stream, statement_format, options, progress))
+
+        try:
+            async for batch in batches:
+                result = await self._insert_rows(space_id, batch, user_id)
+                progress.inserted += result["inserted"]
+                progress.skipped += result["skipped"]
+                yield {"status": "running", **progress.as_dict()}
+
+        except (StatementError, HTTPException) as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            logger.warning(f"Statement import for space {space_id} failed: {detail}")
+            yield {"status": "failed", "detail": detail, **progress.as_dict()}
+            return
+
+        finally:
+            if progress.inserted:
+                self._invalidate_dashboard(space_id)
+
+        logger.info(f"Statement import for space {space_id}: {progress.as_dict()}")
+        yield {"status": "completed", **progress.as_dict()}
+
+    async def _insert_rows(
+        self,
+        space_id: UUID,
+        rows: List[Dict[str, Any]],
+        user_id: UUID
+    ) -> Dict[str, Any]:
+        """Call bulk_insert_expenses for one batch of JSON-ready rows"""
+        try:
+            response = await self.supabase.rpc("bulk_insert_expenses", {
+                "p_space_id": str(space_id),
+                "p_created_by": str(user_id),
+                "p_rows": rows,
+            }).execute()
+            return response.data
+
+        except APIError as e:
+            if e.code == "42501":
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="You are not a member of this space"
+                )
+            if e.code in ("22023", "23503", "23514"):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=e.message
+                )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to insert expenses: {e.message}"
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to insert expenses: {str(e)}"
+            )
+
+    def _invalidate_dashboard(self, space_id: UUID) -> None:
+        """Drop cached dashboard summaries of the space"""
+        if self.dashboard_cache is not None:
+            self.dashboard_cache.invalidate_space(str(space_id))
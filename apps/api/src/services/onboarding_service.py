@@ -13,7 +13,7 @@ import random
 import string
 from datetime import datetime
 from typing import Optional
-from supabase import Client
+from postgrest import AsyncPostgrestClient
 
 # Budget framework configurations
 # category_type must be one of: 'needs', 'wants', 'savings', 'income'
@@ -46,10 +46,10 @@ FRAMEWORK_50_30_20 = {
 class OnboardingService:
     """Service class for onboarding operations"""
 
-    def __init__(self, supabase_client: Client):
+    def __init__(self, supabase_client: AsyncPostgrestClient):
         self.supabase = supabase_client
 
-    def _generate_invite_code(self, length: int = 6) -> str:
+    async def _generate_invite_code(self, length: int = 6) -> str:
         """
         Generate unique invite code
 
@@ -66,7 +66,7 @@ class OnboardingService:
             code = ''.join(random.choices(chars, k=length))
 
             # Check if code already exists
-            result = self.supabase.table('spaces').select('id').eq('invite_code', code).execute()
+            result = await self.supabase.table('spaces').select('id').eq('invite_code', code).execute()
 
             if len(result.data) == 0:
                 return code
@@ -82,18 +82,18 @@ class OnboardingService:
             Dict with onboarding status flags
         """
         # Check if onboarding completed
-        user_result = self.supabase.table('user_profiles').select('onboarding_completed').eq('id', user_id).execute()
+        user_result = await self.supabase.table('user_profiles').select('onboarding_completed').eq('id', user_id).execute()
 
         onboarding_completed = False
         if user_result.data and len(user_result.data) > 0:
             onboarding_completed = user_result.data[0].get('onboarding_completed', False)
 
         # Check if has personal space
-        space_result = self.supabase.table('spaces').select('id').eq('created_by', user_id).eq('is_personal', True).execute()
+        space_result = await self.supabase.table('spaces').select('id').eq('created_by', user_id).eq('is_personal', True).execute()
         has_personal_space = len(space_result.data) > 0
 
         # Check if has any budget
-        budget_result = self.supabase.table('budgets').select('id').in_(
+        budget_result = await self.supabase.table('budgets').select('id').in_(
             'space_id',
             [s['id'] for s in space_result.data] if space_result.data else []
         ).execute()
@@ -122,13 +122,13 @@ class OnboardingService:
             ValueError: If user already has personal space
         """
         # Check if user already has personal space
-        existing = self.supabase.table('spaces').select('id').eq('created_by', user_id).eq('is_personal', True).execute()
+        existing = await self.supabase.table('spaces').select('id').eq('created_by', user_id).eq('is_personal', True).execute()
 
         if len(existing.data) > 0:
             raise ValueError('User already has a personal space')
 
         # Generate unique invite code
-        invite_code = self._generate_invite_code()
+        invite_code = await self._generate_invite_code()
 
         # Create space
         space_data = {
@@ -139,7 +139,7 @@ class OnboardingService:
             'created_by': user_id,
         }
 
-        space_result = self.supabase.table('spaces').insert(space_data).execute()
+        space_result = await self.supabase.table('spaces').insert(space_data).execute()
 
         if not space_result.data or len(space_result.data) == 0:
             raise Exception('Failed to create space')
@@ -153,7 +153,7 @@ class OnboardingService:
             'role': 'owner'
         }
 
-        self.supabase.table('space_members').insert(member_data).execute()
+        await self.supabase.table('space_members').insert(member_data).execute()
 
         return created_space
 
@@ -204,7 +204,7 @@ class OnboardingService:
             return {'skipped': True}
 
         # Verify space belongs to user
-        space_result = self.supabase.table('spaces').select('id').eq('id', space_id).eq('created_by', user_id).execute()
+        space_result = await self.supabase.table('spaces').select('id').eq('id', space_id).eq('created_by', user_id).execute()
 
         if len(space_result.data) == 0:
             raise ValueError('Space not found or not owned by user')
@@ -223,7 +223,7 @@ class OnboardingService:
             'auto_generated': True,
         }
 
-        budget_result = self.supabase.table('budgets').insert(budget_data).execute()
+        budget_result = await self.supabase.table('budgets').insert(budget_data).execute()
 
         if not budget_result.data or len(budget_result.data) == 0:
             raise Exception('Failed to create budget')
@@ -246,7 +246,7 @@ class OnboardingService:
 
             # Insert items
             try:
-                items_result = self.supabase.table('budget_items').insert(item_data).execute()
+                items_result = await self.supabase.table('budget_items').insert(item_data).execute()
                 items = items_result.data if items_result.data else []
                 print(f"[DEBUG] Successfully inserted {len(items)} items")
             except Exception as e:
@@ -270,7 +270,7 @@ class OnboardingService:
         Returns:
             Completion confirmation
         """
-        result = self.supabase.table('user_profiles').update({
+        result = await self.supabase.table('user_profiles').update({
             'onboarding_completed': True
         }).eq('id', user_id).execute()
 
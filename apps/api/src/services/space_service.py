@@ -5,23 +5,201 @@ Business logic for space management
 """
 
 import logging
+from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from uuid import UUID
 from datetime import datetime
 
+from ..core.cache import TTLCache
+from ..core.config import settings
+
 logger = logging.getLogger(__name__)
 
 
+class SpaceRoleCache(ABC):
+    """
+    Authorization cache mapping (space_id, user_id) to the member's role
+
+    Only active memberships are cached. Membership writes (join, leave,
+    removal, role change, space deletion) invalidate explicitly; the TTL
+    bounds staleness for writes made outside this API. Lookups are async so
+    a shared backend can sit behind the same interface.
+    """
+
+    @abstractmethod
+    async def get(self, space_id: str, user_id: str) -> Optional[str]:
+        """Cached role, or None on a miss"""
+
+    @abstractmethod
+    async def set(self, space_id: str, user_id: str, role: str) -> None:
+        """Cache the role of an active member"""
+
+    @abstractmethod
+    async def invalidate(self, space_id: str, user_id: str) -> None:
+        """Drop one membership"""
+
+    @abstractmethod
+    async def invalidate_space(self, space_id: str) -> None:
+        """Drop every membership of a space"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for metrics"""
+
+
+class InMemorySpaceRoleCache(SpaceRoleCache):
+    """Per-worker role cache (default)"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.roles = TTLCache(max_size, ttl, name="space_roles")
+
+    async def get(self, space_id: str, user_id: str) -> Optional[str]:
+        return self.roles.get((str(space_id), str(user_id)))
+
+    async def set(self, space_id: str, user_id: str, role: str) -> None:
+        self.roles.set((str(space_id), str(user_id)), role)
+
+    async def invalidate(self, space_id: str, user_id: str) -> None:
+        self.roles.invalidate((str(space_id), str(user_id)))
+
+    async def invalidate_space(self, space_id: str) -> None:
+        space_id = str(space_id)
+        self.roles.invalidate_where(lambda key, _: key[0] == space_id)
+
+    def clear(self) -> None:
+        self.roles.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.roles.stats()
+
+
+class RedisSpaceRoleCache(SpaceRoleCache):
+    """
+    Role cache shared by all workers through Redis (settings.REDIS_URL)
+
+    Redis errors are logged and treated as misses, so an unavailable Redis
+    only costs the membership query it would have saved.
+    """
+
+    KEY_PREFIX = "space_role"
+
+    def __init__(self, url: str, ttl: float):
+        # Optional dependency, only needed with SPACE_ROLE_CACHE_BACKEND=redis
+        from redis import asyncio as aioredis
+
+        self.redis = aioredis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _key(self, space_id: str, user_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{space_id}:{user_id}"
+
+    async def get(self, space_id: str, user_id: str) -> Optional[str]:
+        try:
+            role = await self.redis.get(self._key(space_id, user_id))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Space role cache read failed: {str(e)}")
+            role = None
+
+        if role is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return role
+
+    async def set(self, space_id: str, user_id: str, role: str) -> None:
+        try:
+            await self.redis.set(self._key(space_id, user_id), role, px=int(self.ttl * 1000))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Space role cache write failed: {str(e)}")
+
+    async def invalidate(self, space_id: str, user_id: str) -> None:
+        try:
+            await self.redis.delete(self._key(space_id, user_id))
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Space role cache invalidation failed: {str(e)}")
+
+    async def invalidate_space(self, space_id: str) -> None:
+        try:
+            keys = [key async for key in self.redis.scan_iter(match=self._key(space_id, "*"))]
+            if keys:
+                await self.redis.delete(*keys)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Space role cache invalidation failed: {str(e)}")
+
+    async def aclose(self) -> None:
+        await self.redis.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "name": "space_roles",
+            "backend": "redis",
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+        }
+
+
+def create_space_role_cache() -> SpaceRoleCache:
+    """Build the role cache selected by settings.SPACE_ROLE_CACHE_BACKEND"""
+    if settings.SPACE_ROLE_CACHE_BACKEND == "redis":
+        return RedisSpaceRoleCache(settings.REDIS_URL, ttl=settings.SPACE_ROLE_CACHE_TTL)
+    return InMemorySpaceRoleCache(
+        max_size=settings.SPACE_ROLE_CACHE_MAX_SIZE,
+        ttl=settings.SPACE_ROLE_CACHE_TTL,
+    )
+
+
 class SpaceService:
     """Service for managing spaces and memberships"""
 
-    def __init__(self, supabase_client):
+    def __init__(self, supabase_client, role_cache: Optional[SpaceRoleCache] = None):
         """Initialize space service
 
         Args:
-            supabase_client: Supabase client instance
+            supabase_client: Shared async PostgREST client
+            role_cache: Optional (space_id, user_id) -> role cache
         """
         self.supabase = supabase_client
+        self.role_cache = role_cache
+
+    async def _get_member_role(self, space_id: str, user_id: str) -> Optional[str]:
+        """Role of an active member, or None if the user is not a member
+
+        Served from the role cache when possible.
+        """
+        if self.role_cache is not None:
+            role = await self.role_cache.get(space_id, user_id)
+            if role is not None:
+                return role
+
+        response = await self.supabase.table("space_members") \
+            .select("role") \
+            .eq("space_id", space_id) \
+            .eq("user_id", user_id) \
+            .eq("is_active", True) \
+            .execute()
+
+        if not response.data:
+            return None
+
+        role = response.data[0]["role"]
+        if self.role_cache is not None:
+            await self.role_cache.set(space_id, user_id, role)
+        return role
+
+    async def _invalidate_role(self, space_id: str, user_id: str) -> None:
+        if self.role_cache is not None:
+            await self.role_cache.invalidate(space_id, user_id)
 
     async def list_user_spaces(
         self,
@@ -59,26 +237,18 @@ class SpaceService:
                 query = query.eq("role", role)
 
             # Execute query
-            response = query.execute()
+            response = await query.execute()
 
             if not response.data:
                 return []
 
-            # Transform data
+            # Transform data (member_count is maintained on spaces by
+            # trigger, migration 010, so no per-space count query)
             spaces = []
             for membership in response.data:
                 space_data = membership["spaces"]
-
-                # Get member count
-                member_count_response = self.supabase.table("space_members") \
-                    .select("id", count="exact") \
-                    .eq("space_id", space_data["id"]) \
-                    .eq("is_active", True) \
-                    .execute()
-
                 space_data["user_role"] = membership["role"]
-                space_data["member_count"] = member_count_response.count or 0
-
+                space_data["member_count"] = space_data.get("member_count") or 0
                 spaces.append(space_data)
 
             logger.info(f"Listed {len(spaces)} spaces for user {user_id}")
@@ -102,41 +272,34 @@ class SpaceService:
             ValueError: If space not found or user not member
         """
         try:
-            # Check if user is member
-            membership_response = self.supabase.table("space_members") \
-                .select("role, is_active") \
-                .eq("space_id", space_id) \
-                .eq("user_id", user_id) \
-                .eq("is_active", True) \
-                .execute()
-
-            if not membership_response.data:
-                raise ValueError("You are not a member of this space")
-
-            user_role = membership_response.data[0]["role"]
-
-            # Get space data
-            space_response = self.supabase.table("spaces") \
-                .select("*") \
+            # Space, active members and their profiles in one embedded select;
+            # the caller's role is read from the member list
+            space_response = await self.supabase.table("spaces") \
+                .select("*, space_members(*, users(username, full_name, avatar_url))") \
                 .eq("id", space_id) \
+                .eq("space_members.is_active", True) \
                 .execute()
 
             if not space_response.data:
-                raise ValueError("Space not found")
+                raise ValueError("You are not a member of this space")
 
             space = space_response.data[0]
+            members = space.pop("space_members", None) or []
 
-            # Get members with user info
-            members_response = self.supabase.table("space_members") \
-                .select("*, users(username, full_name, avatar_url)") \
-                .eq("space_id", space_id) \
-                .eq("is_active", True) \
-                .execute()
+            user_role = next(
+                (member["role"] for member in members if member["user_id"] == user_id),
+                None
+            )
+            if user_role is None:
+                raise ValueError("You are not a member of this space")
 
-            space["members"] = members_response.data if members_response.data else []
-            space["member_count"] = len(space["members"])
+            space["members"] = members
+            space["member_count"] = len(members)
             space["user_role"] = user_role
 
+            if self.role_cache is not None:
+                await self.role_cache.set(space_id, user_id, user_role)
+
             logger.info(f"Retrieved space {space_id} for user {user_id}")
             return space
 
@@ -184,7 +347,7 @@ class SpaceService:
                 "is_active": True
             }
 
-            space_response = self.supabase.table("spaces") \
+            space_response = await self.supabase.table("spaces") \
                 .insert(space_data) \
                 .execute()
 
@@ -201,13 +364,13 @@ class SpaceService:
                 "is_active": True
             }
 
-            member_response = self.supabase.table("space_members") \
+            member_response = await self.supabase.table("space_members") \
                 .insert(member_data) \
                 .execute()
 
             if not member_response.data:
                 # Rollback: delete space
-                self.supabase.table("spaces").delete().eq("id", space["id"]).execute()
+                await self.supabase.table("spaces").delete().eq("id", space["id"]).execute()
                 raise ValueError("Failed to create membership")
 
             member = member_response.data[0]
@@ -246,18 +409,11 @@ class SpaceService:
         """
         try:
             # Check if user is owner or admin
-            membership_response = self.supabase.table("space_members") \
-                .select("role") \
-                .eq("space_id", space_id) \
-                .eq("user_id", user_id) \
-                .eq("is_active", True) \
-                .execute()
+            user_role = await self._get_member_role(space_id, user_id)
 
-            if not membership_response.data:
+            if user_role is None:
                 raise ValueError("You are not a member of this space")
 
-            user_role = membership_response.data[0]["role"]
-
             if user_role not in ["owner", "admin"]:
                 raise ValueError("Only owners and admins can update the space")
 
@@ -283,7 +439,7 @@ class SpaceService:
                 raise ValueError("No valid fields to update")
 
             # Execute update
-            response = self.supabase.table("spaces") \
+            response = await self.supabase.table("spaces") \
                 .update(update_data) \
                 .eq("id", space_id) \
                 .execute()
@@ -312,21 +468,16 @@ class SpaceService:
         """
         try:
             # Check if user is owner
-            membership_response = self.supabase.table("space_members") \
-                .select("role") \
-                .eq("space_id", space_id) \
-                .eq("user_id", user_id) \
-                .eq("is_active", True) \
-                .execute()
+            user_role = await self._get_member_role(space_id, user_id)
 
-            if not membership_response.data:
+            if user_role is None:
                 raise ValueError("You are not a member of this space")
 
-            if membership_response.data[0]["role"] != "owner":
+            if user_role != "owner":
                 raise ValueError("Only the owner can delete the space")
 
             # Soft delete: set is_active = false
-            response = self.supabase.table("spaces") \
+            response = await self.supabase.table("spaces") \
                 .update({"is_active": False}) \
                 .eq("id", space_id) \
                 .execute()
@@ -335,11 +486,14 @@ class SpaceService:
                 raise ValueError("Failed to delete space")
 
             # Deactivate all memberships
-            self.supabase.table("space_members") \
+            await self.supabase.table("space_members") \
                 .update({"is_active": False}) \
                 .eq("space_id", space_id) \
                 .execute()
 
+            if self.role_cache is not None:
+                await self.role_cache.invalidate_space(space_id)
+
             logger.info(f"Deleted space {space_id} by user {user_id}")
 
         except ValueError:
@@ -367,7 +521,7 @@ class SpaceService:
         """
         try:
             # Find space by invite code
-            space_response = self.supabase.table("spaces") \
+            space_response = await self.supabase.table("spaces") \
                 .select("*") \
                 .eq("invite_code", invite_code.upper()) \
                 .eq("is_active", True) \
@@ -379,7 +533,7 @@ class SpaceService:
             space = space_response.data[0]
 
             # Check if already member
-            existing_response = self.supabase.table("space_members") \
+            existing_response = await self.supabase.table("space_members") \
                 .select("id, is_active") \
                 .eq("space_id", space["id"]) \
                 .eq("user_id", user_id) \
@@ -390,7 +544,7 @@ class SpaceService:
                     raise ValueError("You are already a member of this space")
                 else:
                     # Reactivate membership
-                    member_response = self.supabase.table("space_members") \
+                    member_response = await self.supabase.table("space_members") \
                         .update({"is_active": True, "left_at": None}) \
                         .eq("id", existing_response.data[0]["id"]) \
                         .execute()
@@ -404,7 +558,7 @@ class SpaceService:
                     "is_active": True
                 }
 
-                member_response = self.supabase.table("space_members") \
+                member_response = await self.supabase.table("space_members") \
                     .insert(member_data) \
                     .execute()
 
@@ -413,6 +567,8 @@ class SpaceService:
 
                 member = member_response.data[0]
 
+            await self._invalidate_role(space["id"], user_id)
+
             logger.info(f"User {user_id} joined space {space['id']} with code {invite_code}")
 
             return {
@@ -438,21 +594,16 @@ class SpaceService:
         """
         try:
             # Check membership and role
-            membership_response = self.supabase.table("space_members") \
-                .select("role") \
-                .eq("space_id", space_id) \
-                .eq("user_id", user_id) \
-                .eq("is_active", True) \
-                .execute()
+            user_role = await self._get_member_role(space_id, user_id)
 
-            if not membership_response.data:
+            if user_role is None:
                 raise ValueError("You are not a member of this space")
 
-            if membership_response.data[0]["role"] == "owner":
+            if user_role == "owner":
                 raise ValueError("Owner cannot leave the space. Transfer ownership or delete the space.")
 
             # Deactivate membership
-            response = self.supabase.table("space_members") \
+            response = await self.supabase.table("space_members") \
                 .update({"is_active": False, "left_at": datetime.utcnow().isoformat()}) \
                 .eq("space_id", space_id) \
                 .eq("user_id", user_id) \
@@ -461,6 +612,8 @@ class SpaceService:
             if not response.data:
                 raise ValueError("Failed to leave space")
 
+            await self._invalidate_role(space_id, user_id)
+
             logger.info(f"User {user_id} left space {space_id}")
 
         except ValueError:
@@ -488,25 +641,18 @@ class SpaceService:
         """
         try:
             # Check if user is owner or admin
-            membership_response = self.supabase.table("space_members") \
-                .select("role") \
-                .eq("space_id", space_id) \
-                .eq("user_id", user_id) \
-                .eq("is_active", True) \
-                .execute()
+            user_role = await self._get_member_role(space_id, user_id)
 
-            if not membership_response.data:
+            if user_role is None:
                 raise ValueError("You are not a member of this space")
 
-            user_role = membership_response.data[0]["role"]
-
             if user_role not in ["owner", "admin"]:
                 raise ValueError("Only owners and admins can regenerate the invite code")
 
             # Call PostgreSQL function to generate new code
             # Note: Using raw SQL via RPC
-            response = self.supabase.rpc(
-                "generate_invite_code"
+            response = await self.supabase.rpc(
+                "generate_invite_code", {}
             ).execute()
 
             new_code = response.data if response.data else None
@@ -515,7 +661,7 @@ class SpaceService:
                 raise ValueError("Failed to generate new invite code")
 
             # Update space with new code
-            update_response = self.supabase.table("spaces") \
+            update_response = await self.supabase.table("spaces") \
                 .update({"invite_code": new_code}) \
                 .eq("id", space_id) \
                 .execute()
@@ -552,18 +698,13 @@ class SpaceService:
         """
         try:
             # Verify user is member of the space
-            membership_response = self.supabase.table("space_members") \
-                .select("role, is_active") \
-                .eq("space_id", space_id) \
-                .eq("user_id", user_id) \
-                .eq("is_active", True) \
-                .execute()
+            user_role = await self._get_member_role(space_id, user_id)
 
-            if not membership_response.data:
+            if user_role is None:
                 raise ValueError("You are not a member of this space")
 
             # Get all members with user info
-            members_response = self.supabase.table("space_members") \
+            members_response = await self.supabase.table("space_members") \
                 .select("""
                     id,
                     space_id,
@@ -629,17 +770,11 @@ class SpaceService:
         """
         try:
             # Verify requesting user has permission (owner or admin)
-            requester_response = self.supabase.table("space_members") \
-                .select("role, is_active") \
-                .eq("space_id", space_id) \
-                .eq("user_id", requesting_user_id) \
-                .eq("is_active", True) \
-                .execute()
+            requester_role = await self._get_member_role(space_id, requesting_user_id)
 
-            if not requester_response.data:
+            if requester_role is None:
                 raise ValueError("You are not a member of this space")
 
-            requester_role = requester_response.data[0]["role"]
             if requester_role not in ["owner", "admin"]:
                 raise ValueError("Only owners and admins can remove members")
 
@@ -648,7 +783,7 @@ class SpaceService:
                 raise ValueError("You cannot remove yourself from the space. Use leave instead.")
 
             # Get member to remove
-            member_response = self.supabase.table("space_members") \
+            member_response = await self.supabase.table("space_members") \
                 .select("role, is_active") \
                 .eq("space_id", space_id) \
                 .eq("user_id", member_user_id) \
@@ -669,7 +804,7 @@ class SpaceService:
                 raise ValueError("Admins cannot remove other admins")
 
             # Soft delete - mark as inactive
-            update_response = self.supabase.table("space_members") \
+            update_response = await self.supabase.table("space_members") \
                 .update({
                     "is_active": False,
                     "left_at": "now()"
@@ -681,6 +816,8 @@ class SpaceService:
             if not update_response.data:
                 raise ValueError("Failed to remove member")
 
+            await self._invalidate_role(space_id, member_user_id)
+
             logger.info(f"User {requesting_user_id} removed user {member_user_id} from space {space_id}")
 
         except ValueError:
@@ -688,3 +825,84 @@ class SpaceService:
         except Exception as e:
             logger.error(f"Error removing member from space {space_id}: {str(e)}")
             raise
+
+    async def update_member_role(
+        self,
+        space_id: str,
+        member_user_id: str,
+        role: str,
+        requesting_user_id: str
+    ) -> Dict[str, Any]:
+        """
+        Change a member's role
+
+        Args:
+            space_id: Space UUID
+            member_user_id: User ID whose role changes
+            role: New role (admin, member, viewer)
+            requesting_user_id: User ID making the request
+
+        Returns:
+            Updated membership
+
+        Raises:
+            ValueError: If user doesn't have permission or invalid operation
+        """
+        try:
+            requester_role = await self._get_member_role(space_id, requesting_user_id)
+
+            if requester_role is None:
+                raise ValueError("You are not a member of this space")
+
+            if requester_role not in ["owner", "admin"]:
+                raise ValueError("Only owners and admins can change member roles")
+
+            if member_user_id == requesting_user_id:
+                raise ValueError("You cannot change your own role")
+
+            if role == "owner":
+                raise ValueError("Ownership cannot be assigned by changing roles")
+
+            # Current role straight from the table, not the cache
+            member_response = await self.supabase.table("space_members") \
+                .select("role") \
+                .eq("space_id", space_id) \
+                .eq("user_id", member_user_id) \
+                .eq("is_active", True) \
+                .execute()
+
+            if not member_response.data:
+                raise ValueError("Member not found in this space")
+
+            member_role = member_response.data[0]["role"]
+
+            if member_role == "owner":
+                raise ValueError("Cannot change the space owner's role")
+
+            # Only the owner can grant or revoke admin
+            if requester_role == "admin" and "admin" in (member_role, role):
+                raise ValueError("Only the owner can grant or revoke the admin role")
+
+            update_response = await self.supabase.table("space_members") \
+                .update({"role": role}) \
+                .eq("space_id", space_id) \
+                .eq("user_id", member_user_id) \
+                .eq("is_active", True) \
+                .execute()
+
+            if not update_response.data:
+                raise ValueError("Failed to update member role")
+
+            await self._invalidate_role(space_id, member_user_id)
+
+            logger.info(
+                f"User {requesting_user_id} changed role of {member_user_id} "
+                f"in space {space_id} from {member_role} to {role}"
+            )
+            return update_response.data[0]
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error updating member role in space {space_id}: {str(e)}")
+            raise
@@ -0,0 +1,524 @@
+"""
+Statement Import
+================
+Streaming pipeline that turns a CSV or OFX bank statement into batches of
+expenses for bulk_insert_expenses:
+
+    read_chunks -> iter_text -> parse_csv (via iter_lines) -> detect_date_format
+                             / parse_ofx
+                -> normalize -> dedupe_batches
+
+Every stage is a generator holding at most one chunk, one record or one
+batch (detect_date_format: up to DATE_FORMAT_LOOKAHEAD records), so memory
+stays flat whatever the file size. Statements are read from the upload's
+spooled temporary file, never loaded whole.
+"""
+import codecs
+import csv
+import hashlib
+import html
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from itertools import chain
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+CHUNK_SIZE = 64 * 1024
+
+# Lower-cased CSV headers recognised for each expense field
+CSV_COLUMNS = {
+    "date": ("date", "transaction date", "posted date", "posting date", "booking date"),
+    "description": ("description", "payee", "name", "merchant", "details", "memo", "narrative"),
+    "amount": ("amount", "transaction amount", "value"),
+    "debit": ("debit", "withdrawal", "withdrawals", "money out", "paid out"),
+    "credit": ("credit", "deposit", "deposits", "money in", "paid in"),
+    "category": ("category",),
+    "bank_transaction_id": ("transaction id", "id", "reference", "fitid"),
+}
+
+# Date formats a statement may use: name -> (shape of the whole cell,
+# strptime format). One format is used for the whole file; see
+# detect_date_format. OFX dates are YYYYMMDD[HHMMSS[.XXX]][TZ].
+DATE_FORMATS = {
+    "YYYY-MM-DD": (r"\d{4}-\d{1,2}-\d{1,2}", "%Y-%m-%d"),
+    "YYYY/MM/DD": (r"\d{4}/\d{1,2}/\d{1,2}", "%Y/%m/%d"),
+    "MM/DD/YYYY": (r"\d{1,2}/\d{1,2}/\d{4}", "%m/%d/%Y"),
+    "DD/MM/YYYY": (r"\d{1,2}/\d{1,2}/\d{4}", "%d/%m/%Y"),
+    "MM/DD/YY": (r"\d{1,2}/\d{1,2}/\d{2}", "%m/%d/%y"),
+    "DD/MM/YY": (r"\d{1,2}/\d{1,2}/\d{2}", "%d/%m/%y"),
+    "DD.MM.YYYY": (r"\d{1,2}\.\d{1,2}\.\d{4}", "%d.%m.%Y"),
+    "DD-Mon-YYYY": (r"\d{1,2}-[A-Za-z]{3}-\d{4}", "%d-%b-%Y"),
+    "YYYYMMDD": (r"\d{8}", "%Y%m%d"),
+}
+_DATE_SHAPES = {name: re.compile(shape) for name, (shape, _) in DATE_FORMATS.items()}
+
+# CSV rows read ahead while the date format is still ambiguous
+DATE_FORMAT_LOOKAHEAD = 1000
+
+DEFAULT_CATEGORY = "Uncategorized"
+
+CENT = Decimal("0.01")
+
+
+class StatementError(ValueError):
+    """The statement cannot be parsed; carries the offending line when known"""
+
+
+class StatementTooLarge(StatementError):
+    """The upload exceeds the configured size limit"""
+
+
+@dataclass
+class ImportProgress:
+    """Counters shared by the pipeline stages and reported to the client"""
+    total_bytes: Optional[int] = None
+    bytes_read: int = 0
+    rows_parsed: int = 0
+    rows_ignored: int = 0  # Credits / zero amounts: not expenses
+    inserted: int = 0
+    skipped: int = 0  # Already imported (same bank_transaction_id)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_bytes": self.total_bytes,
+            "bytes_read": self.bytes_read,
+            "rows_parsed": self.rows_parsed,
+            "rows_ignored": self.rows_ignored,
+            "inserted": self.inserted,
+            "skipped": self.skipped,
+        }
+
+
+@dataclass
+class ImportOptions:
+    """How to read amounts and where to book them"""
+    negative_is_expense: bool = True
+    default_category: str = DEFAULT_CATEGORY
+    currency: str = "USD"
+    budget_item_id: Optional[str] = None
+    batch_size: int = 1000
+    max_bytes: Optional[int] = None
+    date_format: Optional[str] = None  # A DATE_FORMATS key; detected per file when None
+
+
+# =====================================================
+# STAGE 1: BYTES
+# =====================================================
+
+def read_chunks(
+    stream: BinaryIO,
+    progress: ImportProgress,
+    chunk_size: int = CHUNK_SIZE,
+    max_bytes: Optional[int] = None
+) -> Iterator[bytes]:
+    """Read a binary stream chunk by chunk, enforcing `max_bytes`"""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        progress.bytes_read += len(chunk)
+        if max_bytes is not None and progress.bytes_read > max_bytes:
+            raise StatementTooLarge(f"File exceeds {max_bytes} bytes")
+        yield chunk
+
+
+def iter_text(chunks: Iterable[bytes], encoding: str = "utf-8-sig") -> Iterator[str]:
+    """
+    Decode chunks incrementally
+
+    Multi-byte characters split across chunks are reassembled. Bytes that
+    are not valid in `encoding` are replaced rather than failing the import.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_lines(texts: Iterable[str]) -> Iterator[str]:
+    """Split decoded text into lines, keeping the newline (as csv expects)"""
+    pending = ""
+    for text in texts:
+        *lines, pending = (pending + text).split("\n")
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def sniff_format(first_chunk: bytes) -> str:
+    """'ofx' for OFX/QFX statements (SGML or XML), otherwise 'csv'"""
+    head = first_chunk[:2048].lstrip().upper()
+    if head.startswith(b"OFXHEADER") or b"<OFX>" in head or b"<?OFX" in head:
+        return "ofx"
+    return "csv"
+
+
+# =====================================================
+# STAGE 2: RECORDS
+# =====================================================
+
+def _csv_column(headers: List[str], key: str) -> Optional[int]:
+    names = CSV_COLUMNS[key]
+    for index, header in enumerate(headers):
+        if header in names:
+            return index
+    return None
+
+
+def parse_csv(lines: Iterable[str], progress: ImportProgress) -> Iterator[Dict[str, Any]]:
+    """
+    Yield raw records from a CSV statement
+
+    The header row picks the columns (see CSV_COLUMNS). Either one signed
+    amount column or separate debit/credit columns are required.
+    """
+    reader = csv.reader(lines)
+    try:
+        headers = [h.strip().lower() for h in next(reader)]
+    except StopIteration:
+        return
+
+    columns = {key: _csv_column(headers, key) for key in CSV_COLUMNS}
+    if columns["date"] is None or (columns["amount"] is None and columns["debit"] is None):
+        raise StatementError("CSV needs a date column and an amount (or debit) column")
+
+    def cell(row: List[str], key: str) -> Optional[str]:
+        index = columns[key]
+        if index is None or index >= len(row):
+            return None
+        return row[index].strip() or None
+
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # e.g. a quoted field running past csv.field_size_limit()
+            raise StatementError(f"Malformed CSV: {e} (line {reader.line_num})")
+        if not any(value.strip() for value in row):
+            continue
+        progress.rows_parsed += 1
+        record = {key: cell(row, key) for key in columns}
+        record["line"] = reader.line_num
+        yield record
+
+
+_OFX_TOKEN = re.compile(r"<(/?)([A-Za-z0-9_.]+)>([^<]*)")
+
+OFX_FIELDS = {
+    "DTPOSTED": "date",
+    "TRNAMT": "amount",
+    "FITID": "bank_transaction_id",
+    "NAME": "description",
+    "PAYEE": "description",
+    "MEMO": "memo",
+    "CURDEF": "currency",
+}
+
+
+def parse_ofx(texts: Iterable[str], progress: ImportProgress) -> Iterator[Dict[str, Any]]:
+    """
+    Yield raw records from the <STMTTRN> blocks of an OFX/QFX statement
+
+    Works for SGML (OFX 1.x, unclosed leaf tags) and XML (OFX 2.x) alike by
+    scanning tags, so files without line breaks stream too. Only the text
+    after the last complete tag and the current transaction are kept.
+    """
+    record: Optional[Dict[str, Any]] = None
+    currency: Optional[str] = None
+    pending = ""
+
+    def tokens(text: str):
+        for closing, tag, value in _OFX_TOKEN.findall(text):
+            yield bool(closing), tag.upper(), html.unescape(value.strip())
+
+    def scan(text: str) -> Iterator[Dict[str, Any]]:
+        nonlocal record, currency
+        for closing, tag, value in tokens(text):
+            if tag == "STMTTRN":
+                if closing and record is not None:
+                    progress.rows_parsed += 1
+                    record.setdefault("currency", currency)
+                    yield record
+                    record = None
+                elif not closing:
+                    record = {}
+            elif tag == "CURDEF" and not closing:
+                currency = value or currency
+            elif record is not None and not closing and tag in OFX_FIELDS and value:
+                record.setdefault(OFX_FIELDS[tag], value)
+
+    for text in texts:
+        pending += text
+        # A tag's value ends at the next "<"; keep the last, possibly unfinished, tag
+        cut = pending.rfind("<")
+        if cut > 0:
+            yield from scan(pending[:cut])
+            pending = pending[cut:]
+
+    yield from scan(pending)
+    if record:
+        # SGML files may omit </STMTTRN> on the last transaction
+        progress.rows_parsed += 1
+        record.setdefault("currency", currency)
+        yield record
+
+
+# =====================================================
+# STAGE 3: EXPENSES
+# =====================================================
+
+_AMOUNT_NOISE = re.compile(r"[^\d.,\-+()]")
+
+
+def parse_amount(value: Optional[str]) -> Optional[Decimal]:
+    """
+    '-1,234.50', '-1.234,50', '(12.00)', '$ 7.5' -> Decimal; None when empty
+
+    With both separators present the last one is the decimal point. A
+    separator that repeats groups thousands ('1.234.567'). A single comma
+    followed by three digits groups thousands ('1,234'); any other single
+    separator is the decimal point, so '1.234' is rejected rather than
+    guessed.
+
+    Raises:
+        StatementError: not a number, or more than two decimal places
+    """
+    if value is None:
+        return None
+    text = _AMOUNT_NOISE.sub("", value)
+    if not text:
+        return None
+    negative = text.startswith("(") and text.endswith(")")
+    text = text.strip("()")
+
+    decimal_mark = max(text.rfind("."), text.rfind(","))
+    if decimal_mark >= 0:
+        mark = text[decimal_mark]
+        grouping = "," if mark == "." else "."
+        single = text.count(mark) == 1
+        if grouping in text or (single and not (mark == "," and len(text) - decimal_mark == 4)):
+            text = text[:decimal_mark].replace(grouping, "") + "." + text[decimal_mark + 1:]
+        else:
+            text = text.replace(mark, "")
+
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        raise StatementError(f"Invalid amount: {value!r}")
+    if not amount.is_finite() or amount != amount.quantize(CENT, rounding=ROUND_HALF_UP):
+        raise StatementError(f"Invalid amount: {value!r} (more than two decimal places)")
+    return -amount if negative else amount
+
+
+def parse_date(value: Optional[str], date_format: str) -> date:
+    """
+    Parse a date in one of DATE_FORMATS
+
+    Raises:
+        StatementError: missing, not in `date_format`, or not a real date
+    """
+    if not value:
+        raise StatementError("Missing date")
+    text = value.strip()
+    if date_format == "YYYYMMDD":
+        text = text[:8]  # OFX: time and zone may follow
+    if not _DATE_SHAPES[date_format].fullmatch(text):
+        raise StatementError(f"Date {value!r} is not {date_format}")
+    try:
+        return datetime.strptime(text, DATE_FORMATS[date_format][1]).date()
+    except ValueError:
+        raise StatementError(f"Invalid date: {value!r}")
+
+
+def _parses(value: str, date_format: str) -> Optional[date]:
+    try:
+        return parse_date(value, date_format)
+    except StatementError:
+        return None
+
+
+def detect_date_format(
+    records: Iterator[Dict[str, Any]],
+    lookahead: int = DATE_FORMAT_LOOKAHEAD
+) -> Tuple[str, Iterator[Dict[str, Any]]]:
+    """
+    Pick the one date format of a CSV statement
+
+    Reads records until only one format fits every date seen so far
+    (12/01/2026 fits MM/DD and DD/MM, 13/01/2026 only DD/MM), then hands
+    back the format and the records, including the ones read ahead.
+
+    Raises:
+        StatementError: a date fits no format, or after `lookahead` rows
+            (or the whole file) the remaining formats still disagree
+    """
+    candidates = list(DATE_FORMATS)
+    buffered: List[Dict[str, Any]] = []
+    for record in records:
+        buffered.append(record)
+        value = record.get("date")
+        if value:
+            fitting = [name for name in candidates if _parses(value, name)]
+            if not fitting:
+                line = record.get("line")
+                raise StatementError(f"Unrecognized date {value!r}" + (f" (line {line})" if line else ""))
+            candidates = fitting
+        if len(candidates) == 1 or len(buffered) >= lookahead:
+            break
+
+    if len(candidates) > 1:
+        readings = [
+            {_parses(r["date"], name) for name in candidates}
+            for r in buffered if r.get("date")
+        ]
+        if any(len(dates) > 1 for dates in readings):
+            raise StatementError(
+                f"Ambiguous dates, could be {' or '.join(candidates)}; pass date_format"
+            )
+
+    return candidates[0], chain(buffered, records)
+
+
+def _synthetic_id(posted: date, amount: Decimal, description: str, occurrence: int) -> str:
+    """Stable id for statements without transaction ids, so re-imports dedupe"""
+    key = f"{posted.isoformat()}|{amount}|{description}|{occurrence}"
+    return "import:" + hashlib.sha256(key.encode()).hexdigest()[:40]
+
+
+def normalize(
+    records: Iterable[Dict[str, Any]],
+    options: ImportOptions,
+    progress: ImportProgress,
+    date_format: str
+) -> Iterator[Dict[str, Any]]:
+    """
+    Turn raw records into bulk_insert_expenses rows
+
+    Every date must be in `date_format`; rows in another format fail the
+    import instead of being read differently.
+
+    Only outflows become expenses (negative amounts, or the debit column;
+    flip with negative_is_expense=False). Identical transactions on the
+    same day are told apart by their order in the statement, counted over
+    the whole file so they need not be adjacent or date ordered.
+    """
+    occurrences: Dict[Tuple[date, Decimal, str], int] = {}
+
+    for record in records:
+        try:
+            posted = parse_date(record.get("date"), date_format)
+            debit = parse_amount(record.get("debit"))
+            if debit is not None:
+                amount = abs(debit)
+            else:
+                signed = parse_amount(record.get("amount")) or Decimal("0")
+                amount = -signed if options.negative_is_expense else signed
+        except StatementError as e:
+            line = record.get("line")
+            raise StatementError(f"{e} (line {line})" if line else str(e))
+
+        if amount <= 0:
+            progress.rows_ignored += 1
+            continue
+
+        amount = amount.quantize(CENT, rounding=ROUND_HALF_UP)
+        description = record.get("description") or record.get("memo") or "Bank transaction"
+
+        transaction_id = record.get("bank_transaction_id")
+        if not transaction_id:
+            fingerprint = (posted, amount, description)
+            occurrences[fingerprint] = occurrences.get(fingerprint, 0) + 1
+            transaction_id = _synthetic_id(posted, amount, description, occurrences[fingerprint])
+
+        expense = {
+            "amount": str(amount),
+            "description": description,
+            "category": record.get("category") or options.default_category,
+            "date": posted.isoformat(),
+            "bank_transaction_id": transaction_id[:200],
+            "currency": record.get("currency") or options.currency,
+            "payment_method": "bank_import",
+        }
+        if options.budget_item_id:
+            expense["budget_item_id"] = options.budget_item_id
+        yield expense
+
+
+def dedupe_batches(expenses: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Group expenses into batches without repeated bank_transaction_ids
+
+    Only the current batch is remembered; repeats across batches and
+    earlier imports are skipped by the database (migration 020).
+    """
+    batch: List[Dict[str, Any]] = []
+    seen = set()
+    for expense in expenses:
+        key = expense["bank_transaction_id"]
+        if key in seen:
+            continue
+        seen.add(key)
+        batch.append(expense)
+        if len(batch) >= batch_size:
+            yield batch
+            batch, seen = [], set()
+    if batch:
+        yield batch
+
+
+# =====================================================
+# PIPELINE
+# =====================================================
+
+def statement_batches(
+    stream: BinaryIO,
+    statement_format: str,
+    options: ImportOptions,
+    progress: ImportProgress
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Full pipeline over a binary statement stream
+
+    Args:
+        stream: Binary file object positioned at the start
+        statement_format: 'csv', 'ofx' or 'auto' (sniffed from the first chunk)
+        options: Amount sign, defaults, batch size and size limit
+        progress: Counters updated as the stream is consumed
+
+    Yields:
+        Lists of at most options.batch_size expense rows
+    """
+    chunks = read_chunks(stream, progress, max_bytes=options.max_bytes)
+
+    # Enough of the start of the file to tell OFX from CSV
+    head: List[bytes] = []
+    for chunk in chunks:
+        head.append(chunk)
+        if sum(map(len, head)) >= 512:
+            break
+    if statement_format == "auto":
+        statement_format = sniff_format(b"".join(head))
+
+    def all_chunks() -> Iterator[bytes]:
+        yield from head
+        yield from chunks
+
+    texts = iter_text(all_chunks())
+    if statement_format == "ofx":
+        records = parse_ofx(texts, progress)
+        date_format = "YYYYMMDD"
+    else:
+        records = parse_csv(iter_lines(texts), progress)
+        date_format = options.date_format
+        if date_format is None:
+            date_format, records = detect_date_format(records)
+    yield from dedupe_batches(normalize(records, options, progress, date_format), options.batch_size)
@@ -0,0 +1,37 @@
+"""In-memory stand-ins for the PostgREST client used by service tests"""
+from types import SimpleNamespace
+
+
+class FakeQuery:
+    """Chainable stand-in for a PostgREST request builder"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+
+    def __getattr__(self, name):
+        # select/eq/order/... just return the builder
+        return lambda *args, **kwargs: self
+
+    async def execute(self):
+        self.client.executed.append(self.table)
+        if self.table in self.client.errors:
+            raise self.client.errors[self.table]
+        return SimpleNamespace(data=self.client.rows.get(self.table, []), count=None)
+
+
+class FakeClient:
+    """Records every executed query and returns canned rows per table or RPC"""
+
+    def __init__(self, rows, errors=None):
+        self.rows = rows
+        self.errors = errors or {}
+        self.executed = []
+        self.rpc_params = {}
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        self.rpc_params[name] = params
+        return FakeQuery(self, name)
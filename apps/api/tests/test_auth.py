@@ -0,0 +1,48 @@
+"""Tests for JWT verification and the verified-claims cache"""
+import time
+
+import pytest
+from jose import JWTError, jwt
+
+from src.core.auth import TokenVerifier
+
+SECRET = "test-secret"
+
+
+def make_token(exp_in: float, **claims) -> str:
+    payload = {"sub": "user-1", "aud": "authenticated", "exp": int(time.time() + exp_in), **claims}
+    return jwt.encode(payload, SECRET, algorithm="HS256")
+
+
+def test_verified_claims_are_cached():
+    """Test that a token is decoded once and then served from cache"""
+    verifier = TokenVerifier(SECRET, max_size=10, ttl=300)
+    token = make_token(3600)
+
+    assert verifier.verify(token)["sub"] == "user-1"
+    assert verifier.verify(token)["sub"] == "user-1"
+
+    stats = verifier.cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_cache_entry_never_outlives_token_exp():
+    """Test that cached claims expire with the token"""
+    verifier = TokenVerifier(SECRET, max_size=10, ttl=300)
+    token = make_token(30)
+    verifier.verify(token)
+
+    expires_at, _ = next(iter(verifier.cache._data.values()))
+    assert expires_at - time.monotonic() <= 31
+
+
+def test_invalid_tokens_are_rejected_and_not_cached():
+    """Test that bad signatures and expired tokens raise without caching"""
+    verifier = TokenVerifier(SECRET, max_size=10, ttl=300)
+    forged = jwt.encode({"sub": "user-1", "aud": "authenticated"}, "other", algorithm="HS256")
+
+    with pytest.raises(JWTError):
+        verifier.verify(forged)
+    with pytest.raises(JWTError):
+        verifier.verify(make_token(-10))
+    assert len(verifier.cache) == 0
@@ -0,0 +1,127 @@
+"""Tests for budget routes (service and auth overridden)"""
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.routes.budgets import get_budget_service
+from src.core.auth import get_current_user
+from src.main import app
+
+BUDGET_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+class FakeBudgetService:
+    def __init__(self):
+        self.calls = []
+
+    async def get_budget_items_hierarchy(self, budget_id, user_id, fields=None, depth=2, if_none_match=None):
+        self.calls.append({"fields": fields, "depth": depth, "if_none_match": if_none_match})
+        if if_none_match == "abc":
+            return {"etag": "abc", "not_modified": True}
+        return {"etag": "abc", "items": [{"id": "1", "children": []}]}
+
+
+@pytest.fixture
+def service():
+    fake = FakeBudgetService()
+    app.dependency_overrides[get_budget_service] = lambda: fake
+    app.dependency_overrides[get_current_user] = lambda: {"sub": "223e4567-e89b-12d3-a456-426614174000"}
+    yield fake
+    app.dependency_overrides.clear()
+
+
+def test_hierarchy_returns_etag_and_honors_if_none_match(service):
+    """Test that the tree carries an ETag and a matching If-None-Match gets 304"""
+    client = TestClient(app)
+
+    response = client.get(f"/api/budgets/{BUDGET_ID}/items/hierarchy?fields=category,budgeted_amount&depth=3")
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"abc"'
+    assert response.json() == {"items": [{"id": "1", "children": []}]}
+    assert service.calls[0] == {"fields": ["category", "budgeted_amount"], "depth": 3, "if_none_match": None}
+
+    response = client.get(f"/api/budgets/{BUDGET_ID}/items/hierarchy", headers={"If-None-Match": '"abc"'})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_item_batch_is_validated_before_reaching_the_service(service):
+    """Test that a batch with a dangling parent_ref or repeated reorder ids is rejected with 422"""
+    async def apply_item_batch(budget_id, batch, user_id):
+        service.calls.append([op.op for op in batch.operations])
+        return {"etag": "def", "items": []}
+
+    service.apply_item_batch = apply_item_batch
+    client = TestClient(app)
+
+    response = client.post(f"/api/budgets/{BUDGET_ID}/items/batch", json={"operations": [
+        {"op": "create", "parent_ref": "missing", "data": {"category": "Hydro"}},
+    ]})
+    assert response.status_code == 422
+    assert service.calls == []
+
+    response = client.post(f"/api/budgets/{BUDGET_ID}/items/batch", json={"operations": [
+        {"op": "reorder", "ids": [BUDGET_ID, BUDGET_ID]},
+    ]})
+    assert response.status_code == 422
+    assert "reorder ids must be unique" in response.text
+    assert service.calls == []
+
+    response = client.post(f"/api/budgets/{BUDGET_ID}/items/batch", json={"operations": [
+        {"op": "create", "ref": "utilities", "data": {"category": "Utilities", "is_parent": True}},
+        {"op": "create", "parent_ref": "utilities", "data": {"category": "Hydro", "budgeted_amount": "80"}},
+        {"op": "reorder", "ids": [BUDGET_ID]},
+    ]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"def"'
+    assert service.calls == [["create", "create", "reorder"]]
+
+
+def test_item_writes_ignore_spent_amount(service):
+    """Test that spent_amount, derived from expenses, is dropped from item writes"""
+    async def apply_item_batch(budget_id, batch, user_id):
+        service.calls.append([op.data for op in batch.operations])
+        return {"etag": "def", "items": []}
+
+    service.apply_item_batch = apply_item_batch
+    client = TestClient(app)
+
+    response = client.post(f"/api/budgets/{BUDGET_ID}/items/batch", json={"operations": [
+        {"op": "create", "data": {"category": "Hydro", "spent_amount": 0}},
+        {"op": "update", "id": BUDGET_ID, "data": {"budgeted_amount": "90", "spent_amount": "80"}},
+    ]})
+    assert response.status_code == 200
+    assert not [data for data in service.calls[0] if "spent_amount" in data]
+
+    # An update of spent_amount alone changes nothing
+    response = client.post(f"/api/budgets/{BUDGET_ID}/items/batch", json={"operations": [
+        {"op": "update", "id": BUDGET_ID, "data": {"spent_amount": "80"}},
+    ]})
+    assert response.status_code == 422
+
+
+def test_stats_range_keeps_amounts_exact(service):
+    """Test that the range endpoint is not captured by /{budget_id} and keeps decimal strings exact"""
+    stats = {
+        "budget_id": BUDGET_ID, "month_period": "2026-09", "type": "master", "name": "September",
+        "total_income": "1000.10", "total_budgeted": "0.30", "total_spent": "0.10",
+        "remaining": "1000.00", "percentage_spent": 0.01,
+        "category_breakdown": [],
+        "category_type_breakdown": [{
+            "category_type": "needs", "budgeted": "0.30", "spent": "0.10", "remaining": "0.20",
+            "percentage_used": 33.33, "percentage_of_income": 0.03,
+        }],
+    }
+
+    async def get_budget_stats_range(space_id, from_month_period, to_month_period, user_id):
+        service.calls.append((from_month_period, to_month_period))
+        return [stats]
+
+    service.get_budget_stats_range = get_budget_stats_range
+    client = TestClient(app)
+
+    response = client.get(f"/api/budgets/stats?space_id={BUDGET_ID}&from=2026-01&to=2026-09")
+    assert response.status_code == 200
+    assert service.calls == [("2026-01", "2026-09")]
+    body = response.json()["budgets"][0]
+    assert body["total_income"] == "1000.10"
+    assert body["category_type_breakdown"][0]["remaining"] == "0.20"
@@ -0,0 +1,134 @@
+"""Tests for BudgetService helpers that run against PostgREST"""
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from postgrest.exceptions import APIError
+
+from src.schemas.budget import BudgetCreate, BudgetItemChildCreate, BudgetReplicateRequest
+from src.services.budget_service import BudgetService, decode_budget_cursor
+from .postgrest_fakes import FakeClient
+
+
+async def test_verify_budget_totals_is_exact():
+    """Test that totals are compared with exact decimal sums"""
+    client = FakeClient({
+        "budgets": [{"total_budgeted": "0.30", "total_spent": "0.00"}],
+        "budget_items": [
+            {"budgeted_amount": "0.10", "spent_amount": "0"},
+            {"budgeted_amount": "0.20", "spent_amount": "0"},
+        ],
+    })
+
+    result = await BudgetService(client).verify_budget_totals("b-1")
+
+    assert result["consistent"] is True
+    assert result["expected"]["total_budgeted"] == Decimal("0.30")
+
+
+async def test_verify_budget_totals_reports_drift():
+    """Test that a stored total differing from the items is reported"""
+    client = FakeClient({
+        "budgets": [{"total_budgeted": "100.00", "total_spent": "0"}],
+        "budget_items": [{"budgeted_amount": "90.00", "spent_amount": "0"}],
+    })
+
+    result = await BudgetService(client).verify_budget_totals("b-1")
+
+    assert result["consistent"] is False
+
+
+async def test_replicate_budget_maps_duplicate_month_to_conflict():
+    """Test that the UNIQUE(space_id, type, month_period) violation becomes 409"""
+    client = FakeClient({}, errors={
+        "replicate_budget": APIError({"code": "23505", "message": "duplicate key value"})
+    })
+    request = BudgetReplicateRequest(target_month_period="2026-11")
+
+    with pytest.raises(HTTPException) as exc:
+        await BudgetService(client).replicate_budget("b-1", request, "u-1")
+
+    assert exc.value.status_code == 409
+    assert client.rpc_params["replicate_budget"]["p_target_month_period"] == "2026-11"
+
+
+async def test_list_budgets_returns_next_cursor_only_when_more_rows_exist():
+    """Test that one extra row yields a cursor pointing at the last returned budget"""
+    rows = [
+        {"id": "323e4567-e89b-12d3-a456-426614174000", "month_period": "2026-10"},
+        {"id": "223e4567-e89b-12d3-a456-426614174000", "month_period": "2026-09"},
+        {"id": "123e4567-e89b-12d3-a456-426614174000", "month_period": "2026-08"},
+    ]
+    service = BudgetService(FakeClient({"budgets": rows}))
+
+    page = await service.list_budgets("s-1", limit=2, include_items=False, fields=["name"])
+    assert page["budgets"] == rows[:2]
+    assert decode_budget_cursor(page["next_cursor"]) == ("2026-09", rows[1]["id"])
+
+    page = await service.list_budgets("s-1", limit=3, cursor=page["next_cursor"])
+    assert page["next_cursor"] is None
+
+
+async def test_list_budgets_rejects_unknown_fields_and_bad_cursors():
+    """Test that invalid fieldsets and cursors are client errors"""
+    service = BudgetService(FakeClient({}))
+
+    with pytest.raises(HTTPException) as exc:
+        await service.list_budgets("s-1", item_fields=["password"])
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        await service.list_budgets("s-1", cursor="not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+async def test_create_budget_is_one_rpc_and_maps_duplicate_month_to_conflict():
+    """Test that the budget and its items go out in a single call and a duplicate month is 409"""
+    client = FakeClient({}, errors={
+        "create_budget_with_items": APIError({"code": "23505", "message": "duplicate key value"})
+    })
+    budget = BudgetCreate(
+        space_id="123e4567-e89b-12d3-a456-426614174000",
+        name="October",
+        month_period="2026-10",
+        total_income=Decimal("1000.00"),
+        budget_items=[{"category": "Rent", "budgeted_amount": "800.00"}],
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await BudgetService(client).create_budget(budget, "u-1")
+
+    assert exc.value.status_code == 409
+    assert client.executed == ["create_budget_with_items"]
+    params = client.rpc_params["create_budget_with_items"]
+    assert params["p_budget"]["total_income"] == "1000.00"
+    assert params["p_items"][0]["budgeted_amount"] == "800.00"
+    assert "parent_id" not in params["p_items"][0]
+
+
+async def test_add_child_to_parent_is_one_rpc_returning_the_parent():
+    """Test that a child is added in one call and the updated parent comes back"""
+    parent = {"id": "p-1", "budget_id": "b-1", "budgeted_amount": "150.00", "children": [{"id": "c-1"}]}
+    client = FakeClient({"add_child_to_parent": parent})
+
+    result = await BudgetService(client).add_child_to_parent(
+        "p-1", BudgetItemChildCreate(category="Cable TV", budgeted_amount=Decimal("60")), "u-1"
+    )
+
+    assert result == parent
+    assert client.executed == ["add_child_to_parent"]
+    assert client.rpc_params["add_child_to_parent"]["p_child"]["budgeted_amount"] == "60"
+
+
+async def test_add_child_to_non_parent_is_a_client_error():
+    """Test that invalid_parameter_value from the function becomes 400"""
+    client = FakeClient({}, errors={
+        "add_child_to_parent": APIError({"code": "22023", "message": "Item is not a parent category"})
+    })
+
+    with pytest.raises(HTTPException) as exc:
+        await BudgetService(client).add_child_to_parent(
+            "i-1", BudgetItemChildCreate(category="Cable TV", budgeted_amount=Decimal("60")), "u-1"
+        )
+
+    assert exc.value.status_code == 400
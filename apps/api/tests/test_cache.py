@@ -0,0 +1,37 @@
+"""Tests for the in-process TTL/LRU cache"""
+from src.core.cache import TTLCache
+from src.services.dashboard_service import DashboardCache
+
+
+def test_lru_eviction_and_counters():
+    """Test that the least recently used entry is evicted when full"""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_expired_entries_are_misses():
+    """Test that entries past their TTL are dropped"""
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1, ttl=-1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_dashboard_cache_invalidation_by_budget():
+    """Test that item writes drop the summary built from their budget"""
+    cache = DashboardCache(max_size=10, ttl=60)
+    row = {"space": {"id": "s1"}, "budget": {"id": "b1"}}
+    cache.set("u1", "2025-10", row)
+    assert cache.get("u1", "2025-10") is row
+
+    assert cache.invalidate_budget("b2") == 0
+    assert cache.invalidate_budget("b1") == 1
+    assert cache.get("u1", "2025-10") is None
@@ -0,0 +1,39 @@
+"""Tests for dashboard summary shaping"""
+from datetime import datetime
+
+from src.services.dashboard_service import build_summary
+
+
+def _row(**overrides):
+    row = {
+        "space": {"id": "space-1", "name": "Home", "currency": "CAD"},
+        "budget": {"id": "budget-1", "name": "October", "total_income": 4000},
+        "month_total": 1000,
+        "breakdown": [
+            {"category": "Housing", "total": 700, "count": 1},
+            {"category": "Groceries", "total": 300, "count": 6},
+        ],
+        "savings": [{"name": "Savings", "target": 500, "current": 100}],
+        "recent": [{"id": "e-1", "description": "Rent", "amount": 700,
+                    "category": "Housing", "date": "2025-10-01"}],
+    }
+    row.update(overrides)
+    return row
+
+
+def test_summary_without_space_is_empty():
+    """Test that users without a personal space get the empty state"""
+    summary = build_summary(_row(space=None), datetime(2025, 10, 10), "2025-10")
+    assert summary["has_data"] is False
+    assert summary["space"] is None
+
+
+def test_top_category_comes_from_breakdown():
+    """Test that quick stats reuse the first breakdown row"""
+    summary = build_summary(_row(), datetime(2025, 10, 10), "2025-10")
+    assert summary["has_data"] is True
+    assert summary["quick_stats"]["top_category"] == "Housing"
+    assert summary["quick_stats"]["top_category_amount"] == 700
+    assert summary["quick_stats"]["days_remaining"] == 21
+    assert summary["monthly_balance"]["balance"] == 3000
+    assert [b["percentage"] for b in summary["spending_breakdown"]] == [70.0, 30.0]
@@ -0,0 +1,9 @@
+"""Tests for database configuration"""
+from src.core.database import _to_asyncpg_url
+
+
+def test_async_url_uses_asyncpg_driver():
+    """Test that sync connection strings are rewritten for asyncpg"""
+    assert _to_asyncpg_url("postgresql://u:p@h:5432/db") == "postgresql+asyncpg://u:p@h:5432/db"
+    assert _to_asyncpg_url("postgres://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert _to_asyncpg_url("postgresql+psycopg2://u@h/db") == "postgresql+asyncpg://u@h/db"
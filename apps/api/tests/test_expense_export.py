@@ -0,0 +1,94 @@
+"""Tests for streaming expense exports"""
+import csv
+import gzip
+import io
+import json
+from contextlib import asynccontextmanager
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from src.services.expense_export import EXPORT_COLUMNS, ExpenseExportService
+
+SPACE_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+def _rows(n):
+    return [
+        (f"id-{i}", "2026-10-01", "=HYPERLINK(\"x\")" if i == 0 else f"Coffee {i}", "Dining Out",
+         "12.50", "USD", None, ["work", "trip"] if i == 0 else None, None, None, None, f"txn_{i}")
+        for i in range(n)
+    ]
+
+
+class FakeEngine:
+    """Serves rows through fetchmany and tracks checked-out connections"""
+
+    def __init__(self, rows, is_member=True):
+        self.rows = rows
+        self.is_member = is_member
+        self.checked_out = 0
+        self.fetch_sizes = []
+
+    @asynccontextmanager
+    async def connect(self):
+        self.checked_out += 1
+        try:
+            yield self
+        finally:
+            self.checked_out -= 1
+
+    async def execute(self, statement, params):
+        return SimpleNamespace(scalar=lambda: self.is_member)
+
+    async def stream(self, statement, params):
+        remaining = list(self.rows)
+
+        async def fetchmany(size):
+            self.fetch_sizes.append(size)
+            batch, remaining[:] = remaining[:size], remaining[size:]
+            return batch
+
+        return SimpleNamespace(fetchmany=fetchmany)
+
+
+async def _collect(engine, export_format, compress=False, batch_size=2):
+    service = ExpenseExportService(engine, batch_size=batch_size)
+    chunks = []
+    async for chunk in service.export(SPACE_ID, date.min, date.max, export_format, compress=compress):
+        chunks.append((chunk, engine.checked_out))
+    return chunks
+
+
+async def test_csv_export_streams_batches_and_releases_the_connection():
+    """Test one chunk per fetch, the header, formula escaping and an early release"""
+    engine = FakeEngine(_rows(5))
+    chunks = await _collect(engine, "csv")
+
+    assert engine.fetch_sizes == [2, 2, 2]
+    assert [held for _, held in chunks] == [1, 1, 0]
+    lines = list(csv.reader(io.StringIO(b"".join(c for c, _ in chunks).decode())))
+    assert lines[0] == list(EXPORT_COLUMNS)
+    assert len(lines) == 6
+    assert lines[1][2] == "'=HYPERLINK(\"x\")"
+    assert lines[1][7] == "work;trip"
+
+
+async def test_gzip_ndjson_export_decompresses_to_one_object_per_row():
+    """Test that the compressed stream is one valid gzip member"""
+    engine = FakeEngine(_rows(3))
+    body = b"".join(c for c, _ in await _collect(engine, "ndjson", compress=True))
+
+    lines = gzip.decompress(body).decode().splitlines()
+    assert [json.loads(line)["bank_transaction_id"] for line in lines] == ["txn_0", "txn_1", "txn_2"]
+    assert json.loads(lines[0])["tags"] == ["work", "trip"]
+    assert engine.checked_out == 0
+
+
+async def test_export_requires_membership():
+    """Test that non-members are refused before streaming"""
+    with pytest.raises(HTTPException) as exc:
+        await ExpenseExportService(FakeEngine([], is_member=False)).check_access(SPACE_ID, "u-1")
+    assert exc.value.status_code == 403
@@ -0,0 +1,171 @@
+"""Tests for expense search: statement building, paging and index use"""
+import json
+import os
+from datetime import date
+from types import SimpleNamespace
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from src.core.config import settings
+from src.core.database import create_async_db_engine
+from src.services.expense_search import (
+    ExpenseSearchService,
+    build_search_query,
+    decode_search_cursor,
+    encode_search_cursor,
+)
+
+SPACE_ID = UUID("123e4567-e89b-12d3-a456-426614174000")
+USER_ID = UUID("223e4567-e89b-12d3-a456-426614174000")
+
+
+class FakeSession:
+    """Returns canned result sets in order and records executed statements"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+
+    async def execute(self, statement, params=None):
+        self.executed.append((str(statement), params))
+        rows = self.results.pop(0)
+        return SimpleNamespace(mappings=lambda: rows, scalar=lambda: rows)
+
+
+def _row(n, score=None):
+    return {"id": UUID(int=n), "date": date(2026, 10, 31 - n), "score": score}
+
+
+def test_only_given_filters_become_predicates():
+    """Test that unset filters leave no predicates and the cursor becomes a row comparison"""
+    statement, params = build_search_query(SPACE_ID, USER_ID, limit=20)
+    sql = str(statement)
+    assert "<%" not in sql and "@>" not in sql and "score" not in sql
+    assert "ORDER BY e.date DESC, e.id DESC" in sql
+    assert params["limit"] == 21
+
+    statement, params = build_search_query(
+        SPACE_ID, USER_ID, q="coffee", date_from=date(2026, 1, 1), categories=["Dining Out"],
+        min_amount=1, tags=["work"], sort="relevance", after=(0.5, date(2026, 5, 1), UUID(int=1))
+    )
+    sql = str(statement)
+    assert ":q <% e.description" in sql
+    assert "e.tags @> :tags" in sql and "e.category = ANY(:categories)" in sql
+    assert "e.amount <= :max_amount" not in sql
+    assert "< (CAST(:after_score AS real), :after_date, :after_id)" in sql
+    assert "ORDER BY score DESC, e.date DESC, e.id DESC" in sql
+    assert params["after_score"] == 0.5
+
+
+def test_cursor_round_trip_is_tied_to_the_sort():
+    """Test that cursors decode to the keyset of their sort and reject garbage"""
+    cursor = encode_search_cursor(_row(1, score=0.75), "relevance")
+    assert decode_search_cursor(cursor, "relevance") == (0.75, date(2026, 10, 30), UUID(int=1))
+
+    for bad_cursor, sort in ((cursor, "date"), ("not-a-cursor", "date")):
+        with pytest.raises(HTTPException) as exc:
+            decode_search_cursor(bad_cursor, sort)
+        assert exc.value.status_code == 400
+
+
+async def test_search_pages_and_tells_non_members_apart():
+    """Test next_cursor on full pages and the 403 check on empty ones"""
+    session = FakeSession([_row(1, 0.9), _row(2, 0.8), _row(3, 0.7)])
+    page = await ExpenseSearchService(session).search(SPACE_ID, USER_ID, q=" coffee ", limit=2)
+    assert [e["id"] for e in page["expenses"]] == [UUID(int=1), UUID(int=2)]
+    assert decode_search_cursor(page["next_cursor"], "relevance")[0] == 0.8
+    assert session.executed[0][1]["q"] == "coffee"
+
+    session = FakeSession([], True)
+    page = await ExpenseSearchService(session).search(SPACE_ID, USER_ID)
+    assert page == {"expenses": [], "next_cursor": None}
+
+    session = FakeSession([], False)
+    with pytest.raises(HTTPException) as exc:
+        await ExpenseSearchService(session).search(SPACE_ID, USER_ID)
+    assert exc.value.status_code == 403
+
+    with pytest.raises(HTTPException) as exc:
+        await ExpenseSearchService(FakeSession()).search(SPACE_ID, USER_ID, sort="relevance")
+    assert exc.value.status_code == 400
+
+
+# =====================================================
+# QUERY PLANS (needs a database)
+# =====================================================
+
+DB_TEST_USER_ID = os.getenv("DB_TEST_USER_ID")
+SEED_ROWS = 1_000_000
+
+PERSONAL_SPACE = text("""
+    SELECT s.id FROM spaces s
+    JOIN space_members sm ON s.id = sm.space_id
+    WHERE sm.user_id = :user_id AND s.is_personal = true LIMIT 1
+""")
+
+# Ten years of card transactions; one in 10 000 is the rare merchant the
+# fuzzy search looks for and one in 1 000 is tagged
+SEED_EXPENSES = text("""
+    INSERT INTO expenses (space_id, amount, description, category, date, tags, created_by)
+    SELECT :space_id,
+           (g % 50000 + 100) / 100.0,
+           CASE WHEN g % 10000 = 0 THEN 'BLUE BOTTLE COFFEE OAKLAND'
+                ELSE (ARRAY['STARBUCKS COFFEE', 'WHOLE FOODS MARKET', 'SHELL OIL', 'AMAZON MKTPLACE',
+                            'UBER TRIP', 'NETFLIX.COM', 'COSTCO WHSE', 'TARGET', 'CVS PHARMACY',
+                            'CHIPOTLE'])[1 + g % 10]
+           END || ' #' || g,
+           (ARRAY['Dining Out', 'Groceries', 'Transportation', 'Shopping', 'Entertainment'])[1 + g % 5],
+           DATE '2016-10-17' + g % 3650,
+           CASE WHEN g % 1000 = 0 THEN ARRAY['reimbursable'] END,
+           :user_id
+    FROM generate_series(1, :n) AS g
+""")
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+@pytest.mark.skipif(not DB_TEST_USER_ID, reason="set DB_TEST_USER_ID to an existing user with a personal space")
+async def test_search_plans_use_indexes_on_a_million_rows(monkeypatch):
+    """Test that search, keyset paging and tag filters never scan the whole table"""
+    monkeypatch.setattr(settings, "DB_COMMAND_TIMEOUT", 600.0)
+    engine = create_async_db_engine()
+
+    async def explain(conn, **filters):
+        statement, params = build_search_query(space_id, user_id, **filters)
+        result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {statement}"), params)
+        plan = result.scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        nodes = list(_plan_nodes(plan[0]["Plan"]))
+        assert not [n for n in nodes if n["Node Type"] == "Seq Scan" and n.get("Relation Name") == "expenses"]
+        return nodes
+
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            try:
+                user_id = UUID(DB_TEST_USER_ID)
+                space_id = (await conn.execute(PERSONAL_SPACE, {"user_id": user_id})).scalar_one()
+                await conn.execute(SEED_EXPENSES, {"space_id": space_id, "user_id": user_id, "n": SEED_ROWS})
+                await conn.execute(text("ANALYZE expenses"))
+
+                nodes = await explain(conn, q="blue botle", sort="relevance")
+                assert "idx_expenses_description_trgm" in {n.get("Index Name") for n in nodes}
+
+                # A deep page reads from the cursor on, in index order
+                nodes = await explain(conn, after=(date(2020, 1, 1), UUID(int=0)))
+                assert "idx_expenses_space_date_id" in {n.get("Index Name") for n in nodes}
+                assert "Sort" not in {n["Node Type"] for n in nodes}
+
+                nodes = await explain(conn, tags=["reimbursable"], date_from=date(2018, 1, 1))
+                assert {n.get("Index Name") for n in nodes} & {"idx_expenses_tags", "idx_expenses_space_date_id"}
+            finally:
+                await trans.rollback()
+    finally:
+        await engine.dispose()
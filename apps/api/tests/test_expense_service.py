@@ -0,0 +1,55 @@
+"""Tests for ExpenseService bulk ingestion"""
+import pytest
+from fastapi import HTTPException
+from postgrest.exceptions import APIError
+
+from src.core.config import settings
+from src.schemas.expense import ExpenseCreate
+from src.services.dashboard_service import DashboardCache
+from src.services.expense_service import ExpenseService
+from .postgrest_fakes import FakeClient
+
+SPACE_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+def _expenses(n):
+    return [
+        ExpenseCreate(amount="12.50", description=f"Coffee {i}", category="Dining Out", bank_transaction_id=f"txn_{i}")
+        for i in range(n)
+    ]
+
+
+async def test_bulk_create_is_one_rpc_and_invalidates_the_space():
+    """Test that the whole batch is one call and cached dashboards of the space are dropped"""
+    client = FakeClient({"bulk_insert_expenses": {"received": 3, "inserted": 2, "skipped": 1}})
+    cache = DashboardCache(max_size=10, ttl=60)
+    cache.set(SPACE_ID, "2026-10", {"space": {"id": SPACE_ID}})
+
+    result = await ExpenseService(client, cache).bulk_create(SPACE_ID, _expenses(3), "u-1")
+
+    assert result["inserted"] == 2
+    assert client.executed == ["bulk_insert_expenses"]
+    rows = client.rpc_params["bulk_insert_expenses"]["p_rows"]
+    assert rows[0] == {
+        "amount": "12.50", "description": "Coffee 0", "category": "Dining Out",
+        "bank_transaction_id": "txn_0", "currency": "USD",
+    }
+    assert cache.get(SPACE_ID, "2026-10") is None
+
+
+async def test_bulk_create_rejects_oversized_batches_and_non_members(monkeypatch):
+    """Test the row limit and the membership error mapping"""
+    monkeypatch.setattr(settings, "EXPENSE_BULK_MAX_ROWS", 2)
+    client = FakeClient({}, errors={
+        "bulk_insert_expenses": APIError({"code": "42501", "message": "Not a member"})
+    })
+    service = ExpenseService(client)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.bulk_create(SPACE_ID, _expenses(3), "u-1")
+    assert exc.value.status_code == 413
+    assert client.executed == []
+
+    with pytest.raises(HTTPException) as exc:
+        await service.bulk_create(SPACE_ID, _expenses(2), "u-1")
+    assert exc.value.status_code == 403
@@ -31,3 +31,18 @@ def test_docs_accessible():
     """Test that API docs are accessible"""
     response = client.get("/docs")
     assert response.status_code == 200
+
+
+def test_lifespan_creates_and_closes_resources(monkeypatch):
+    """Test that shared clients are created once at startup and closed on shutdown"""
+    from src.core.config import settings
+    monkeypatch.setattr(settings, "WARM_CONNECTIONS_ON_STARTUP", False)
+
+    with TestClient(app) as lifespan_client:
+        resources = app.state.resources
+        assert resources.postgrest is not None
+        assert resources.async_engine is not None
+        assert lifespan_client.get("/health").status_code == 200
+
+    assert resources.postgrest is None
+    assert resources.async_engine is None
@@ -0,0 +1,51 @@
+"""Parity tests for the integer-cents money kernel against Decimal"""
+import random
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from src.core import money
+
+
+def _amounts(n, seed=7):
+    rng = random.Random(seed)
+    return [f"{rng.randint(-100_000, 10_000_000) / 100:.2f}" for _ in range(n)]
+
+
+@pytest.mark.parametrize("value", ["0", "12", "12.3", "-0.05", ".5", "+7.10", " 3.40 ", "1e2", "2.005", 3, 0.1, Decimal("9.999"), None])
+def test_to_cents_matches_decimal(value):
+    """Test that every accepted input form converts like Decimal rounding to the cent"""
+    expected = Decimal(str(value if value is not None else 0)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    assert money.to_decimal(money.to_cents(value)) == expected
+
+
+def test_sum_and_remaining_match_decimal():
+    """Test that buffer sums and differences are exact"""
+    budgeted = _amounts(2000, seed=1)
+    spent = _amounts(2000, seed=2)
+
+    cents_budgeted = money.cents_array(budgeted)
+    cents_spent = money.cents_array(spent)
+
+    assert money.to_decimal(money.total(cents_budgeted)) == sum(map(Decimal, budgeted))
+    assert [money.to_decimal(c) for c in money.remaining(cents_budgeted, cents_spent)] == [
+        Decimal(b) - Decimal(s) for b, s in zip(budgeted, spent)
+    ]
+
+
+@pytest.mark.parametrize("places", [1, 2])
+def test_percentages_match_decimal_half_up(places):
+    """Test that percentages round half away from zero like Postgres ROUND"""
+    amounts = _amounts(1000, seed=3) + ["1", "2", "0.5"]
+    whole = "3.00"
+    quantum = Decimal(1).scaleb(-places)
+
+    expected = [
+        float((Decimal(a) / Decimal(whole) * 100).quantize(quantum, rounding=ROUND_HALF_UP))
+        for a in amounts
+    ]
+    cents = money.cents_array(amounts)
+
+    assert money.percentages(cents, money.to_cents(whole), places) == expected
+    assert [money.percentage(c, money.to_cents(whole), places) for c in cents] == expected
+    assert money.percentages(cents, 0) == [0.0] * len(amounts)
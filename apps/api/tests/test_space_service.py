@@ -0,0 +1,64 @@
+"""Tests for SpaceService query counts"""
+import pytest
+
+from src.services.space_service import InMemorySpaceRoleCache, SpaceService
+from .postgrest_fakes import FakeClient
+
+
+def memberships(n):
+    return [
+        {"role": "member", "spaces": {"id": f"space-{i}", "name": f"Space {i}", "member_count": i + 1}}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("n_spaces", [1, 20])
+async def test_list_user_spaces_uses_constant_queries(n_spaces):
+    """Test that listing spaces costs one query regardless of space count"""
+    client = FakeClient({"space_members": memberships(n_spaces)})
+
+    spaces = await SpaceService(client).list_user_spaces("user-1")
+
+    assert len(client.executed) == 1
+    assert len(spaces) == n_spaces
+    assert spaces[-1]["member_count"] == n_spaces
+    assert spaces[0]["user_role"] == "member"
+
+
+async def test_get_space_is_one_round_trip():
+    """Test that space, members and caller role come from a single query"""
+    members = [
+        {"user_id": "user-1", "role": "owner", "users": {"username": "ana"}},
+        {"user_id": "user-2", "role": "member", "users": {"username": "ben"}},
+    ]
+    client = FakeClient({"spaces": [{"id": "space-1", "name": "Home", "space_members": members}]})
+
+    space = await SpaceService(client).get_space("space-1", "user-2")
+
+    assert client.executed == ["spaces"]
+    assert space["user_role"] == "member"
+    assert space["member_count"] == 2
+    assert "space_members" not in space
+
+
+async def test_get_space_rejects_non_members():
+    """Test that a caller missing from the member list is refused"""
+    client = FakeClient({"spaces": [{"id": "space-1", "space_members": []}]})
+
+    with pytest.raises(ValueError, match="not a member"):
+        await SpaceService(client).get_space("space-1", "user-3")
+
+
+async def test_role_cache_skips_membership_query_and_is_invalidated():
+    """Test that role checks hit the cache and membership writes invalidate it"""
+    client = FakeClient({"space_members": [{"role": "admin"}]})
+    cache = InMemorySpaceRoleCache(max_size=10, ttl=60)
+    service = SpaceService(client, cache)
+
+    assert await service._get_member_role("space-1", "user-1") == "admin"
+    assert await service._get_member_role("space-1", "user-1") == "admin"
+    assert client.executed == ["space_members"]
+
+    await service.leave_space("space-1", "user-1")
+    assert await cache.get("space-1", "user-1") is None
+    assert cache.stats()["hits"] == 2
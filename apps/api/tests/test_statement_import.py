@@ -0,0 +1,210 @@
+"""Tests for the streaming statement import pipeline and endpoint"""
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.routes.expenses import get_expense_service
+from src.core.auth import get_current_user
+from src.core.config import settings
+from src.main import app
+from src.services.expense_service import ExpenseService
+from src.services.statement_import import (
+    ImportOptions,
+    ImportProgress,
+    StatementError,
+    iter_text,
+    parse_ofx,
+    read_chunks,
+    statement_batches,
+)
+from .postgrest_fakes import FakeClient
+
+SPACE_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+CSV_STATEMENT = (
+    "Date,Description,Amount,Transaction ID\n"
+    "2026-09-01,\"Coffee, large\",-4.50,t1\n"
+    "2026-09-01,Salary,2500.00,t2\n"
+    "2026-09-02,Café Ñandú,\"-1,204.10\",t3\n"
+    "2026-09-03,Groceries,-80.00,\n"
+    "2026-09-03,Groceries,-80.00,\n"
+    "2026-09-03,Dup,-1.00,t1\n"
+).encode()
+
+OFX_STATEMENT = b"""OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><CURDEF>CAD<BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260905120000[-5:EST]<TRNAMT>-12.34<FITID>F1<NAME>Hydro &amp; Gas
+</STMTTRN><STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20260906<TRNAMT>100.00<FITID>F2<NAME>Refund
+</STMTTRN><STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260907<TRNAMT>-7<FITID>F3<MEMO>Parking
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def _batches(data, fmt="auto", chunk_size=None, **options):
+    progress = ImportProgress()
+    stream = io.BytesIO(data)
+    if chunk_size:
+        # Tiny reads exercise records, tags and UTF-8 characters split across chunks
+        read = stream.read
+        stream.read = lambda n=-1: read(chunk_size)
+    batches = list(statement_batches(stream, fmt, ImportOptions(**options), progress))
+    return batches, progress
+
+
+@pytest.mark.parametrize("chunk_size", [None, 3])
+def test_csv_pipeline_normalizes_and_dedupes(chunk_size):
+    """Test signs, thousands separators, dates, quoting, synthetic ids and in-batch dedupe"""
+    batches, progress = _batches(CSV_STATEMENT, chunk_size=chunk_size)
+    rows = [row for batch in batches for row in batch]
+
+    assert [(r["date"], r["description"], r["amount"]) for r in rows] == [
+        ("2026-09-01", "Coffee, large", "4.50"),
+        ("2026-09-02", "Café Ñandú", "1204.10"),
+        ("2026-09-03", "Groceries", "80.00"),
+        ("2026-09-03", "Groceries", "80.00"),
+    ]
+    # Identical rows without an id get distinct, stable ids
+    assert rows[2]["bank_transaction_id"] != rows[3]["bank_transaction_id"]
+    assert rows[2]["bank_transaction_id"].startswith("import:")
+    assert progress.rows_parsed == 6
+    assert progress.rows_ignored == 1
+    assert progress.bytes_read == len(CSV_STATEMENT)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 5])
+def test_ofx_pipeline_reads_sgml_transactions(chunk_size):
+    """Test that OFX 1.x SGML transactions stream out with FITIDs and the statement currency"""
+    batches, _ = _batches(OFX_STATEMENT, chunk_size=chunk_size, batch_size=1)
+
+    assert [b[0]["description"] for b in batches] == ["Hydro & Gas", "Parking"]
+    assert batches[0][0] | {} == {
+        "amount": "12.34", "description": "Hydro & Gas", "category": "Uncategorized",
+        "date": "2026-09-05", "bank_transaction_id": "F1", "currency": "CAD",
+        "payment_method": "bank_import",
+    }
+
+
+def test_synthetic_ids_do_not_depend_on_row_order():
+    """Test that identical same-day rows get distinct ids even when not adjacent"""
+    batches, _ = _batches(b"Date,Description,Amount\n2026-09-03,Bus,-3\n2026-09-04,Bus,-3\n2026-09-03,Bus,-3\n")
+    shuffled = [r["bank_transaction_id"] for r in batches[0]]
+    assert len(set(shuffled)) == 3
+
+    batches, _ = _batches(b"Date,Description,Amount\n2026-09-03,Bus,-3\n2026-09-03,Bus,-3\n2026-09-04,Bus,-3\n")
+    assert sorted(r["bank_transaction_id"] for r in batches[0]) == sorted(shuffled)
+
+
+def test_pipeline_enforces_size_and_reports_bad_rows():
+    """Test the byte limit and the line number of an unparsable row"""
+    with pytest.raises(StatementError, match="exceeds"):
+        _batches(CSV_STATEMENT, max_bytes=10, chunk_size=4)
+
+    with pytest.raises(StatementError, match="line 2"):
+        _batches(b"Date,Amount\nyesterday,-1\n")
+
+    assert list(parse_ofx(iter_text(read_chunks(io.BytesIO(b""), ImportProgress())), ImportProgress())) == []
+
+
+def test_one_date_format_per_file():
+    """Test detection from the first unambiguous row, ambiguity and rows in another format"""
+    batches, _ = _batches(b"Date,Amount\n12/01/2026,-1\n13/01/2026,-2\n")
+    assert [r["date"] for r in batches[0]] == ["2026-01-12", "2026-01-13"]
+
+    with pytest.raises(StatementError, match="Ambiguous dates"):
+        _batches(b"Date,Amount\n12/01/2026,-1\n11/01/2026,-2\n")
+
+    batches, _ = _batches(b"Date,Amount\n12/01/2026,-1\n", date_format="MM/DD/YYYY")
+    assert batches[0][0]["date"] == "2026-12-01"
+
+    with pytest.raises(StatementError, match="line 3"):
+        _batches(b"Date,Amount\n2026-01-12,-1\n01/13/2026,-2\n")
+
+
+def test_amount_separators_and_decimal_places():
+    """Test European grouping, the last separator as decimal point and the two-place limit"""
+    batches, _ = _batches(b'Date,Amount\n2026-09-01,"-1.234,50"\n2026-09-02,"-1,234"\n2026-09-03,-12.500\n')
+    assert [r["amount"] for r in batches[0]] == ["1234.50", "1234.00", "12.50"]
+
+    for amount in (b"-1.234", b"-1.2345"):
+        with pytest.raises(StatementError, match="two decimal places.*line 2"):
+            _batches(b"Date,Amount\n2026-09-01," + amount + b"\n")
+
+
+def test_impossible_dates_and_malformed_csv_are_statement_errors():
+    """Test that date() and csv.Error failures surface as StatementError with the line"""
+    with pytest.raises(StatementError, match="line 3"):
+        _batches(b"Date,Amount\n20260901,-1\n01312026,-2\n")
+
+    with pytest.raises(StatementError, match="20261399"):
+        _batches(OFX_STATEMENT.replace(b"20260907", b"20261399"))
+
+    oversized = b"Date,Description,Amount\n2026-09-01,\"" + b"x" * (csv.field_size_limit() + 1) + b"\",-1\n"
+    with pytest.raises(StatementError, match="Malformed CSV.*line"):
+        _batches(oversized)
+
+
+def test_import_endpoint_streams_progress():
+    """Test that the upload is processed batch by batch with NDJSON progress"""
+    client_fake = FakeClient({
+        "space_members": [{"role": "member"}],
+        "bulk_insert_expenses": {"received": 2, "inserted": 2, "skipped": 0},
+    })
+    app.dependency_overrides[get_expense_service] = lambda: ExpenseService(client_fake)
+    app.dependency_overrides[get_current_user] = lambda: {"sub": SPACE_ID}
+    try:
+        response = TestClient(app).post(
+            "/api/expenses/import",
+            data={"space_id": SPACE_ID, "category": "Imported"},
+            files={"file": ("statement.csv", CSV_STATEMENT, "text/csv")},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["status"] for e in events] == ["running", "completed"]
+    assert events[-1]["inserted"] == 2
+    assert client_fake.rpc_params["bulk_insert_expenses"]["p_rows"][0]["category"] == "Imported"
+
+
+def test_import_limit_is_separate_from_the_upload_limit(monkeypatch):
+    """Test that statements are capped by STATEMENT_IMPORT_MAX_SIZE, not MAX_FILE_SIZE"""
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 10)
+    client_fake = FakeClient({
+        "space_members": [{"role": "member"}],
+        "bulk_insert_expenses": {"received": 2, "inserted": 2, "skipped": 0},
+    })
+    app.dependency_overrides[get_expense_service] = lambda: ExpenseService(client_fake)
+    app.dependency_overrides[get_current_user] = lambda: {"sub": SPACE_ID}
+    try:
+        client = TestClient(app)
+        upload = {"file": ("statement.csv", CSV_STATEMENT, "text/csv")}
+        assert client.post("/api/expenses/import", data={"space_id": SPACE_ID}, files=upload).status_code == 200
+
+        monkeypatch.setattr(settings, "STATEMENT_IMPORT_MAX_SIZE", 10)
+        assert client.post("/api/expenses/import", data={"space_id": SPACE_ID}, files=upload).status_code == 413
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_import_refuses_non_members_before_streaming():
+    """Test a 403 status instead of a 200 stream with a failed line"""
+    client_fake = FakeClient({"space_members": []})
+    app.dependency_overrides[get_expense_service] = lambda: ExpenseService(client_fake)
+    app.dependency_overrides[get_current_user] = lambda: {"sub": SPACE_ID}
+    try:
+        response = TestClient(app).post(
+            "/api/expenses/import",
+            data={"space_id": SPACE_ID},
+            files={"file": ("statement.csv", b"Date,Amount\n2026-09-01,5.00\n", "text/csv")},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 403
+    assert client_fake.executed == ["space_members"]
@@ -72,8 +72,7 @@ export const CreateParentModal: React.FC<CreateParentModalProps> = ({
           // Create a dummy child that will be deleted or replaced
           {
             category: 'Placeholder',
-            budgeted_amount: 0,
-            spent_amount: 0
+            budgeted_amount: 0
           }
         ],
       });
@@ -39,7 +39,6 @@ export interface BudgetItemCreate {
   description?: string;
   category_type: CategoryType;
   budgeted_amount: number;
-  spent_amount?: number;
   icon?: string;
   color?: string;
   display_order?: number;
@@ -52,7 +51,6 @@ export interface BudgetItemUpdate {
   description?: string;
   category_type?: CategoryType;
   budgeted_amount?: number;
-  spent_amount?: number;
   icon?: string;
   color?: string;
   display_order?: number;
@@ -65,7 +63,6 @@ export interface BudgetItemChildCreate {
   category: string;
   description?: string;
   budgeted_amount: number;
-  spent_amount?: number;
   icon?: string;
   color?: string;
   display_order?: number;